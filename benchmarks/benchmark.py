@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
+# Usage: python benchmark.py [store], where store is the rdflib store of the data graph, eg CompactMemory
+import sys
 import timeit
 
+store = sys.argv[1] if len(sys.argv) > 1 else "Memory2"
+
 # set up code is not included in the benchmark
 # this includes loading the SHACL file into a rdflib graph
 # this is a benchmark of the validator, not of rdflib ttl parsing.
@@ -13,25 +17,26 @@ monkey.apply_patches()
 target_ttl_file = \
     '../test/resources/dash_tests/core/complex/personexample.test.ttl'
 target_ttl_file = path.abspath(target_ttl_file)
-target_graph = rdflib.Graph("Memory2")
+store = "{store}"
+target_graph = rdflib.Graph(store)
 with open(target_ttl_file, 'rb') as file:
     target_graph.parse(file=file, format='turtle')
-'''
+'''.format(store=store)
 
 run_script_pre_none = '''
-r = pyshacl.validate(target_graph, inference='none')
+r = pyshacl.validate(target_graph, inference='none', store=store)
 '''
 
 run_script_pre_rdfs = '''
-r = pyshacl.validate(target_graph, inference='rdfs')
+r = pyshacl.validate(target_graph, inference='rdfs', store=store)
 '''
 
 run_script_pre_owlrl = '''
-r = pyshacl.validate(target_graph, inference='owlrl')
+r = pyshacl.validate(target_graph, inference='owlrl', store=store)
 '''
 
 run_script_pre_both = '''
-r = pyshacl.validate(target_graph, inference='both')
+r = pyshacl.validate(target_graph, inference='both', store=store)
 '''
 
 t1 = timeit.timeit(run_script_pre_none, set_up_script, number=100) / 100.0
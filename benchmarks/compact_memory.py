@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the CompactMemory store, which encodes terms as integers, against the Memory2 store,
+on memory use and on the latency of triple pattern queries.
+
+Each store runs in its own subprocess, so the peak RSS of one does not hide the other. The graph is generated,
+with 5 triples per person: its rdf:type, a name, an age and two ex:knows links. Each kind of triple pattern is
+then queried for random terms, and the mean time to get all of the matching triples is reported.
+
+Usage: python compact_memory.py [number_of_triples] [queries_per_pattern]
+"""
+import random
+import resource
+import subprocess
+import sys
+import time
+
+TRIPLES_PER_PERSON = 5
+
+
+def build_graph(store, triples):
+    from rdflib import RDF, Graph, Literal, Namespace
+
+    EX = Namespace("http://example.com/ns#")
+    g = Graph(store)
+    people = max(triples // TRIPLES_PER_PERSON, 1)
+    classes = [EX["Class{}".format(c)] for c in range(20)]
+    for i in range(people):
+        person = EX["person{}".format(i)]
+        g.add((person, RDF.type, classes[i % 20]))
+        g.add((person, EX.name, Literal("Person {}".format(i))))
+        g.add((person, EX.age, Literal(i % 100)))
+        g.add((person, EX.knows, EX["person{}".format((i + 1) % people)]))
+        g.add((person, EX.knows, EX["person{}".format((i * 7) % people)]))
+    return g, people
+
+
+def query_latencies(g, people, queries):
+    from rdflib import RDF, Literal, Namespace
+
+    EX = Namespace("http://example.com/ns#")
+    rnd = random.Random(1)
+    persons = [EX["person{}".format(rnd.randrange(people))] for _ in range(queries)]
+    patterns = {
+        "(s, ?, ?)": [(p, None, None) for p in persons],
+        "(s, p, ?)": [(p, EX.knows, None) for p in persons],
+        "(?, p, o)": [(None, EX.knows, p) for p in persons],
+        "(?, ?, o)": [(None, None, p) for p in persons],
+        "(s, p, o)": [(p, RDF.type, EX.Class0) for p in persons],
+        "(?, p, literal)": [(None, EX.age, Literal(rnd.randrange(100))) for _ in range(max(queries // 100, 1))],
+    }
+    latencies = {}
+    for name, pattern_list in patterns.items():
+        start = time.perf_counter()
+        for pattern in pattern_list:
+            for _ in g.triples(pattern):
+                pass
+        latencies[name] = (time.perf_counter() - start) / len(pattern_list)
+    return latencies
+
+
+def run_one(store, triples, queries):
+    from pyshacl.monkey import apply_patches
+
+    apply_patches()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    g, people = build_graph(store, triples)
+    build_seconds = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    latencies = query_latencies(g, people, queries)
+    # ru_maxrss is in kilobytes on Linux
+    print("{}\t{}\t{:.3f}\t{}".format(len(g), rss_after - rss_before, build_seconds, repr(latencies)))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--one':
+        run_one(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        return
+    triples = int(sys.argv[1]) if len(sys.argv) > 1 else 5000000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    rows = {}
+    for store in ("Memory2", "CompactMemory"):
+        out = subprocess.run(
+            [sys.executable, __file__, '--one', store, str(triples), str(queries)], stdout=subprocess.PIPE, check=True
+        )
+        rows[store] = out.stdout.decode('utf-8').strip().splitlines()[-1].split('\t')
+    print("Benchmark completed, {} triples, {} queries per pattern.".format(rows["Memory2"][0], queries))
+    for store, (_, rss, seconds, _) in rows.items():
+        print("{}: peak RSS grew by {} KiB, built in {} seconds".format(store, rss, seconds))
+    print("memory saved: {:.1f}%".format(100.0 * (1 - int(rows["CompactMemory"][1]) / int(rows["Memory2"][1]))))
+    memory2_latencies = eval(rows["Memory2"][3])
+    compact_latencies = eval(rows["CompactMemory"][3])
+    for pattern, seconds in memory2_latencies.items():
+        print(
+            "{}: Memory2 {:.1f} us, CompactMemory {:.1f} us".format(
+                pattern, seconds * 1e6, compact_latencies[pattern] * 1e6
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
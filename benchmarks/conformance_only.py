@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the default validation, which extracts the shape fragment, against conformance-only validation
+(conformance_only=True), which skips building the neighborhoods, on the DASH test corpus in test/resources.
+
+The test files are loaded before measuring starts. Each mode validates every file, with RDFS inference like the
+DASH tests do, and the total time of the fastest of the repeats is reported. Both modes must agree on the
+conformance of every file.
+
+Usage: python conformance_only.py [repeats]
+"""
+import glob
+import sys
+import timeit
+
+from os import path, walk
+
+HERE = path.abspath(path.dirname(__file__))
+DASH_DIR = path.join(HERE, '..', 'test', 'resources', 'dash_tests')
+# The SHACL Core and SHACL-SPARQL tests, the others need advanced mode
+SUITES = ('core', 'sparql')
+
+
+def load_corpus():
+    from pyshacl.rdfutil import load_from_source
+
+    corpus = []
+    for suite in SUITES:
+        for directory, _, _ in walk(path.join(DASH_DIR, suite)):
+            for test_file in sorted(glob.glob(path.join(directory, '*.test.ttl'))):
+                corpus.append((test_file, load_from_source(test_file, multigraph=True)))
+    return corpus
+
+
+def run_corpus(corpus, conformance_only):
+    import pyshacl
+
+    results = {}
+    for test_file, graph in corpus:
+        try:
+            conforms = pyshacl.validate(graph, inference='rdfs', conformance_only=conformance_only)[0]
+        except Exception:
+            # Files that cannot be validated count as an outcome too, they must fail in both modes
+            conforms = None
+        results[test_file] = conforms
+    return results
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    corpus = load_corpus()
+    timings = {}
+    outcomes = {}
+    for conformance_only in (False, True):
+
+        def run():
+            outcomes[conformance_only] = run_corpus(corpus, conformance_only)
+
+        timings[conformance_only] = min(timeit.repeat(run, number=1, repeat=repeats))
+    disagree = [f for f in outcomes[False] if outcomes[False][f] != outcomes[True][f]]
+    print("Benchmark completed, {} DASH test files, best of {} repeats.".format(len(corpus), repeats))
+    print("default (with fragment extraction): {:.3f} seconds".format(timings[False]))
+    print("conformance only: {:.3f} seconds".format(timings[True]))
+    print("speedup: {:.2f}x".format(timings[False] / timings[True]))
+    if disagree:
+        print("The modes disagree on the conformance of:\n{}".format("\n".join(disagree)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
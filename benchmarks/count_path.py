@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Compares checking sh:minCount and sh:maxCount from the value nodes of each focus node, against checking them
+from the degrees of the TargetIndex (the number of objects of each subject of a predicate, and of subjects of
+each object), which is what property shapes with only those constraints on a predicate path do in runs that
+do not extract the fragment.
+
+The data graph is generated, with people that have names, emails and ex:knows links, a few of them too many
+or too few. Each shape only has count constraints. The value nodes are forced by turning off the degrees for
+the run. Each mode is run conformance-only, with and without a frozen graph, and the time of the fastest of the
+repeats is reported. Both modes must agree on the conformance and the number of validation results.
+
+Usage: python count_path.py [people] [repeats]
+"""
+import sys
+import timeit
+
+from unittest import mock
+
+SHAPES = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [ sh:path ex:name ; sh:minCount 1 ; sh:maxCount 1 ] ;
+  sh:property [ sh:path ex:email ; sh:maxCount 2 ] ;
+  sh:property [ sh:path ex:knows ; sh:minCount 1 ] ;
+  sh:property [ sh:path [ sh:inversePath ex:knows ] ; sh:maxCount 3 ] .
+'''
+
+
+def make_people(people):
+    from rdflib import RDF, Graph, Literal, Namespace
+
+    EX = Namespace("http://example.com/ns#")
+    g = Graph()
+    for i in range(people):
+        person = EX["p{}".format(i)]
+        g.add((person, RDF.type, EX.Person))
+        for n in range(1 if i % 40 else i % 3):
+            g.add((person, EX.name, Literal("Person {} {}".format(i, n))))
+        for e in range(3 if i % 100 == 0 else i % 3):
+            g.add((person, EX.email, Literal("p{}.{}@example.com".format(i, e))))
+        if i % 25:
+            g.add((person, EX.knows, EX["p{}".format((i + 1) % people)]))
+            g.add((person, EX.knows, EX["p{}".format((i * 7) % people)]))
+    return g
+
+
+def main():
+    from rdflib import Graph
+
+    from pyshacl import validate
+    from pyshacl.shape import Shape
+
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    data_graph = make_people(people)
+    shacl_graph = Graph().parse(data=SHAPES, format='turtle')
+    print("Benchmark completed, {} people, {} triples, best of {} repeats.".format(people, len(data_graph), repeats))
+    disagree = []
+    for freeze in (False, True):
+        timings = {}
+        outcomes = {}
+        for degrees in (False, True):
+
+            def run():
+                conforms, report_graph, _, _ = validate(
+                    data_graph, shacl_graph=shacl_graph, freeze=freeze, conformance_only=True
+                )
+                outcomes[degrees] = (conforms, len(report_graph))
+
+            if degrees:
+                timings[degrees] = min(timeit.repeat(run, number=1, repeat=repeats))
+            else:
+                with mock.patch.object(Shape, '_value_node_counts', return_value=None):
+                    timings[degrees] = min(timeit.repeat(run, number=1, repeat=repeats))
+        name = "frozen graph" if freeze else "rdflib store"
+        print(
+            "{}: value nodes {:.3f} seconds, degrees {:.3f} seconds, speedup {:.2f}x".format(
+                name, timings[False], timings[True], timings[False] / timings[True]
+            )
+        )
+        if outcomes[False] != outcomes[True]:
+            disagree.append(name)
+    if disagree:
+        print("The modes disagree on:\n{}".format("\n".join(disagree)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Measures how validation of one shape with very many focus nodes scales with the number of workers,
+when its focus nodes are sharded across them (shard_size).
+
+Each worker count runs in its own subprocess. The data graph is generated, and is built before measuring starts.
+
+Usage: python focus_node_sharding.py [number_of_products] [workers ...]
+"""
+import subprocess
+import sys
+import timeit
+
+SHAPES = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ProductShape a sh:NodeShape ;
+  sh:targetClass ex:Product ;
+  sh:property [ sh:path ex:name ; sh:minCount 1 ; sh:datatype <http://www.w3.org/2001/XMLSchema#string> ] ;
+  sh:property [ sh:path ex:price ; sh:maxCount 1 ; sh:minInclusive 0 ] .
+'''
+
+
+def build_data_graph(products):
+    from rdflib import Graph, Literal, Namespace, RDF
+
+    EX = Namespace("http://example.com/ns#")
+    g = Graph()
+    for i in range(products):
+        product = EX["product{}".format(i)]
+        g.add((product, RDF.type, EX.Product))
+        g.add((product, EX.name, Literal("Product {}".format(i))))
+        g.add((product, EX.price, Literal(i % 1000)))
+    return g
+
+
+def run_one(products, workers):
+    import pyshacl
+
+    data_graph = build_data_graph(products)
+    result = []
+
+    def run():
+        result.append(
+            pyshacl.validate(
+                data_graph,
+                shacl_graph=SHAPES,
+                shacl_graph_format='turtle',
+                workers=workers,
+                shard_size=max(products // (workers * 4), 1),
+            )
+        )
+
+    seconds = timeit.timeit(run, number=1)
+    print("{}\t{:.3f}\t{}".format(workers, seconds, len(result[0][3])))
+
+
+def main():
+    if len(sys.argv) > 3 and sys.argv[1] == '--one':
+        run_one(int(sys.argv[2]), int(sys.argv[3]))
+        return
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    worker_counts = [int(w) for w in sys.argv[2:]] or [1, 2, 4, 8]
+    rows = []
+    for workers in worker_counts:
+        out = subprocess.run(
+            [sys.executable, __file__, '--one', str(products), str(workers)], stdout=subprocess.PIPE, check=True
+        )
+        rows.append(out.stdout.decode('utf-8').strip().splitlines()[-1].split('\t'))
+    print("Benchmark completed, {} products.".format(products))
+    baseline = float(rows[0][1])
+    for workers, seconds, size in rows:
+        print(
+            "{} worker(s): {} seconds, speedup {:.2f}x, fragment of {} triples".format(
+                workers, seconds, baseline / float(seconds), size
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the default validation, which looks up the triples of the data graph in its rdflib store, against
+validation with freeze=True, which looks them up in a read-only snapshot of the data graph, see
+pyshacl.frozen_graph.
+
+Two workloads are measured. The DASH test corpus in test/resources, many small files validated one after the
+other, where the time to take the snapshot is not made up for. And a generated data graph of people, with
+rdf:type, names, ages and ex:knows links, validated against shapes with class targets, predicate and sequence
+paths, and sh:class, where most of the time goes into looking up triples. The time of the fastest of the repeats
+is reported, and the time taken by the snapshot in the generated graph. Both modes must agree on the conformance
+of every file, and on the number of validation results of the generated graph.
+
+Usage: python frozen_graph.py [people] [repeats]
+"""
+import glob
+import sys
+import timeit
+
+from os import path, walk
+
+HERE = path.abspath(path.dirname(__file__))
+DASH_DIR = path.join(HERE, '..', 'test', 'resources', 'dash_tests')
+# The SHACL Core and SHACL-SPARQL tests, the others need advanced mode
+SUITES = ('core', 'sparql')
+
+SHAPES = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [ sh:path ex:name ; sh:datatype xsd:string ; sh:minCount 1 ; sh:maxCount 1 ] ;
+  sh:property [ sh:path ex:age ; sh:datatype xsd:integer ; sh:maxCount 1 ] ;
+  sh:property [ sh:path ex:knows ; sh:class ex:Person ; sh:minCount 1 ] ;
+  sh:property [ sh:path ( ex:knows ex:knows ) ; sh:class ex:Agent ] ;
+  sh:property [ sh:path [ sh:inversePath ex:knows ] ; sh:nodeKind sh:IRI ] .
+'''
+
+
+def load_corpus():
+    from pyshacl.rdfutil import load_from_source
+
+    corpus = []
+    for suite in SUITES:
+        for directory, _, _ in walk(path.join(DASH_DIR, suite)):
+            for test_file in sorted(glob.glob(path.join(directory, '*.test.ttl'))):
+                corpus.append((test_file, load_from_source(test_file, multigraph=True)))
+    return corpus
+
+
+def run_corpus(corpus, freeze):
+    import pyshacl
+
+    results = {}
+    for test_file, graph in corpus:
+        try:
+            conforms = pyshacl.validate(graph, inference='rdfs', freeze=freeze)[0]
+        except Exception:
+            # Files that cannot be validated count as an outcome too, they must fail in both modes
+            conforms = None
+        results[test_file] = conforms
+    return results
+
+
+def make_people(people):
+    from rdflib import RDF, RDFS, Graph, Literal, Namespace
+
+    EX = Namespace("http://example.com/ns#")
+    g = Graph()
+    g.add((EX.Employee, RDFS.subClassOf, EX.Person))
+    g.add((EX.Person, RDFS.subClassOf, EX.Agent))
+    for i in range(people):
+        person = EX["p{}".format(i)]
+        g.add((person, RDF.type, EX.Employee if i % 3 else EX.Person))
+        if i % 50:
+            g.add((person, EX.name, Literal("Person {}".format(i))))
+        g.add((person, EX.age, Literal(20 + i % 50)))
+        g.add((person, EX.knows, EX["p{}".format((i + 1) % people)]))
+        g.add((person, EX.knows, EX["p{}".format((i * 7) % people)]))
+    return g
+
+
+def main():
+    from rdflib import Graph
+
+    from pyshacl import validate
+    from pyshacl.profiler import PHASE_FREEZE, Profiler
+
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    corpus = load_corpus()
+    corpus_timings = {}
+    corpus_outcomes = {}
+    for freeze in (False, True):
+
+        def run():
+            corpus_outcomes[freeze] = run_corpus(corpus, freeze)
+
+        corpus_timings[freeze] = min(timeit.repeat(run, number=1, repeat=repeats))
+    data_graph = make_people(people)
+    shacl_graph = Graph().parse(data=SHAPES, format='turtle')
+    timings = {}
+    results = {}
+    freeze_seconds = 0.0
+    for freeze in (False, True):
+
+        def run():
+            nonlocal freeze_seconds
+            profiler = Profiler()
+            report_graph = validate(
+                data_graph, shacl_graph=shacl_graph, freeze=freeze, conformance_only=True, profiler=profiler
+            )[1]
+            results[freeze] = len(report_graph)
+            if freeze:
+                freeze_seconds = profiler.to_dict()['phases'][PHASE_FREEZE]['wall']
+
+        timings[freeze] = min(timeit.repeat(run, number=1, repeat=repeats))
+    print("Benchmark completed, best of {} repeats.".format(repeats))
+    print("DASH corpus, {} files:".format(len(corpus)))
+    print("  default: {:.3f} seconds".format(corpus_timings[False]))
+    print("  frozen: {:.3f} seconds".format(corpus_timings[True]))
+    print("  speedup: {:.2f}x".format(corpus_timings[False] / corpus_timings[True]))
+    print("Generated graph, {} people, {} triples:".format(people, len(data_graph)))
+    print("  default: {:.3f} seconds".format(timings[False]))
+    print("  frozen: {:.3f} seconds, of which {:.3f} to take the snapshot".format(timings[True], freeze_seconds))
+    print("  speedup: {:.2f}x".format(timings[False] / timings[True]))
+    disagree = [f for f in corpus_outcomes[False] if corpus_outcomes[False][f] != corpus_outcomes[True][f]]
+    if disagree or results[False] != results[True]:
+        print("The modes disagree on the conformance of:\n{}".format("\n".join(disagree or ['the generated graph'])))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
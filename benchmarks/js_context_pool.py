@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the cost per focus node of executing a SHACL-JS function, with a new JS context for every call
+(as outside of a validation run), against contexts reused from the run-scoped SHACLJSContextPool.
+
+Needs the js extra (pyduktape2). Usage: python js_context_pool.py [number_of_focus_nodes]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+LIBRARY = b'''
+function hasGermanLabel($this) {
+    var p = TermFactory.namedNode("http://example.com/ns#germanLabel");
+    var s = $data.find($this, p, null);
+    for (var t = s.next(); t; t = s.next()) {
+        if (t.object.isLiteral() && t.object.language.startsWith("de")) {
+            return true;
+        }
+    }
+    return false;
+}
+'''
+
+SHAPES = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:HasGermanLabel sh:jsFunctionName "hasGermanLabel" ;
+  sh:jsLibrary [ sh:jsLibraryURL "file://{}" ] .
+'''
+
+
+def main():
+    from rdflib import Graph, Literal, Namespace
+
+    from pyshacl.extras.js.context import SHACLJSContextPool
+    from pyshacl.extras.js.js_executable import JSExecutable
+    from pyshacl.shapes_graph import ShapesGraph
+
+    EX = Namespace("http://example.com/ns#")
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    data_graph = Graph()
+    for i in range(nodes):
+        data_graph.add((EX["country{}".format(i)], EX.germanLabel, Literal("Land {}".format(i), lang="de")))
+    with tempfile.NamedTemporaryFile(suffix=".js", delete=False) as library:
+        library.write(LIBRARY)
+    try:
+        sg = ShapesGraph(Graph().parse(data=SHAPES.format(library.name), format="turtle"))
+        exe = JSExecutable(sg, EX.HasGermanLabel)
+        focus_nodes = [EX["country{}".format(i)] for i in range(nodes)]
+
+        def run():
+            for f in focus_nodes:
+                exe.execute(data_graph, {'this': f})
+
+        sg.js_contexts = None
+        fresh = timeit.timeit(run, number=1)
+        sg.js_contexts = pool = SHACLJSContextPool()
+        pooled = timeit.timeit(run, number=1)
+        sg.js_contexts = None
+    finally:
+        os.unlink(library.name)
+    print("Benchmark completed, {} focus nodes.".format(nodes))
+    print("new context per call: {:.3f} ms per focus node".format(fresh * 1000 / nodes))
+    print(
+        "pooled contexts: {:.3f} ms per focus node, {created} context(s) created".format(
+            pooled * 1000 / nodes, **pool.stats()
+        )
+    )
+    print("speedup {:.1f}x".format(fresh / pooled))
+
+
+if __name__ == '__main__':
+    main()
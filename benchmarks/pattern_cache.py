@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Compares checking sh:pattern by searching each pattern in the string of each value node, against looking up
+whether it was found before in the run's PatternCache, keyed by (pattern, flags, string).
+
+The data graph is generated, with items that each have an identifier code, linked to each other by ex:sameCode
+so that the same codes are reachable from several focus nodes, a few of them malformed. The shapes are
+identifier-validation shapes: several target classes check the same codes against the same set of patterns,
+once directly and once through ex:sameCode. The uncached mode turns the cache off with pattern_cache_size=0.
+Each mode is run with and without the fragment extraction, and the time of the fastest of the repeats is
+reported, for the whole run and for the sh:pattern evaluations alone (as recorded by a Profiler). Both modes must
+agree on the conformance and the number of validation results.
+
+Usage: python pattern_cache.py [items] [patterns] [repeats]
+"""
+import sys
+import timeit
+
+# A length check and a digit count, then the prefix, the hex body and the check digits
+PATTERN = "^(?=.{{8,{length}}}$)(?=(?:.*[0-9]){{3}})(?:[A-Z]{{2,4}}-)?(?:[0-9A-F]{{2}}){{2,{pairs}}}(?:-[0-9]{{1,{check}}})?$"
+PATTERN_SHAPE = '''
+ex:Pattern{n} a sh:PropertyShape ; sh:path ex:code ; sh:pattern "{pattern}" .
+ex:SamePattern{n} a sh:PropertyShape ; sh:path ( ex:sameCode ex:code ) ; sh:pattern "{pattern}" .
+'''
+PREFIXES = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+'''
+CLASSES = ('Item', 'Product', 'Part')
+
+
+def make_shapes(patterns):
+    ttl = [PREFIXES]
+    # Every code matches all the patterns, except malformed ones, so that each pattern is searched in every code
+    properties = []
+    for n in range(patterns):
+        pattern = PATTERN.format(length=20 + n, pairs=3 + n % 2, check=1 + n % 3)
+        ttl.append(PATTERN_SHAPE.format(n=n, pattern=pattern))
+        properties.append("ex:Pattern{0}, ex:SamePattern{0}".format(n))
+    for c in CLASSES:
+        shape = "ex:{0}Shape a sh:NodeShape ; sh:targetClass ex:{0} ; sh:property {1} .\n"
+        ttl.append(shape.format(c, ", ".join(properties)))
+    return "".join(ttl)
+
+
+def make_items(items):
+    from rdflib import RDF, Graph, Literal, Namespace
+
+    EX = Namespace("http://example.com/ns#")
+    g = Graph()
+    for i in range(items):
+        item = EX["i{}".format(i)]
+        g.add((item, RDF.type, EX[CLASSES[i % len(CLASSES)]]))
+        code = "bad code {}".format(i) if i % 1000 == 0 else "AB-{:06X}-{}".format(i, i % 10)
+        g.add((item, EX.code, Literal(code)))
+        g.add((item, EX.sameCode, EX["i{}".format((i * 7 + 1) % items)]))
+    return g
+
+
+def main():
+    import logging
+
+    from rdflib import Graph
+
+    from pyshacl import validate
+    from pyshacl.profiler import PHASE_CONSTRAINT_EVALUATE, Profiler
+
+    logging.disable(logging.WARNING)
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    patterns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    data_graph = make_items(items)
+    shacl_graph = Graph().parse(data=make_shapes(patterns), format='turtle')
+    print(
+        "Benchmark completed, {} items, {} patterns, {} triples, best of {} repeats.".format(
+            items, patterns, len(data_graph), repeats
+        )
+    )
+    disagree = []
+    for conformance_only in (False, True):
+        timings = {}
+        pattern_timings = {}
+        outcomes = {}
+        for cached in (False, True):
+            options = {} if cached else {'pattern_cache_size': 0}
+            pattern_times = []
+
+            def run():
+                profiler = Profiler()
+                conforms, report_graph, _, _ = validate(
+                    data_graph,
+                    shacl_graph=shacl_graph,
+                    conformance_only=conformance_only,
+                    profiler=profiler,
+                    **options,
+                )
+                outcomes[cached] = (conforms, len(report_graph))
+                evaluate = profiler.phases[PHASE_CONSTRAINT_EVALUATE]['by']
+                pattern_times.append(evaluate['PatternConstraintComponent']['wall'])
+
+            timings[cached] = min(timeit.repeat(run, number=1, repeat=repeats))
+            pattern_timings[cached] = min(pattern_times)
+        name = "conformance only" if conformance_only else "with fragment"
+        print(
+            "{}: uncached {:.3f} seconds, cached {:.3f} seconds, speedup {:.2f}x; "
+            "sh:pattern uncached {:.3f} seconds, cached {:.3f} seconds, speedup {:.2f}x".format(
+                name,
+                timings[False],
+                timings[True],
+                timings[False] / timings[True],
+                pattern_timings[False],
+                pattern_timings[True],
+                pattern_timings[False] / pattern_timings[True],
+            )
+        )
+        if outcomes[False] != outcomes[True]:
+            disagree.append(name)
+    if disagree:
+        print("The modes disagree on:\n{}".format("\n".join(disagree)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Compares validating a small data graph with a fresh `pyshacl` process per request, against sending it to a
+`pyshacl serve` daemon that keeps the Shapes Graph in memory.
+
+The daemon is started in this process, on a Unix socket, with as many worker processes as there are clients.
+Each client thread sends its requests one after the other, the latency of each request is measured, and the
+throughput of all clients together. The first request of each client sends the Shapes Graph, the later ones refer
+to it by its shapes_id, and each worker parses and harvests it once. Both ways must agree on the conformance of
+the data graph.
+
+Usage: python serve.py [requests] [clients]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from os import path
+
+HERE = path.abspath(path.dirname(__file__))
+
+SHAPES = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [ sh:path ex:name ; sh:datatype xsd:string ; sh:minCount 1 ] ;
+  sh:property [ sh:path ex:age ; sh:datatype xsd:integer ; sh:maxCount 1 ] ;
+  sh:property [ sh:path ex:knows ; sh:class ex:Person ] .
+'''
+
+
+def make_data(people):
+    lines = ["@prefix ex: <http://example.com/ns#> ."]
+    for i in range(people):
+        name = ' ; ex:name "Person {}"'.format(i) if i % 7 else ""
+        lines.append(
+            "ex:p{} a ex:Person{} ; ex:age {} ; ex:knows ex:p{} .".format(i, name, 20 + i % 50, (i + 1) % people)
+        )
+    return "\n".join(lines)
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(name, timings, elapsed):
+    print(
+        "{}: median {:.1f} ms, p95 {:.1f} ms, {:.1f} requests/second".format(
+            name, 1000 * percentile(timings, 0.5), 1000 * percentile(timings, 0.95), len(timings) / elapsed
+        )
+    )
+
+
+def run_cli(workdir, requests):
+    shapes_path = path.join(workdir, "shapes.ttl")
+    data_path = path.join(workdir, "data.ttl")
+    env = dict(os.environ, PYTHONPATH=path.join(HERE, '..'))
+    timings = []
+    conforms = None
+    start = time.perf_counter()
+    for _ in range(requests):
+        began = time.perf_counter()
+        done = subprocess.run(
+            [sys.executable, '-m', 'pyshacl', '-s', shapes_path, data_path], env=env, stdout=subprocess.DEVNULL
+        )
+        timings.append(time.perf_counter() - began)
+        # The CLI exits with 0 when the data graph conforms, and 1 when it does not
+        conforms = done.returncode == 0
+    return timings, time.perf_counter() - start, conforms
+
+
+def run_daemon(workdir, data, requests, clients):
+    from pyshacl.serve import ValidationClient, make_server
+
+    socket_path = path.join(workdir, "validate.sock")
+    server = make_server(socket_path=socket_path, workers=clients)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    timings = []
+    outcomes = set()
+
+    def client_loop(count):
+        client = ValidationClient(socket_path=socket_path)
+        sid = None
+        for _ in range(count):
+            began = time.perf_counter()
+            if sid is None:
+                response = client.validate(data, shapes=SHAPES, fragment=False)
+                sid = response['shapes_id']
+            else:
+                response = client.validate(data, shapes_id=sid, fragment=False)
+            timings.append(time.perf_counter() - began)
+            outcomes.add(response['conforms'])
+
+    try:
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client_loop, args=(requests // clients,)) for _ in range(clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+        server.validation_daemon.close()
+    return timings, elapsed, outcomes
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    data = make_data(50)
+    workdir = tempfile.mkdtemp()
+    try:
+        with open(path.join(workdir, "shapes.ttl"), "w") as f:
+            f.write(SHAPES)
+        with open(path.join(workdir, "data.ttl"), "w") as f:
+            f.write(data)
+        cli_timings, cli_elapsed, cli_conforms = run_cli(workdir, requests)
+        daemon_timings, daemon_elapsed, daemon_outcomes = run_daemon(workdir, data, requests, clients)
+    finally:
+        shutil.rmtree(workdir)
+    print("Benchmark completed, {} requests, {} daemon clients.".format(requests, clients))
+    report("pyshacl process per request", cli_timings, cli_elapsed)
+    report("pyshacl serve", daemon_timings, daemon_elapsed)
+    print("median latency speedup: {:.2f}x".format(percentile(cli_timings, 0.5) / percentile(daemon_timings, 0.5)))
+    if daemon_outcomes != {cli_conforms}:
+        print("The daemon and the CLI disagree on the conformance of the data graph.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
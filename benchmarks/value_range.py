@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Compares checking sh:minInclusive, sh:maxExclusive, etc by comparing each value node with each bound as rdflib
+terms, against comparing all the value nodes of a constraint with a bound at once, as the values of the literals
+that are decoded once per run.
+
+The data graph is generated, with sensor readings that have a numeric value, a timestamp and a date, a few of
+them out of range, ill-typed or of another kind. The per-term comparisons are forced by turning off the typed
+literal cache for the run. Each mode is run conformance-only, and the time of the fastest of the repeats is
+reported. Both modes must agree on the conformance and the number of validation results.
+
+Usage: python value_range.py [readings] [repeats]
+"""
+import sys
+import timeit
+
+from unittest import mock
+
+SHAPES = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+ex:ReadingShape a sh:NodeShape ;
+  sh:targetClass ex:Reading ;
+  sh:property [ sh:path ex:value ; sh:minInclusive -40.0 ; sh:maxExclusive 125 ] ;
+  sh:property [
+    sh:path ex:at ;
+    sh:minInclusive "2020-01-01T00:00:00Z"^^xsd:dateTime ;
+    sh:maxExclusive "2025-01-01T00:00:00Z"^^xsd:dateTime
+  ] ;
+  sh:property [ sh:path ex:on ; sh:maxInclusive "2024-12-31"^^xsd:date ] .
+'''
+
+
+def make_readings(readings):
+    import datetime
+    from decimal import Decimal
+
+    from rdflib import RDF, XSD, Graph, Literal, Namespace
+
+    EX = Namespace("http://example.com/ns#")
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    g = Graph()
+    for i in range(readings):
+        reading = EX["r{}".format(i)]
+        g.add((reading, RDF.type, EX.Reading))
+        if i % 500 == 0:
+            g.add((reading, EX.value, Literal("warm", datatype=XSD.decimal)))
+        elif i % 3:
+            g.add((reading, EX.value, Literal(Decimal(i % 170 - 45) / 4)))
+        else:
+            g.add((reading, EX.value, Literal(i % 190 - 50)))
+        at = start + datetime.timedelta(minutes=i * 7)
+        g.add((reading, EX.at, Literal(at if i % 400 else at.replace(tzinfo=None))))
+        g.add((reading, EX.on, Literal(at.date())))
+    return g
+
+
+def main():
+    from rdflib import Graph
+
+    from pyshacl import validate
+    from pyshacl.typed_literals import TypedLiteralCache
+
+    readings = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    data_graph = make_readings(readings)
+    shacl_graph = Graph().parse(data=SHAPES, format='turtle')
+    print(
+        "Benchmark completed, {} readings, {} triples, best of {} repeats.".format(readings, len(data_graph), repeats)
+    )
+    timings = {}
+    outcomes = {}
+    for typed in (False, True):
+
+        def run():
+            conforms, report_graph, _, _ = validate(data_graph, shacl_graph=shacl_graph, conformance_only=True)
+            outcomes[typed] = (conforms, len(report_graph))
+
+        if typed:
+            timings[typed] = min(timeit.repeat(run, number=1, repeat=repeats))
+        else:
+            with mock.patch.object(TypedLiteralCache, 'compare', return_value=None):
+                timings[typed] = min(timeit.repeat(run, number=1, repeat=repeats))
+    print(
+        "per term {:.3f} seconds, typed literals {:.3f} seconds, speedup {:.2f}x".format(
+            timings[False], timings[True], timings[False] / timings[True]
+        )
+    )
+    if outcomes[False] != outcomes[True]:
+        print("The modes disagree: {} and {}".format(outcomes[False], outcomes[True]))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
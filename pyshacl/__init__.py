@@ -2,11 +2,11 @@
 #
 from .shape import Shape
 from .shapes_graph import ShapesGraph
-from .validate import Validator, validate
+from .validate import Validator, validate, validate_many
 
 
 # version compliant with https://www.python.org/dev/peps/pep-0440/
 __version__ = '0.17.2'
 # Don't forget to change the version number in pyproject.toml and CITATION.cff along with this one
 
-__all__ = ['validate', 'Validator', '__version__', 'Shape', 'ShapesGraph']
+__all__ = ['validate', 'validate_many', 'Validator', '__version__', 'Shape', 'ShapesGraph']
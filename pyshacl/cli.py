@@ -7,11 +7,13 @@ import sys
 from os import path
 from rdflib import Graph
 from rdflib.compare import isomorphic
+from pyshacl.fragment_sink import NTriplesFragmentSink
+from pyshacl.profiler import Profiler
 
 sys.path.append("..")  # This line was added, otherwise ModuleNotFoundError: No module named 'pyshacl'
 from prettytable import PrettyTable
 from rdflib.namespace import SH
-from pyshacl import __version__, validate
+from pyshacl import __version__, validate, validate_many
 from pyshacl.errors import ReportableRuntimeError, ValidationFailure
 
 
@@ -28,7 +30,11 @@ class ShowVersion(argparse.Action):
 
 parser = argparse.ArgumentParser(description='PySHACL {} command line tool.'.format(str(__version__)))
 parser.add_argument(
-    'data', metavar='DataGraph', type=argparse.FileType('rb'), help='The file containing the Target Data Graph.'
+    'data',
+    metavar='DataGraph',
+    nargs='+',
+    help='The file containing the Target Data Graph. With more than one file, each file is validated on its own '
+    'against the same Shapes Graph, which is only loaded once.',
 )
 parser.add_argument(
     '-s', '--shacl', dest='shacl', action='store', nargs='?', help='A file containing the SHACL Shapes Graph.'
@@ -91,6 +97,72 @@ parser.add_argument(
     help="Run Shape's SHACL Rules iteratively until the data_graph reaches a steady state.",
 )
 parser.add_argument('--abort', dest='abort', action='store_true', default=False, help='Abort on first invalid data.')
+parser.add_argument(
+    '--conformance-only',
+    dest='conformance_only',
+    action='store_true',
+    default=False,
+    help='Only validate, without extracting the fragment. This is faster when the fragment is not wanted.',
+)
+parser.add_argument(
+    '--workers',
+    dest='workers',
+    action='store',
+    type=int,
+    default=1,
+    help='Validate the top-level shapes in parallel, in this many worker processes. '
+    'With more than one DataGraph file, validate that many files at a time instead. Default=1.',
+)
+parser.add_argument(
+    '--shard-size',
+    dest='shard_size',
+    action='store',
+    type=int,
+    default=None,
+    help='With --workers, split the focus nodes of shapes that have more than this many into shards, '
+    'that are validated in parallel.',
+)
+parser.add_argument(
+    '--path-cache-size',
+    dest='path_cache_size',
+    action='store',
+    type=int,
+    default=None,
+    help='How many (path, focus node) evaluations to keep, for shapes with the same path to reuse. '
+    '0 turns the cache off. Default=100000.',
+)
+parser.add_argument(
+    '--pattern-cache-size',
+    dest='pattern_cache_size',
+    action='store',
+    type=int,
+    default=None,
+    help='How many sh:pattern matches of a (pattern, flags, string) to keep, for shapes with the same pattern '
+    'to reuse. 0 turns the cache off. Default=1000000.',
+)
+parser.add_argument(
+    '--store',
+    dest='store',
+    action='store',
+    default=None,
+    help='The rdflib store to load the DataGraph into, eg CompactMemory, which keeps its terms encoded as '
+    'integers and uses less memory on large graphs. Default is the rdflib default store.',
+)
+parser.add_argument(
+    '--freeze',
+    dest='freeze',
+    action='store_true',
+    default=False,
+    help='Look up the triples of the DataGraph in a read-only snapshot of it, indexed as integer arrays, '
+    'taken after inference and rules. Faster on large graphs.',
+)
+parser.add_argument(
+    '--profile',
+    dest='profile',
+    action='store_true',
+    default=False,
+    help='Write the time spent in each phase of the validation, and counts of the work done, to stderr as JSON.',
+)
 parser.add_argument(
     '-w',
     '--allow-warnings',
@@ -169,10 +241,71 @@ parser.add_argument(
 # parser.add_argument('-h', '--help', action="help", help='Show this help text.')
 
 
+def validate_data_files(args, validator_kwargs, profiler):
+    """
+    Validate each of the DataGraph files against the same Shapes Graph, with validate_many().
+    The output of each file is written as soon as it is validated, after a "# <file name>" line.
+    Exits with 0 if all of the files conform, 1 if any does not.
+    """
+    if args.shacl is None:
+        sys.stderr.write("More than one DataGraph file can only be validated against a SHACL Shapes Graph file.\n")
+        sys.exit(2)
+    if args.format == 'table' or args.expected_output is not None:
+        sys.stderr.write("The table format and expected output only work with one DataGraph file.\n")
+        sys.exit(2)
+    # Each file is validated in a single process, files are spread across the workers instead
+    validator_kwargs.pop('shard_size', None)
+    all_conform = True
+    try:
+        results = validate_many(args.data, **validator_kwargs)
+        for name, (is_conform, v_graph, v_text, triples) in zip(args.data, results):
+            all_conform = all_conform and is_conform
+            args.output.write("# {}\n".format(name))
+            if isinstance(v_graph, ValidationFailure):
+                args.output.write("Validator generated a Validation Failure result:\n")
+                args.output.write(str(v_graph.message))
+                args.output.write("\n")
+                continue
+            if args.return_subgraphs:
+                subgraph = Graph()
+                for triple in triples:
+                    subgraph.add(triple)
+                output = subgraph.serialize(format='nt' if args.format == 'human' else args.format)
+            elif args.format == 'human':
+                output = v_text
+            else:
+                output = v_graph
+            if isinstance(output, bytes):
+                output = output.decode('utf-8')
+            args.output.write(output)
+            args.output.flush()
+    except ReportableRuntimeError as rre:
+        sys.stderr.write("Validator encountered a Runtime Error:\n")
+        sys.stderr.write(str(rre.message))
+        sys.stderr.write("\nIf you believe this is a bug in pyshacl, open an Issue on the pyshacl github page.\n")
+        sys.exit(2)
+    except NotImplementedError as nie:
+        sys.stderr.write("Validator feature is not implemented:\n")
+        sys.stderr.write(str(nie.args[0]))
+        sys.stderr.write("\nIf your use-case requires this feature, open an Issue on the pyshacl github page.\n")
+        sys.exit(3)
+    if profiler is not None:
+        # Not to stdout, where the reports or the fragments go
+        sys.stderr.write(profiler.to_json())
+        sys.stderr.write("\n")
+    args.output.close()
+    sys.exit(0 if all_conform else 1)
+
+
 def main():
     basename = os.path.basename(sys.argv[0])
     if basename == "__main__.py":
         parser.prog = "python3 -m pyshacl"
+    if sys.argv[1:2] == ['serve']:
+        # pyshacl serve, the long-running validation daemon. A data file named serve can be given as ./serve
+        from pyshacl.serve import main as serve_main
+
+        return serve_main(sys.argv[2:])
     args = parser.parse_args()
     validator_kwargs = {'debug': args.debug}
     if args.shacl is not None:
@@ -200,6 +333,29 @@ def main():
         validator_kwargs['abort_on_first'] = True
     if args.allow_warnings:
         validator_kwargs['allow_warnings'] = True
+    if args.return_subgraphs:
+        # Only the fragment is output, so the validation results do not have to be built
+        validator_kwargs['fragment_only'] = True
+    if args.conformance_only:
+        if args.return_subgraphs:
+            sys.stderr.write("No fragment is extracted with the Conformance-Only option.\n")
+        validator_kwargs['conformance_only'] = True
+    if args.workers > 1:
+        validator_kwargs['workers'] = args.workers
+    if args.shard_size:
+        validator_kwargs['shard_size'] = args.shard_size
+    if args.path_cache_size is not None:
+        validator_kwargs['path_cache_size'] = args.path_cache_size
+    if args.pattern_cache_size is not None:
+        validator_kwargs['pattern_cache_size'] = args.pattern_cache_size
+    if args.store:
+        validator_kwargs['store'] = args.store
+    if args.freeze:
+        validator_kwargs['freeze'] = True
+    profiler = None
+    if args.profile:
+        profiler = Profiler()
+        validator_kwargs['profiler'] = profiler
     if args.shacl_file_format:
         f = args.shacl_file_format
         if f != "auto":
@@ -212,11 +368,25 @@ def main():
         f = args.data_file_format
         if f != "auto":
             validator_kwargs['data_graph_format'] = f
+    if len(args.data) > 1:
+        validate_data_files(args, validator_kwargs, profiler)
+    # The fragment can be written as N-Triples while validating, unless it needs to be in a Graph first
+    stream_fragment = args.return_subgraphs and args.format in ('human', 'nt') and args.expected_output is None
+    if stream_fragment:
+        fragment_sink = NTriplesFragmentSink(args.output)
+        validator_kwargs['fragment_sink'] = fragment_sink
+    try:
+        data_file = argparse.FileType('rb')(args.data[0])
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
     try:
-        is_conform, v_graph, v_text, triples = validate(args.data, **validator_kwargs)
-        subgraph = Graph()  # This is the conforming subgraph (containing paths of conforming focus nodes)
-        for triple in triples:
-            subgraph.add(triple)
+        is_conform, v_graph, v_text, triples = validate(data_file, **validator_kwargs)
+        if stream_fragment:
+            fragment_sink.close()
+        else:
+            subgraph = Graph()  # This is the conforming subgraph (containing paths of conforming focus nodes)
+            for triple in triples:
+                subgraph.add(triple)
         if isinstance(v_graph, BaseException):
             raise v_graph
     except ValidationFailure as vf:
@@ -243,6 +413,11 @@ def main():
         )
         sys.exit(2)
 
+    if profiler is not None:
+        # Not to stdout, where the report or the fragment goes
+        sys.stderr.write(profiler.to_json())
+        sys.stderr.write("\n")
+
     if args.expected_output is not None:
         with open(args.expected_output) as f:
             expected_output = f.read()
@@ -262,7 +437,10 @@ def main():
                 if triple_binary_string:
                     print(triple_binary_string.decode('ascii'))
 
-    if args.return_subgraphs:
+    if stream_fragment:
+        # The fragment was already written out by the fragment sink
+        pass
+    elif args.return_subgraphs:
         if args.format == 'human':
             subgraph = subgraph.serialize(format='nt')
         else:
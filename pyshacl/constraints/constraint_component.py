@@ -4,36 +4,21 @@
 https://www.w3.org/TR/shacl/#core-components-value-type
 """
 import abc
+import logging
 import re
 import typing
 
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from rdflib import BNode, Literal, URIRef
-
-from pyshacl.consts import (
-    SH,
-    RDF_type,
-    SH_ask,
-    SH_focusNode,
-    SH_jsFunctionName,
-    SH_parameter,
-    SH_path,
-    SH_resultMessage,
-    SH_resultPath,
-    SH_resultSeverity,
-    SH_select,
-    SH_sourceConstraint,
-    SH_sourceConstraintComponent,
-    SH_sourceShape,
-    SH_ValidationResult,
-    SH_value,
-    SH_Violation,
-)
+from rdflib import Literal, URIRef
+
+from pyshacl.consts import SH, RDF_type, SH_ask, SH_jsFunctionName, SH_parameter, SH_path, SH_select, SH_Violation
 from pyshacl.errors import ConstraintLoadError
 from pyshacl.parameter import SHACLParameter
+from pyshacl.profiler import COUNT_TRIPLES_TOUCHED
 from pyshacl.pytypes import GraphLike
 from pyshacl.rdfutil import stringify_node
+from pyshacl.result import ValidationResult
 
 
 if TYPE_CHECKING:
@@ -84,6 +69,16 @@ class ConstraintComponent(object, metaclass=abc.ABCMeta):
     def make_generic_messages(self, datagraph: GraphLike, focus_node, value_node) -> List[Literal]:
         return []
 
+    def count_triples_touched(self, triples: int):
+        """
+        Count the data graph triples this component read itself, when the run is profiled.
+        :param triples:
+        :type triples: int
+        """
+        profiler = self.shape.sg.profiler
+        if profiler is not None:
+            profiler.count(COUNT_TRIPLES_TOUCHED, triples)
+
     def __str__(self):
         c_name = str(self.__class__.__name__)
         shape_id = str(self.shape)
@@ -108,6 +103,11 @@ class ConstraintComponent(object, metaclass=abc.ABCMeta):
                             except IndexError:
                                 pass
                         break
+        if maybe_recursive:
+            # Anything evaluated from here on may be cut short, so it depends on the evaluation path
+            memo = shape.sg.memo
+            if memo is not None:
+                memo.note_recursion()
         return maybe_recursive
 
     def make_v_result_description(
@@ -202,7 +202,7 @@ class ConstraintComponent(object, metaclass=abc.ABCMeta):
         source_constraint: Optional['Identifier'] = None,
         extra_messages: Optional[Iterable] = None,
         bound_vars=None,
-    ):
+    ) -> ValidationResult:
         """
         :param datagraph:
         :type datagraph: rdflib.Graph | rdflib.ConjunctiveGraph | rdflib.Dataset
@@ -217,60 +217,24 @@ class ConstraintComponent(object, metaclass=abc.ABCMeta):
         :param extra_messages:
         :type extra_messages: collections.abc.Iterable | None
         :param bound_vars:
-        :return:
+        :return: The result, its description and report triples are only made when asked for
+        :rtype: ValidationResult
         """
-        constraint_component = constraint_component or self.shacl_constraint_component
-        severity = self.shape.severity
-        sg = self.shape.sg.graph
-        r_triples = list()
-        r_node = BNode()
-        r_triples.append((r_node, RDF_type, SH_ValidationResult))
-        r_triples.append((r_node, SH_sourceConstraintComponent, (sg, constraint_component)))
-        r_triples.append((r_node, SH_sourceShape, (sg, self.shape.node)))
-        r_triples.append((r_node, SH_resultSeverity, severity))
-        r_triples.append((r_node, SH_focusNode, (datagraph or sg, focus_node)))
-        if value_node is not None:
-            r_triples.append((r_node, SH_value, (datagraph, value_node)))
-        if result_path is None and self.shape.is_property_shape:
-            result_path = self.shape.path()
-        if result_path is not None:
-            r_triples.append((r_node, SH_resultPath, (sg, result_path)))
-        if source_constraint is not None:
-            r_triples.append((r_node, SH_sourceConstraint, (sg, source_constraint)))
-        messages = list(self.shape.message)
-        if extra_messages:
-            for m in iter(extra_messages):
-                if m in messages:
-                    continue
-                if isinstance(m, Literal):
-                    msg = str(m.value)
-                    if bound_vars is not None:
-                        msg = self._format_sparql_based_result_message(msg, bound_vars)
-                        m = Literal(msg)
-                r_triples.append((r_node, SH_resultMessage, m))
-        elif not messages:
-            messages = self.make_generic_messages(datagraph, focus_node, value_node) or messages
-        for m in messages:
-            if isinstance(m, Literal):
-                msg = str(m.value)
-                if bound_vars is not None:
-                    msg = self._format_sparql_based_result_message(msg, bound_vars)
-                    m = Literal(msg)
-            r_triples.append((r_node, SH_resultMessage, m))
-        desc = self.make_v_result_description(
+        result = ValidationResult(
+            self,
             datagraph,
             focus_node,
-            severity,
-            value_node,
-            messages,
+            value_node=value_node,
             result_path=result_path,
             constraint_component=constraint_component,
             source_constraint=source_constraint,
             extra_messages=extra_messages,
             bound_vars=bound_vars,
         )
-        self.shape.logger.debug(desc)
-        return desc, r_node, r_triples
+        logger = self.shape.logger
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(result.description)
+        return result
 
     def _format_sparql_based_result_message(self, msg, bound_vars):
         if bound_vars is None:
@@ -88,14 +88,23 @@ class MinCountConstraintComponent(ConstraintComponent):
         :type focus_value_nodes: dict
         :type _evaluation_path: list
         """
+        return self.evaluate_counts(target_graph, {f: len(v) for f, v in focus_value_nodes.items()}, _evaluation_path)
+
+    def evaluate_counts(self, target_graph: GraphLike, focus_counts: Dict, _evaluation_path: List):
+        """
+        Like evaluate(), but from the number of value nodes of each focus node, see ShapePlan.count_path.
+        :type target_graph: rdflib.Graph
+        :type focus_counts: dict
+        :type _evaluation_path: list
+        """
         min_count = int(self.min_count.value)
 
         reports = []
         non_conformant = False
-        subgraphs = {fn: set() for fn in focus_value_nodes}
+        subgraphs = {fn: set() for fn in focus_counts}
 
-        for f, value_nodes in focus_value_nodes.items():
-            if not len(value_nodes) >= min_count:
+        for f, count in focus_counts.items():
+            if not count >= min_count:
                 subgraphs.pop(f)
                 non_conformant = True
                 rept = self.make_v_result(target_graph, f)
@@ -168,13 +177,22 @@ class MaxCountConstraintComponent(ConstraintComponent):
         :type focus_value_nodes: dict
         :type _evaluation_path: list
         """
+        return self.evaluate_counts(target_graph, {f: len(v) for f, v in focus_value_nodes.items()}, _evaluation_path)
+
+    def evaluate_counts(self, target_graph: GraphLike, focus_counts: Dict, _evaluation_path: List):
+        """
+        Like evaluate(), but from the number of value nodes of each focus node, see ShapePlan.count_path.
+        :type target_graph: rdflib.Graph
+        :type focus_counts: dict
+        :type _evaluation_path: list
+        """
         max_count = int(self.max_count.value)
         reports = []
         non_conformant = False
-        subgraphs = {fn: set() for fn in focus_value_nodes}
+        subgraphs = {fn: set() for fn in focus_counts}
 
-        for f, value_nodes in focus_value_nodes.items():
-            if not len(value_nodes) <= max_count:
+        for f, count in focus_counts.items():
+            if not count <= max_count:
                 subgraphs.pop(f)
                 non_conformant = True
                 rept = self.make_v_result(target_graph, f)
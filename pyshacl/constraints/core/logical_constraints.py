@@ -75,14 +75,19 @@ class NotConstraintComponent(ConstraintComponent):
         reports = []
         non_conformant = False
         potentially_recursive = self.recursion_triggers(_evaluation_path)
+        # A value node that does not conform to the sh:not shape has no witness triples,
+        # so a conforming focus node keeps an empty neighborhood
+        subgraphs = {fn: set() for fn in focus_value_nodes}
 
         for not_c in self.not_list:
-            _nc, _r = self._evaluate_not_constraint(
+            _nc, _r, _nonconforming_focus_nodes = self._evaluate_not_constraint(
                 not_c, datagraph, focus_value_nodes, potentially_recursive, _evaluation_path
             )
             non_conformant = non_conformant or _nc
             reports.extend(_r)
-        return (not non_conformant), reports
+            for fn in _nonconforming_focus_nodes:
+                subgraphs.pop(fn, None)
+        return (not non_conformant), reports, subgraphs
 
     def _evaluate_not_constraint(self, not_c, datagraph, focus_value_nodes, potentially_recursive, _evaluation_path):
         """
@@ -94,6 +99,7 @@ class NotConstraintComponent(ConstraintComponent):
         """
         _reports = []
         _non_conformant = False
+        _nonconforming_focus_nodes = set()
         not_shape = self.shape.get_other_shape(not_c)
         if not not_shape:
             raise ReportableRuntimeError(
@@ -101,19 +107,22 @@ class NotConstraintComponent(ConstraintComponent):
             )
         if not_shape in potentially_recursive:
             warn(ShapeRecursionWarning(_evaluation_path))
-            return _non_conformant, _reports
+            return _non_conformant, _reports, _nonconforming_focus_nodes
+        all_value_nodes = {v for value_nodes in focus_value_nodes.values() for v in value_nodes}
+        try:
+            results = not_shape.validate_each(datagraph, all_value_nodes, _evaluation_path)
+        except ValidationFailure as e:
+            raise e
         for f, value_nodes in focus_value_nodes.items():
             for v in value_nodes:
-                try:
-                    _is_conform, _r = not_shape.validate(datagraph, focus=v, _evaluation_path=_evaluation_path[:])
-                except ValidationFailure as e:
-                    raise e
+                _is_conform = results[v][0]
                 if _is_conform:
                     # in this case, we _dont_ want to conform!
                     _non_conformant = True
                     rept = self.make_v_result(datagraph, f, value_node=v)
                     _reports.append(rept)
-        return _non_conformant, _reports
+                    _nonconforming_focus_nodes.add(f)
+        return _non_conformant, _reports, _nonconforming_focus_nodes
 
 
 class AndConstraintComponent(ConstraintComponent):
@@ -183,21 +192,23 @@ class AndConstraintComponent(ConstraintComponent):
                         "Shape pointed to by sh:and does not exist or is not a well-formed SHACL Shape."
                     )
                 and_shapes.add(and_shape)
+            all_value_nodes = {v for value_nodes in focus_value_nodes.values() for v in value_nodes}
+            try:
+                shape_results = [
+                    and_shape.validate_each(target_graph, all_value_nodes, _evaluation_path)
+                    for and_shape in and_shapes
+                ]
+            except ValidationFailure as e:
+                raise e
             for f, value_nodes in focus_value_nodes.items():
                 for v in value_nodes:
                     passed_all = True
                     v_subgraph = set()
-                    for and_shape in and_shapes:
-                        try:
-                            _is_conform, _r, _sg = and_shape.validate(
-                                target_graph, focus=v, _evaluation_path=_evaluation_path[:]
-                            )
-                            # in v_subgraph, build the union of v's neighborhoods for all shapes in and_list
-                            # we will add it this to f's neighborhood
-                            for fn in _sg:
-                                v_subgraph.update(_sg[fn])
-                        except ValidationFailure as e:
-                            raise e
+                    for results in shape_results:
+                        _is_conform, _r, _v_subgraph = results[v]
+                        # in v_subgraph, build the union of v's neighborhoods for all shapes in and_list
+                        # we will add it this to f's neighborhood
+                        v_subgraph.update(_v_subgraph)
                         passed_all = passed_all and _is_conform
                     if not passed_all:
                         _non_conformant = True
@@ -299,24 +310,25 @@ class OrConstraintComponent(ConstraintComponent):
                         "Shape pointed to by sh:or does not exist or is not a well-formed SHACL Shape."
                     )
                 or_shapes.add(or_shape)
+            all_value_nodes = {v for value_nodes in focus_value_nodes.values() for v in value_nodes}
+            try:
+                shape_results = [
+                    or_shape.validate_each(target_graph, all_value_nodes, _evaluation_path) for or_shape in or_shapes
+                ]
+            except ValidationFailure as e:
+                raise e
             for f, value_nodes in focus_value_nodes.items():
                 for v in value_nodes:
                     passed_any = False
-                    for or_shape in or_shapes:
-                        try:
-                            _is_conform, _r, _sg = or_shape.validate(
-                                target_graph, focus=v, _evaluation_path=_evaluation_path[:]
-                            )
-                            # if f conforms to a shape in or_list, return the neighborhood for f and that shape
-                            # if fn conforms to multiple shapes in or_list, make the union of those neighborhoods
-                            # (recall that fn conforming to a shape means fn is a key in that shape's _sg)
-                            for fn in _sg:
-                                if fn in _subgraphs:
-                                    _subgraphs[f].update(_sg[fn])
-                                else:
-                                    _subgraphs[f] = _sg[fn]
-                        except ValidationFailure as e:
-                            raise e
+                    for results in shape_results:
+                        _is_conform, _r, _v_subgraph = results[v]
+                        # if v conforms to a shape in or_list, add the neighborhood for v and that shape to f's
+                        # if v conforms to multiple shapes in or_list, make the union of those neighborhoods
+                        if _is_conform:
+                            if f in _subgraphs:
+                                _subgraphs[f].update(_v_subgraph)
+                            else:
+                                _subgraphs[f] = set(_v_subgraph)
                         passed_any = passed_any or _is_conform
                     if not passed_any:
                         _non_conformant = True
@@ -392,11 +404,13 @@ class XoneConstraintComponent(ConstraintComponent):
         reports = []
         non_conformant = False
         shape = self.shape
+        subgraphs = {fn: set() for fn in focus_value_nodes}
 
         def _evaluate_xone_constraint(xone_c):
             nonlocal self, shape, target_graph, focus_value_nodes, _evaluation_path
             _reports = []
             _non_conformant = False
+            _subgraphs = {}
             sg = shape.sg.graph
             xone_list = list(sg.items(xone_c))
             if len(xone_list) < 1:
@@ -409,26 +423,49 @@ class XoneConstraintComponent(ConstraintComponent):
                         "Shape pointed to by sh:xone does not exist or is not a well-formed SHACL Shape."
                     )
                 xone_shapes.append(xone_shape)
+            all_value_nodes = {v for value_nodes in focus_value_nodes.values() for v in value_nodes}
+            try:
+                shape_results = [
+                    xone_shape.validate_each(target_graph, all_value_nodes, _evaluation_path)
+                    for xone_shape in xone_shapes
+                ]
+            except ValidationFailure as e:
+                raise e
             for f, value_nodes in focus_value_nodes.items():
+                f_failed = False
+                f_subgraph = set()
                 for v in value_nodes:
                     passed_count = 0
-                    for xone_shape in xone_shapes:
-                        try:
-                            _is_conform, _r = xone_shape.validate(
-                                target_graph, focus=v, _evaluation_path=_evaluation_path[:]
-                            )
-                        except ValidationFailure as e:
-                            raise e
+                    v_subgraph = None
+                    for results in shape_results:
+                        _is_conform, _r, _v_subgraph = results[v]
                         if _is_conform:
                             passed_count += 1
+                            v_subgraph = _v_subgraph
                     if not (passed_count == 1):
                         _non_conformant = True
+                        f_failed = True
                         rept = self.make_v_result(target_graph, f, value_node=v)
                         _reports.append(rept)
-            return _non_conformant, _reports
+                    else:
+                        # v conforms to exactly one shape in xone_list, its neighborhood for that shape
+                        # is added to the neighborhood of the focus node
+                        f_subgraph.update(v_subgraph)
+                if not f_failed:
+                    _subgraphs[f] = f_subgraph
+            return _non_conformant, _reports, _subgraphs
 
         for xone_c in self.xone_nodes:
-            _nc, _r = _evaluate_xone_constraint(xone_c)
+            _nc, _r, _sg = _evaluate_xone_constraint(xone_c)
             non_conformant = non_conformant or _nc
             reports.extend(_r)
-        return (not non_conformant), reports
+            # _sg only has a key for each focus node that satisfies the current xone_c
+            to_delete = set()
+            for fn in subgraphs:
+                if fn not in _sg:
+                    to_delete.add(fn)
+                else:
+                    subgraphs[fn].update(_sg[fn])
+            for fn in to_delete:
+                subgraphs.pop(fn)
+        return (not non_conformant), reports, subgraphs
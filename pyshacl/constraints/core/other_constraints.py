@@ -169,10 +169,12 @@ class ClosedConstraintComponent(ConstraintComponent):
             if p:
                 working_paths.add(p)
 
+        touched = 0
         for f, value_nodes in focus_value_nodes.items():
             for v in value_nodes:
                 pred_obs = target_graph.predicate_objects(v)
                 for p, o in pred_obs:
+                    touched += 1
                     if (p, o) in self.ALWAYS_IGNORE:
                         continue
                     elif p in self.ignored_props:
@@ -182,6 +184,7 @@ class ClosedConstraintComponent(ConstraintComponent):
                     non_conformant = True
                     rept = self.make_v_result(target_graph, f, value_node=o, result_path=p)
                     reports.append(rept)
+        self.count_triples_touched(touched)
         return (not non_conformant), reports
 
 
@@ -262,7 +265,7 @@ class HasValueConstraintComponent(ConstraintComponent):
             for v_node in value_nodes:
                 if v_node == hv:
                     conformant = True
-                    subgraphs[f] = value_nodes[v_node]
+                    subgraphs[f] = set(value_nodes[v_node])
             if not conformant:
                 non_conformant = True
                 # Note, including the value in the report generation here causes this constraint to not pass
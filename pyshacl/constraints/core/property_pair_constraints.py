@@ -95,9 +95,11 @@ class EqualsConstraintComponent(ConstraintComponent):
         reports = []
         non_conformant = False
         subgraphs = {}
+        touched = 0
         for f, value_nodes in f_v_dict.items():
             value_node_set = set(value_nodes)
             compare_values = set(target_graph.objects(f, eq))
+            touched += len(compare_values)
             value_nodes_missing = value_node_set.difference(compare_values)
             compare_values_missing = compare_values.difference(value_node_set)
             if len(value_nodes_missing) > 0 or len(compare_values_missing) > 0:
@@ -110,6 +112,7 @@ class EqualsConstraintComponent(ConstraintComponent):
             for compare_value in compare_values_missing:
                 rept = self.make_v_result(target_graph, f, value_node=compare_value)
                 reports.append(rept)
+        self.count_triples_touched(touched)
         return non_conformant, reports, subgraphs
 
 
@@ -174,9 +177,11 @@ class DisjointConstraintComponent(ConstraintComponent):
     def _evaluate_property_disjoint(self, dj, target_graph, f_v_dict):
         reports = []
         non_conformant = False
+        touched = 0
         for f, value_nodes in f_v_dict.items():
             value_node_set = set(value_nodes)
             compare_values = set(target_graph.objects(f, dj))
+            touched += len(compare_values)
             common_nodes = value_node_set.intersection(compare_values)
             if len(common_nodes) > 0:
                 non_conformant = True
@@ -186,6 +191,7 @@ class DisjointConstraintComponent(ConstraintComponent):
                 rept = self.make_v_result(target_graph, f, value_node=common_node)
                 reports.append(rept)
 
+        self.count_triples_touched(touched)
         return non_conformant, reports
 
 
@@ -257,9 +263,11 @@ class LessThanConstraintComponent(ConstraintComponent):
     def _evaluate_less_than(self, lt, target_graph, f_v_dict):
         reports = []
         non_conformant = False
+        touched = 0
         for f, value_nodes in f_v_dict.items():
             value_node_set = set(value_nodes)
             compare_values = set(target_graph.objects(f, lt))
+            touched += len(compare_values)
 
             for value_node in iter(value_node_set):
                 if isinstance(value_node, rdflib.BNode):
@@ -291,6 +299,7 @@ class LessThanConstraintComponent(ConstraintComponent):
                         continue
                     rept = self.make_v_result(target_graph, f, value_node=orig_value_node)
                     reports.append(rept)
+        self.count_triples_touched(touched)
         return non_conformant, reports
 
 
@@ -362,9 +371,11 @@ class LessThanOrEqualsConstraintComponent(ConstraintComponent):
     def _evaluate_ltoe(self, lt, target_graph, f_v_dict):
         reports = []
         non_conformant = False
+        touched = 0
         for f, value_nodes in f_v_dict.items():
             value_node_set = set(value_nodes)
             compare_values = set(target_graph.objects(f, lt))
+            touched += len(compare_values)
 
             for value_node in iter(value_node_set):
                 if isinstance(value_node, rdflib.BNode):
@@ -396,4 +407,5 @@ class LessThanOrEqualsConstraintComponent(ConstraintComponent):
                         continue
                     rept = self.make_v_result(target_graph, f, value_node=orig_value_node)
                     reports.append(rept)
+        self.count_triples_touched(touched)
         return non_conformant, reports
@@ -9,13 +9,7 @@ import rdflib
 
 from pyshacl.constraints.constraint_component import ConstraintComponent
 from pyshacl.consts import SH, SH_node, SH_property
-from pyshacl.errors import (
-    ConstraintLoadError,
-    ConstraintLoadWarning,
-    ReportableRuntimeError,
-    ShapeRecursionWarning,
-    ValidationFailure,
-)
+from pyshacl.errors import ConstraintLoadError, ConstraintLoadWarning, ReportableRuntimeError, ShapeRecursionWarning
 from pyshacl.pytypes import GraphLike
 from pyshacl.rdfutil import stringify_node
 
@@ -87,25 +81,31 @@ class PropertyConstraintComponent(ConstraintComponent):
             prop_shape = shape.get_other_shape(prop_shape)
             if prop_shape in potentially_recursive:
                 warn(ShapeRecursionWarning(_evaluation_path))
-                return _non_conformant, _reports
+                return _non_conformant, _reports, _subgraph
             if not prop_shape or not prop_shape.is_property_shape:
                 raise ReportableRuntimeError(
                     "Shape pointed to by sh:property does not exist or is not a well-formed SHACL PropertyShape."
                 )
 
+            # validate all distinct value nodes in one go, then hand the results out to their focus nodes
+            results = prop_shape.validate_each(
+                target_graph, (v for value_nodes in focus_value_nodes.values() for v in value_nodes), _evaluation_path
+            )
+            reported = set()
             for f, value_nodes in focus_value_nodes.items():
                 for v in value_nodes:
-                    _is_conform, _r, _value_node_subgraph = prop_shape.validate(target_graph, focus=v,
-                                                                                _evaluation_path=_evaluation_path[:])
-                    # sanity check: _value_node_subgraph contains at most subgraphs for v
-                    assert (not _value_node_subgraph) or (len(_value_node_subgraph) == 1 and v in _value_node_subgraph)
+                    _is_conform, _r, _value_node_subgraph = results[v]
                     # add the neighborhoods of conforming value nodes to the neighborhood of f
                     # and delete focus nodes from the subgraph output that have non-conforming value nodes:
-                    if _is_conform and f in _subgraph and v in _value_node_subgraph:
-                        _subgraph[f].update(_value_node_subgraph[v])
-                    else:
-                        _subgraph.pop(f)
+                    if _is_conform and f in _subgraph:
+                        _subgraph[f].update(_value_node_subgraph)
+                    elif not _is_conform:
+                        _subgraph.pop(f, None)
                     _non_conformant = _non_conformant or (not _is_conform)
+                    if v in reported:
+                        # a value node shared by several focus nodes gets its own results for each of them
+                        _r = [r.fresh() for r in _r]
+                    reported.add(v)
                     _reports.extend(_r)
             return _non_conformant, _reports, _subgraph
 
@@ -188,29 +188,31 @@ class NodeConstraintComponent(ConstraintComponent):
             node_shape = shape.get_other_shape(node_shape)
             if node_shape in potentially_recursive:
                 warn(ShapeRecursionWarning(_evaluation_path))
-                return _non_conformant, _reports
+                return _non_conformant, _reports, _subgraphs
             if not node_shape or node_shape.is_property_shape:
                 raise ReportableRuntimeError(
                     "Shape pointed to by sh:node does not exist or is not a well-formed SHACL NodeShape."
                 )
+            results = node_shape.validate_each(
+                target_graph, (v for value_nodes in focus_value_nodes.values() for v in value_nodes), _evaluation_path
+            )
             for f, value_nodes in focus_value_nodes.items():
                 for v in value_nodes:
-                    _is_conform, _r, _sg = node_shape.validate(
-                        target_graph, focus=v, _evaluation_path=_evaluation_path[:])
+                    _is_conform, _r, _v_subgraph = results[v]
                     # ignore the fails from the node, create our own fail
                     if (not _is_conform) or len(_r) > 0:
                         # f is non-conformant, meaning it should not be a key in _subgraphs
-                        _subgraphs.pop(f)
+                        _subgraphs.pop(f, None)
 
                         _non_conformant = True
                         rept = self.make_v_result(target_graph, f, value_node=v)
                         _reports.append(rept)
-                    else:
+                    elif f in _subgraphs:
                         # if v conforms to the node shape,
                         # add the path from f to v to f's neighborhood:
                         _subgraphs[f].update(focus_value_nodes[f][v])
                         # ...and add the neighborhood of v and the node shape
-                        _subgraphs[f].update(_sg[v])
+                        _subgraphs[f].update(_v_subgraph)
             return _non_conformant, _reports, _subgraphs
 
         for n_shape in self.node_shapes:
@@ -334,7 +336,7 @@ class QualifiedValueShapeConstraintComponent(ConstraintComponent):
             other_shape = shape.get_other_shape(_v_shape)
             if other_shape in potentially_recursive:
                 warn(ShapeRecursionWarning(_evaluation_path))
-                return _non_conformant, _reports
+                return _non_conformant, _reports, _subgraphs
             if not other_shape:
                 raise ReportableRuntimeError(
                     "Shape pointed to by sh:property does not exist or is not a well-formed SHACL Shape."
@@ -354,30 +356,25 @@ class QualifiedValueShapeConstraintComponent(ConstraintComponent):
                 sibling_shapes = set(self.shape.get_other_shape(s) for s in sibling_shapes)
             else:
                 sibling_shapes = set()
+            all_value_nodes = {v for value_nodes in focus_value_nodes.values() for v in value_nodes}
+            results = other_shape.validate_each(target_graph, all_value_nodes, _evaluation_path)
+            # only the value nodes that conform to the qualified value shape need to be checked against siblings
+            conforming = {v for v in all_value_nodes if results[v][0]}
+            conforms_to_sibling = set()
+            for sibling_shape in sibling_shapes:
+                sibling_results = sibling_shape.validate_each(target_graph, conforming, _evaluation_path)
+                conforms_to_sibling.update(v for v, r in sibling_results.items() if r[0])
             for f, value_nodes in focus_value_nodes.items():
                 number_conforms = 0
                 for v in value_nodes:
-                    try:
-                        _is_conform, _r, _sg = other_shape.validate(
-                            target_graph, focus=v, _evaluation_path=_evaluation_path[:]
-                        )
-                        if _is_conform:
-                            # if v conforms to the qualified value shape,
-                            # add the path from f to v to f's neighborhood:
-                            _subgraphs[f].update(focus_value_nodes[f][v])
-                            # ...and add the neighborhood of v and the qualified shape
-                            _subgraphs[f].update(_sg[v])
-
-                            _conforms_to_sibling = False
-                            for sibling_shape in sibling_shapes:
-                                _c2, _r = sibling_shape.validate(
-                                    target_graph, focus=v, _evaluation_path=_evaluation_path[:]
-                                )
-                                _conforms_to_sibling = _conforms_to_sibling or _c2
-                            if not _conforms_to_sibling:
-                                number_conforms += 1
-                    except ValidationFailure as v:
-                        raise v
+                    if v in conforming:
+                        # if v conforms to the qualified value shape,
+                        # add the path from f to v to f's neighborhood:
+                        _subgraphs[f].update(focus_value_nodes[f][v])
+                        # ...and add the neighborhood of v and the qualified shape
+                        _subgraphs[f].update(results[v][2])
+                        if v not in conforms_to_sibling:
+                            number_conforms += 1
                 if self.max_count is not None and number_conforms > self.max_count:
                     # f is non-conformant, meaning it should not be a key in _subgraphs
                     _subgraphs.pop(f)
@@ -11,6 +11,7 @@ import rdflib
 from pyshacl.constraints.constraint_component import ConstraintComponent
 from pyshacl.consts import SH
 from pyshacl.errors import ConstraintLoadError, ReportableRuntimeError
+from pyshacl.pattern_cache import compile_pattern
 from pyshacl.pytypes import GraphLike
 from pyshacl.rdfutil import stringify_node
 
@@ -276,18 +277,22 @@ class PatternConstraintComponent(StringBasedConstraintBase):
             if m:
                 re_flags |= re.M
         re_pattern = str(r.value)
-        re_matcher = re.compile(re_pattern, re_flags)
+        # blank nodes cannot pass pattern validation
+        v_strings = [
+            self.value_node_to_string(v)
+            for value_nodes in f_v_dict.values()
+            for v in value_nodes
+            if not isinstance(v, rdflib.BNode)
+        ]
+        pattern_cache = self.shape.sg.pattern_cache
+        if pattern_cache is None:
+            search = compile_pattern(re_pattern, re_flags).search
+            found = iter([search(v_string) is not None for v_string in v_strings])
+        else:
+            found = iter(pattern_cache.matches(re_pattern, re_flags, v_strings, self.shape.sg.profiler))
         for f, value_nodes in f_v_dict.items():
             for v in value_nodes:
-                match = False
-                if isinstance(v, rdflib.BNode):
-                    # blank nodes cannot pass pattern validation
-                    pass
-                else:
-                    v_string = self.value_node_to_string(v)
-                    match = re_matcher.match(v_string)
-                    if not match:
-                        match = re_matcher.search(v_string)
+                match = False if isinstance(v, rdflib.BNode) else next(found)
                 if not match:
                     non_conformant = True
                     rept = self.make_v_result(target_graph, f, value_node=v)
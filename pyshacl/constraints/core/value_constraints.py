@@ -17,7 +17,6 @@ from pyshacl.consts import (
     SH,
     SH_IRI,
     RDF_type,
-    RDFS_subClassOf,
     SH_BlankNode,
     SH_BlankNodeOrIRI,
     SH_BlankNodeORLiteral,
@@ -27,8 +26,10 @@ from pyshacl.consts import (
     SH_nodeKind,
 )
 from pyshacl.errors import ConstraintLoadError
+from pyshacl.helper.path_helper import PathEvaluator
 from pyshacl.pytypes import GraphLike
 from pyshacl.rdfutil import stringify_node
+from pyshacl.target_index import SUPERCLASSES_PATH
 
 
 RDF_langString = RDF.langString
@@ -109,10 +110,28 @@ class ClassConstraintComponent(ConstraintComponent):
                 subgraphs.pop(f)
         return (not non_conformant), reports, subgraphs
 
+    def _superclasses(self, target_graph):
+        """
+        :returns: A function giving the transitive superclasses of a class in target_graph, with their witnesses
+        :rtype: Callable
+        """
+        target_index = self.shape.sg.target_index
+        if target_index is not None and target_index.data_graph is target_graph:
+            # Each class hierarchy is walked once per run, and shared by every value node and sh:class shape
+            return target_index.superclasses
+        # Any other graph, like the recording graph of an incremental run, is walked for this evaluation only
+        evaluator = PathEvaluator(None, target_graph)
+        return lambda ctype: evaluator.evaluate(ctype, SUPERCLASSES_PATH)
+
     def _evaluate_class_rules(self, target_graph, f_v_dict, class_rule):
         reports = []
         non_conformant = False
         subgraphs = {f: set() for f in f_v_dict}
+        extract_fragment = self.shape.sg.extract_fragment
+        superclasses = self._superclasses(target_graph)
+        frozen = self.shape.sg.frozen_graph
+        lookup = frozen if frozen is not None and frozen.graph is target_graph else target_graph
+        touched = 0
         for f, value_nodes in f_v_dict.items():
             for v in value_nodes:
                 found = False
@@ -122,23 +141,30 @@ class ClassConstraintComponent(ConstraintComponent):
                         "Attempting to match Literal node {} to class of {} will fail.".format(v, class_rule)
                     )
                 else:
-                    objs = target_graph.objects(v, RDF_type)
-                    for ctype in iter(objs):
-                        if ctype == class_rule:
-                            found = True
-                            subgraphs[f].add((v, RDF_type, ctype))
-                            break
-                        subclasses = target_graph.transitive_objects(ctype, RDFS_subClassOf)
-                        if class_rule in iter(subclasses):
-                            subgraphs[f].add((v, RDF_type, ctype))
-                            subgraphs[f].add((ctype, RDFS_subClassOf, class_rule))
-                            found = True
+                    witness = None
+                    for ctype in lookup.objects(v, RDF_type):
+                        touched += 1
+                        chain = superclasses(ctype).get(class_rule, None)
+                        if chain is None:
+                            continue
+                        found = True
+                        if not extract_fragment:
                             break
+                        # The shortest chain, then the least class, so the neighborhood does not depend on the
+                        # order the types are read in, eg from a frozen graph
+                        if witness is None or (len(chain), ctype) < (len(witness[1]), witness[0]):
+                            witness = (ctype, chain)
+                    # f has no neighborhood once one of its value nodes failed
+                    if witness is not None and f in subgraphs:
+                        ctype, chain = witness
+                        subgraphs[f].add((v, RDF_type, ctype))
+                        subgraphs[f].update(chain)
                 if not found:
-                    subgraphs.pop(f)
+                    subgraphs.pop(f, None)
                     non_conformant = True
                     rept = self.make_v_result(target_graph, f, value_node=v)
                     reports.append(rept)
+        self.count_triples_touched(touched)
         return non_conformant, reports, subgraphs
 
 
@@ -3,6 +3,8 @@
 https://www.w3.org/TR/shacl/#core-components-range
 """
 
+from decimal import InvalidOperation
+from itertools import repeat
 from typing import Dict, List
 
 import rdflib
@@ -13,6 +15,7 @@ from pyshacl.errors import ConstraintLoadError, ReportableRuntimeError
 from pyshacl.pytypes import GraphLike
 from pyshacl.rdfutil import stringify_node
 from pyshacl.rdfutil.compare import compare_literal
+from pyshacl.typed_literals import TypedLiteralCache
 
 
 SH_MinExclusiveConstraintComponent = SH.MinExclusiveConstraintComponent
@@ -25,6 +28,19 @@ SH_maxExclusive = SH.maxExclusive
 SH_maxInclusive = SH.maxInclusive
 
 
+def _compare_value_nodes(shape, bound, f_v_dict):
+    """
+    Compare all the value nodes with the bound at once, with the decoded literals of the run when there is one.
+    :returns: The order of each value node, in the order of f_v_dict, see TypedLiteralCache.compare()
+    :rtype: iterator
+    """
+    typed_literals = shape.sg.typed_literals
+    if typed_literals is None:
+        typed_literals = TypedLiteralCache()
+    orders = typed_literals.compare(bound, (v for value_nodes in f_v_dict.values() for v in value_nodes))
+    return repeat(None) if orders is None else iter(orders)
+
+
 class MinExclusiveConstraintComponent(ConstraintComponent):
     """
     Link:
@@ -85,10 +101,14 @@ class MinExclusiveConstraintComponent(ConstraintComponent):
         non_conforming_focus_nodes = set()
         assert isinstance(m_val, rdflib.Literal)
         min_is_string = isinstance(m_val.value, str)
+        orders = _compare_value_nodes(self.shape, m_val, f_v_dict)
         for f, value_nodes in f_v_dict.items():
             for v in value_nodes:
                 flag = False
-                if isinstance(v, rdflib.BNode):
+                order = next(orders)
+                if order is not None:
+                    flag = order > 0
+                elif isinstance(v, rdflib.BNode):
                     # blank nodes cannot pass val comparison
                     pass
                 elif isinstance(v, rdflib.URIRef):
@@ -105,7 +125,7 @@ class MinExclusiveConstraintComponent(ConstraintComponent):
                             # pass if v > m_val
                             cmp = compare_literal(v, m_val)
                             flag = cmp > 0
-                        except (TypeError, NotImplementedError):
+                        except (TypeError, NotImplementedError, InvalidOperation):
                             flag = False
                 else:
                     raise ReportableRuntimeError("Not sure how to compare anything else.")
@@ -177,10 +197,14 @@ class MinInclusiveConstraintComponent(ConstraintComponent):
         non_conforming_focus_nodes = set()
         assert isinstance(m_val, rdflib.Literal)
         min_is_string = isinstance(m_val.value, str)
+        orders = _compare_value_nodes(self.shape, m_val, f_v_dict)
         for f, value_nodes in f_v_dict.items():
             for v in value_nodes:
                 flag = False
-                if isinstance(v, rdflib.BNode):
+                order = next(orders)
+                if order is not None:
+                    flag = order >= 0
+                elif isinstance(v, rdflib.BNode):
                     # blank nodes cannot pass val comparison
                     pass
                 elif isinstance(v, rdflib.URIRef):
@@ -197,7 +221,7 @@ class MinInclusiveConstraintComponent(ConstraintComponent):
                             # pass if v >= m_val
                             cmp = compare_literal(v, m_val)
                             flag = cmp >= 0
-                        except (TypeError, NotImplementedError):
+                        except (TypeError, NotImplementedError, InvalidOperation):
                             flag = False
                 else:
                     raise ReportableRuntimeError("Not sure how to compare anything else.")
@@ -269,10 +293,14 @@ class MaxExclusiveConstraintComponent(ConstraintComponent):
         non_conforming_focus_nodes = set()
         assert isinstance(m_val, rdflib.Literal)
         max_is_string = isinstance(m_val.value, str)
+        orders = _compare_value_nodes(self.shape, m_val, f_v_dict)
         for f, value_nodes in f_v_dict.items():
             for v in value_nodes:
                 flag = False
-                if isinstance(v, rdflib.BNode):
+                order = next(orders)
+                if order is not None:
+                    flag = order < 0
+                elif isinstance(v, rdflib.BNode):
                     # blank nodes cannot pass val comparison
                     pass
                 elif isinstance(v, rdflib.URIRef):
@@ -289,7 +317,7 @@ class MaxExclusiveConstraintComponent(ConstraintComponent):
                             # pass if v < m_val
                             cmp = compare_literal(v, m_val)
                             flag = cmp < 0
-                        except (TypeError, NotImplementedError):
+                        except (TypeError, NotImplementedError, InvalidOperation):
                             flag = False
                 else:
                     raise ReportableRuntimeError("Not sure how to compare anything else.")
@@ -361,10 +389,14 @@ class MaxInclusiveConstraintComponent(ConstraintComponent):
         non_conforming_focus_nodes = set()
         assert isinstance(m_val, rdflib.Literal)
         max_is_string = isinstance(m_val.value, str)
+        orders = _compare_value_nodes(self.shape, m_val, f_v_dict)
         for f, value_nodes in f_v_dict.items():
             for v in value_nodes:
                 flag = False
-                if isinstance(v, rdflib.BNode):
+                order = next(orders)
+                if order is not None:
+                    flag = order <= 0
+                elif isinstance(v, rdflib.BNode):
                     # blank nodes cannot pass val comparison
                     pass
                 elif isinstance(v, rdflib.URIRef):
@@ -381,7 +413,7 @@ class MaxInclusiveConstraintComponent(ConstraintComponent):
                             # pass if v <= m_val
                             cmp = compare_literal(v, m_val)
                             flag = cmp <= 0
-                        except (TypeError, NotImplementedError):
+                        except (TypeError, NotImplementedError, InvalidOperation):
                             flag = False
                 else:
                     raise ReportableRuntimeError("Not sure how to compare anything else.")
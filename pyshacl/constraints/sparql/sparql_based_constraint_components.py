@@ -264,10 +264,8 @@ class AskConstraintValidator(SPARQLConstraintComponentValidator):
                 init_binds = {}
                 sparql_text = self.query_text
             else:
-                init_binds, sparql_text = query_helper.pre_bind_variables(
-                    focus, valuenode=v, extravars=bind_vals.keys()
-                )
-                sparql_text = query_helper.apply_prefixes(sparql_text)
+                # The query is prepared once by the query helper, and reused for each value node
+                init_binds, sparql_text = query_helper.bind_prepared(focus, valuenode=v, extravars=bind_vals.keys())
                 init_binds.update(bind_vals)
             try:
                 result = target_graph.query(sparql_text, initBindings=init_binds)
@@ -325,10 +323,8 @@ class SelectConstraintValidator(SPARQLConstraintComponentValidator):
                 init_binds = {}
                 sparql_text = self.query_text
             else:
-                init_binds, sparql_text = query_helper.pre_bind_variables(
-                    focus, valuenode=v, extravars=bind_vals.keys()
-                )
-                sparql_text = query_helper.apply_prefixes(sparql_text)
+                # The query is prepared once by the query helper, and reused for each value node
+                init_binds, sparql_text = query_helper.bind_prepared(focus, valuenode=v, extravars=bind_vals.keys())
                 init_binds.update(bind_vals)
             results = target_graph.query(sparql_text, initBindings=init_binds)
             if not results or len(results.bindings) < 1:
@@ -8,7 +8,7 @@ import rdflib
 
 from pyshacl.constraints.constraint_component import ConstraintComponent
 from pyshacl.consts import SH, SH_deactivated, SH_message, SH_select
-from pyshacl.errors import ConstraintLoadError, ValidationFailure
+from pyshacl.errors import ConstraintLoadError
 from pyshacl.helper import get_query_helper_cls
 from pyshacl.pytypes import GraphLike
 
@@ -97,35 +97,39 @@ class SPARQLBasedConstraint(ConstraintComponent):
         """
         reports = []
         non_conformant = False
+        # The triples a query matched are not known, so the constraint adds none to the neighborhoods
+        subgraphs = {fn: set() for fn in focus_value_nodes}
 
         for query_helper in self.sparql_constraints:
             if query_helper.deactivated:
                 continue
-            _nc, _r = self._evaluate_sparql_constraint(query_helper, target_graph, focus_value_nodes)
+            _nc, _r = self._evaluate_sparql_constraint(query_helper, target_graph, focus_value_nodes, subgraphs)
             non_conformant = non_conformant or _nc
             reports.extend(_r)
-        return (not non_conformant), reports
+        return (not non_conformant), reports, subgraphs
 
-    def _evaluate_sparql_constraint(self, sparql_constraint, target_graph, f_v_dict):
+    def _evaluate_sparql_constraint(self, sparql_constraint, target_graph, f_v_dict, subgraphs):
         reports = []
         non_conformant = False
         extra_messages = sparql_constraint.messages or None
         rept_kwargs = {'source_constraint': sparql_constraint.node, 'extra_messages': extra_messages}
+        batch_size = self.shape.sg.sparql_batch_size
+        batched: Dict = {}
+        if batch_size and batch_size > 1 and len(f_v_dict) > 1:
+            batched = self._validate_sparql_batches(sparql_constraint, target_graph, list(f_v_dict), batch_size)
         for f, value_nodes in f_v_dict.items():
             # we don't use value_nodes in the sparql constraint
             # All queries are done on the corresponding focus node.
-            init_binds, sparql_text = sparql_constraint.pre_bind_variables(f)
-            sparql_text = sparql_constraint.apply_prefixes(sparql_text)
-
-            try:
-                violating_vals = self._validate_sparql_query(sparql_text, init_binds, target_graph)
-
-            except ValidationFailure as e:
-                raise e
+            violating_vals = batched.get(f, None)
+            if violating_vals is None:
+                init_binds, query = sparql_constraint.bind_prepared(f)
+                violating_vals = self._validate_sparql_query(query, init_binds, target_graph)
             if not self.shape.is_property_shape:
                 result_val = f
             else:
                 result_val = None
+            if violating_vals:
+                subgraphs.pop(f, None)
             for v in violating_vals:
                 non_conformant = True
                 if isinstance(v, bool) and v is True:
@@ -142,30 +146,67 @@ class SPARQLBasedConstraint(ConstraintComponent):
                 reports.append(rept)
         return non_conformant, reports
 
+    def _validate_sparql_batches(self, sparql_constraint, target_graph, focus_nodes, batch_size):
+        """
+        Run the query for batch_size focus nodes at a time, binding $this with a VALUES block,
+        and split the violations back per focus node.
+        :returns: The violations of each focus node that was validated in a batch
+        :rtype: dict
+        """
+        # A BNode in the query text would be a new blank node, not the one in the data graph
+        focus_nodes = [f for f in focus_nodes if not isinstance(f, rdflib.BNode)]
+        found: Dict = {}
+        for i in range(0, len(focus_nodes), batch_size):
+            batch = focus_nodes[i : i + batch_size]
+            prepared = sparql_constraint.prepare_batch(batch)
+            if prepared is None:
+                # This query cannot be batched
+                return {}
+            init_binds, query = prepared
+            violations: Dict = {f: set() for f in batch}
+            for r in target_graph.query(query, initBindings=init_binds):
+                try:
+                    t = r['this']
+                except KeyError:
+                    t = None
+                if t is None or t not in violations:
+                    # $this is not in the solutions, they cannot be told apart per focus node
+                    return found
+                violation = self._violation_of(r)
+                if violation is not None:
+                    violations[t].add(violation)
+            found.update(violations)
+        return found
+
     def _validate_sparql_query(self, query, init_binds, target_graph):
         results = target_graph.query(query, initBindings=init_binds)
         if not results or len(results.bindings) < 1:
             return []
         violations = set()
         for r in results:
-            try:
-                p = r['path']
-            except KeyError:
-                p = None
-            try:
-                v = r['value']
-            except KeyError:
-                v = None
-            try:
-                t = r['this']
-            except KeyError:
-                t = None
-            if p or v or t:
-                violations.add((t, p, v))
-            else:
-                try:
-                    _ = r['failure']
-                    violations.add(True)
-                except KeyError:
-                    pass
+            violation = self._violation_of(r)
+            if violation is not None:
+                violations.add(violation)
         return violations
+
+    @classmethod
+    def _violation_of(cls, r):
+        try:
+            p = r['path']
+        except KeyError:
+            p = None
+        try:
+            v = r['value']
+        except KeyError:
+            v = None
+        try:
+            t = r['this']
+        except KeyError:
+            t = None
+        if p or v or t:
+            return t, p, v
+        try:
+            _ = r['failure']
+            return True
+        except KeyError:
+            return None
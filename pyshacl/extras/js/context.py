@@ -1,7 +1,7 @@
 import pprint
 
 from decimal import Decimal
-from typing import Union
+from typing import Dict, List, Tuple, Union
 
 import pyduktape2
 
@@ -12,6 +12,7 @@ from rdflib.namespace import XSD
 from pyshacl.errors import ReportableRuntimeError
 
 from . import load_into_context
+from .loader import fetch_js_library
 
 
 class URIRefNativeWrapper(object):
@@ -347,7 +348,7 @@ Graph.prototype.find = function(s, p, o) {
 
 
 class SHACLJSContext(object):
-    __slots__ = ("context", "fns")
+    __slots__ = ("context", "fns", "_arg_names")
 
     def __init__(self, data_graph, *args, shapes_graph=None, **kwargs):
         context = pyduktape2.DuktapeContext()
@@ -381,11 +382,28 @@ class SHACLJSContext(object):
 
         self.context = context
         self.fns = {}
+        self._arg_names: List[str] = []
 
     def load_js_library(self, library: str):
         fns = load_into_context(self.context, library)
         self.fns.update(fns)
 
+    def load_js_source(self, contents: bytes, fns: Dict):
+        """
+        Like load_js_library(), for a library that was already fetched with fetch_js_library()
+        """
+        self.context.eval_js(contents)
+        self.fns.update(fns)
+
+    def reset(self):
+        """
+        Unbind the arguments of the last function call, so the context can be used for the next one,
+        and holds no references to the nodes of the last call.
+        """
+        if self._arg_names:
+            self.context.eval_js("".join("{} = undefined;\n".format(n) for n in self._arg_names))
+            self._arg_names = []
+
     @classmethod
     def build_results_as_constraint(cls, res):
         if isinstance(res, JSProxy):
@@ -637,11 +655,14 @@ class SHACLJSContext(object):
                 preamble += "var {} = Literal.from_native({});\n".format(arg_name, native_name)
                 bind_dict[native_name] = wrapped_a
             elif a is None:  # this is how we set an undefined variable
-                preamble += "var {};\n".format(arg_name)
+                # (with an explicit undefined, `var` alone keeps the value from a previous call on this context)
+                preamble += "var {} = undefined;\n".format(arg_name)
             else:
                 bind_dict[arg_name] = a
 
             args_string = args_string + arg_name + ","
+        self._arg_names.extend(bind_dict.keys())
+        self._arg_names.extend("fn_arg_" + str(i + 1) for i in range(len(args)))
         c.set_globals(**bind_dict)
         args_string = args_string.rstrip(',')
         c.eval_js(preamble)
@@ -655,3 +676,69 @@ class SHACLJSContext(object):
                 returns_dict[r] = None
         returns_dict['_result'] = res
         return returns_dict
+
+
+class SHACLJSContextPool(object):
+    """
+    Run-scoped pool of SHACL-JS contexts, owned by Validator.run() when JS is enabled.
+
+    Creating a context means starting a Duktape interpreter, evaluating the term and graph shims, and reading,
+    parsing and evaluating each JS library. A JS constraint executes its function once per value node, so
+    contexts are kept for reuse, keyed by (data graph, shapes graph, libraries).
+    A context is only handed out to one caller at a time, and its function arguments are reset when it
+    is given back. Library sources are fetched once per run, whichever context they are loaded into.
+    """
+
+    __slots__ = ("_idle", "_graphs", "_sources", "created", "reused")
+
+    def __init__(self):
+        self._idle: Dict[Tuple, List[SHACLJSContext]] = {}
+        # Keeps the graphs alive while their id() is part of a key
+        self._graphs: Dict[Tuple, Tuple] = {}
+        self._sources: Dict[str, Tuple[bytes, Dict]] = {}
+        self.created = 0
+        self.reused = 0
+
+    @classmethod
+    def _key(cls, data_graph, shapes_graph, libraries: Tuple[str, ...]) -> Tuple:
+        return id(data_graph), (None if shapes_graph is None else id(shapes_graph)), libraries
+
+    def acquire(self, data_graph, shapes_graph, libraries: Tuple[str, ...]) -> SHACLJSContext:
+        """
+        :param data_graph:
+        :param shapes_graph: The shapes graph bound to $shapes, or None
+        :param libraries: The sh:jsLibraryURL values of the libraries to load, in the order to load them
+        :returns: A context with the libraries loaded. Give it back with release() after use.
+        :rtype: SHACLJSContext
+        """
+        key = self._key(data_graph, shapes_graph, libraries)
+        idle = self._idle.get(key, None)
+        if idle:
+            self.reused += 1
+            return idle.pop()
+        ctx = SHACLJSContext(data_graph, shapes_graph=shapes_graph)
+        for library in libraries:
+            try:
+                contents, fns = self._sources[library]
+            except KeyError:
+                contents, fns = self._sources[library] = fetch_js_library(library)
+            ctx.load_js_source(contents, fns)
+        self._graphs[key] = (data_graph, shapes_graph)
+        self.created += 1
+        return ctx
+
+    def release(self, ctx: SHACLJSContext, data_graph, shapes_graph, libraries: Tuple[str, ...]):
+        ctx.reset()
+        key = self._key(data_graph, shapes_graph, libraries)
+        try:
+            self._idle[key].append(ctx)
+        except KeyError:
+            self._idle[key] = [ctx]
+
+    def stats(self) -> Dict[str, int]:
+        return {'created': self.created, 'reused': self.reused}
+
+    def close(self):
+        self._idle.clear()
+        self._graphs.clear()
+        self._sources.clear()
@@ -104,14 +104,18 @@ class JSExecutable(object):
         :return:
         :rtype: dict
         """
-        if mode == "function":
-            ctx = SHACLJSContext(data_graph, shapes_graph=None, **kwargs)
+        shapes_graph = None if mode == "function" else self.sg
+        pool = self.sg.js_contexts
+        if pool is not None and not kwargs:
+            libraries = tuple(lib_url for lib_urls in self.libraries.values() for lib_url in lib_urls)
+            ctx = pool.acquire(data_graph, shapes_graph, libraries)
         else:
-            ctx = SHACLJSContext(data_graph, shapes_graph=self.sg, **kwargs)
-
-        for lib_node, lib_urls in self.libraries.items():
-            for lib_url in lib_urls:
-                ctx.load_js_library(lib_url)
+            # Not during a validation run, or with extra globals: use a context of its own
+            pool = None
+            ctx = SHACLJSContext(data_graph, shapes_graph=shapes_graph, **kwargs)
+            for lib_node, lib_urls in self.libraries.items():
+                for lib_url in lib_urls:
+                    ctx.load_js_library(lib_url)
         fn_args = ctx.get_fn_args(self.fn_name, args_map)
         rvals = ctx.run_js_function(self.fn_name, fn_args)
         res = rvals['_result']
@@ -123,4 +127,7 @@ class JSExecutable(object):
             rvals['_result'] = ctx.build_results_as_target(res)
         else:
             rvals['_result'] = ctx.build_results_as_constraint(res)
+        if pool is not None:
+            # Only after a successful call, a context that raised an error is not reused
+            pool.release(ctx, data_graph, shapes_graph, libraries)
         return rvals
@@ -61,7 +61,14 @@ def extract_functions(content):
     return fns
 
 
-def load_into_context(context: 'DuktapeContext', location: str):
+def fetch_js_library(location: str):
+    """
+    Read a JS library, from the web or from a file.
+    :param location: The sh:jsLibraryURL of the library
+    :type location: str
+    :returns: The source code of the library, and the parameter names of each function it defines
+    :rtype: (bytes, dict)
+    """
     f = None
     try:
         if location.startswith("http:") or location.startswith("https:"):
@@ -72,6 +79,10 @@ def load_into_context(context: 'DuktapeContext', location: str):
     finally:
         if f:
             f.close()
-    fns = extract_functions(contents)
+    return contents, extract_functions(contents)
+
+
+def load_into_context(context: 'DuktapeContext', location: str):
+    contents, fns = fetch_js_library(location)
     context.eval_js(contents)
     return fns
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+"""
+Sinks that receive the triples of the extracted shape fragment while validation is still running.
+
+Without a sink, Validator.run gathers the whole fragment in one set and returns it. With a sink, the
+neighborhoods of each top-level shape are handed to the sink as soon as that shape has been evaluated,
+so the fragment never has to be held in memory as a whole.
+"""
+from collections import OrderedDict
+from typing import Callable, Iterable, List, TextIO, Tuple
+
+
+DEFAULT_DEDUPE_CAPACITY = 1000000
+
+
+class FragmentSink(object):
+    """
+    Base class of fragment sinks. Subclasses implement emit().
+
+    The same triple is usually in the neighborhoods of many focus nodes and shapes. Triples that were
+    seen recently are dropped before they reach emit(). The set of recently seen triples is bounded
+    by `capacity`, so on very large fragments a triple can be emitted more than once. That is harmless
+    in RDF, where a graph is a set of triples, but consumers that count triples should dedupe themselves.
+    """
+
+    __slots__ = ('capacity', 'count', '_seen')
+
+    def __init__(self, capacity: int = DEFAULT_DEDUPE_CAPACITY):
+        """
+        :param capacity: How many recently seen triples to remember for deduplication
+        :type capacity: int
+        """
+        self.capacity = capacity
+        self.count = 0
+        self._seen: OrderedDict = OrderedDict()
+
+    def add(self, triples: Iterable[Tuple]):
+        seen = self._seen
+        capacity = self.capacity
+        fresh = []
+        for triple in triples:
+            if triple in seen:
+                seen.move_to_end(triple)
+                continue
+            seen[triple] = None
+            if len(seen) > capacity:
+                seen.popitem(last=False)
+            fresh.append(triple)
+        if fresh:
+            self.count += len(fresh)
+            self.emit(fresh)
+
+    def emit(self, triples: List[Tuple]):
+        raise NotImplementedError()  # pragma: no cover
+
+    def close(self):
+        self._seen.clear()
+
+
+class CallbackFragmentSink(FragmentSink):
+    """
+    Calls a function with each batch of new fragment triples.
+    """
+
+    __slots__ = ('callback',)
+
+    def __init__(self, callback: Callable[[List[Tuple]], None], capacity: int = DEFAULT_DEDUPE_CAPACITY):
+        super(CallbackFragmentSink, self).__init__(capacity=capacity)
+        self.callback = callback
+
+    def emit(self, triples: List[Tuple]):
+        self.callback(triples)
+
+
+class NTriplesFragmentSink(FragmentSink):
+    """
+    Writes the fragment as N-Triples to a text stream, eg an open file or sys.stdout.
+    The stream is not closed by the sink.
+    """
+
+    __slots__ = ('stream', '_nt_row')
+
+    def __init__(self, stream: TextIO, capacity: int = DEFAULT_DEDUPE_CAPACITY):
+        super(NTriplesFragmentSink, self).__init__(capacity=capacity)
+        # Lazy import, to use the same term escaping as the rdflib N-Triples serializer
+        from rdflib.plugins.serializers.nt import _nt_row
+
+        self.stream = stream
+        self._nt_row = _nt_row
+
+    def emit(self, triples: List[Tuple]):
+        nt_row = self._nt_row
+        self.stream.write("".join(nt_row(t) for t in triples))
+
+    def close(self):
+        super(NTriplesFragmentSink, self).close()
+        self.stream.flush()
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple
+
+
+if TYPE_CHECKING:
+    from .pytypes import GraphLike
+
+
+def _numpy():
+    # NumPy is optional, it only speeds up building the snapshot
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class _Adjacency(object):
+    """
+    The edges of one direction of a FrozenGraph, in compressed sparse row form.
+
+    The edges are sorted by (predicate, source node, target node). Each run of edges with the same predicate and
+    source node has an entry in `sources` (the source node) and in `offsets` (where its target nodes start in
+    `targets`), and the runs of predicate number p are the entries from pred_starts[p] to pred_starts[p + 1].
+    So the targets of a (source, predicate) pair are found by a binary search in the predicate's runs.
+    """
+
+    __slots__ = ('pred_starts', 'sources', 'offsets', 'targets')
+
+    def __init__(self, pred_starts: array, sources: array, offsets: array, targets: array):
+        self.pred_starts = pred_starts
+        self.sources = sources
+        self.offsets = offsets
+        self.targets = targets
+
+    def find(self, pid: int, source: int) -> array:
+        """
+        :returns: The target node IDs of the edges with this predicate number from this source node ID
+        :rtype: array
+        """
+        sources = self.sources
+        hi = self.pred_starts[pid + 1]
+        run = bisect_left(sources, source, self.pred_starts[pid], hi)
+        if run == hi or sources[run] != source:
+            return _NO_IDS
+        offsets = self.offsets
+        return self.targets[offsets[run] : offsets[run + 1]]
+
+    def degrees(self, pid: int) -> Iterator[Tuple[int, int]]:
+        """
+        :returns: Each (source node ID, number of target nodes) of the edges with this predicate number
+        """
+        sources = self.sources
+        offsets = self.offsets
+        for run in range(self.pred_starts[pid], self.pred_starts[pid + 1]):
+            yield sources[run], offsets[run + 1] - offsets[run]
+
+    def pairs(self, pid: int) -> Iterator[Tuple[int, int]]:
+        """
+        :returns: Each (source node ID, target node ID) of the edges with this predicate number
+        """
+        sources = self.sources
+        offsets = self.offsets
+        targets = self.targets
+        for run in range(self.pred_starts[pid], self.pred_starts[pid + 1]):
+            source = sources[run]
+            for i in range(offsets[run], offsets[run + 1]):
+                yield source, targets[i]
+
+    @classmethod
+    def build(cls, pids: array, sources: array, targets: array, n_preds: int, n_nodes: int) -> '_Adjacency':
+        numpy = _numpy()
+        if numpy is not None:
+            return cls._build_numpy(numpy, pids, sources, targets, n_preds)
+        # Each edge packed into one int, so a plain sort orders them by (predicate, source, target)
+        packed = sorted((p * n_nodes + s) * n_nodes + t for p, s, t in zip(pids, sources, targets))
+        pred_starts = array('q', [0] * (n_preds + 1))
+        run_sources = array('q')
+        offsets = array('q')
+        run_targets = array('q')
+        last_edge = last_ps = -1
+        last_p = 0
+        for edge in packed:
+            if edge == last_edge:
+                continue
+            last_edge = edge
+            ps, t = divmod(edge, n_nodes)
+            if ps != last_ps:
+                p, s = divmod(ps, n_nodes)
+                while last_p < p:
+                    last_p += 1
+                    pred_starts[last_p] = len(run_sources)
+                run_sources.append(s)
+                offsets.append(len(run_targets))
+                last_ps = ps
+            run_targets.append(t)
+        while last_p < n_preds:
+            last_p += 1
+            pred_starts[last_p] = len(run_sources)
+        offsets.append(len(run_targets))
+        return cls(pred_starts, run_sources, offsets, run_targets)
+
+    @classmethod
+    def _build_numpy(cls, numpy, pids: array, sources: array, targets: array, n_preds: int) -> '_Adjacency':
+        p = numpy.frombuffer(pids, dtype=numpy.int64)
+        s = numpy.frombuffer(sources, dtype=numpy.int64)
+        t = numpy.frombuffer(targets, dtype=numpy.int64)
+        # The last key is the primary one
+        order = numpy.lexsort((t, s, p))
+        p, s, t = p[order], s[order], t[order]
+        new_run = numpy.ones(len(p), dtype=bool)
+        new_run[1:] = (p[1:] != p[:-1]) | (s[1:] != s[:-1])
+        distinct = new_run.copy()
+        distinct[1:] |= t[1:] != t[:-1]
+        p, s, t, new_run = p[distinct], s[distinct], t[distinct], new_run[distinct]
+        starts = numpy.flatnonzero(new_run)
+        pred_starts = numpy.searchsorted(p[starts], numpy.arange(n_preds + 1))
+        offsets = numpy.append(starts, len(t))
+        return cls(
+            _to_array(numpy, pred_starts), _to_array(numpy, s[starts]), _to_array(numpy, offsets), _to_array(numpy, t)
+        )
+
+
+def _to_array(numpy, values) -> array:
+    # Lookups read one element at a time, which is faster from an array than from a NumPy array
+    ids = array('q')
+    ids.frombytes(numpy.ascontiguousarray(values, dtype=numpy.int64).tobytes())
+    return ids
+
+
+_NO_IDS = array('q')
+
+
+class FrozenGraph(object):
+    """
+    A read-only snapshot of a data graph, for the lookups of a validation run.
+
+    Once inference and the SHACL rules have run, validation does not change the data graph, so its triples can
+    be indexed once in a form that is faster to look up than the store of the graph: every term is encoded to
+    an integer ID, and the triples are kept as forward (subject to objects) and reverse (object to subjects)
+    adjacency, per predicate, in compressed sparse row arrays. Property paths, targets and value nodes are
+    looked up in it, with the same results as in the graph. Building it uses NumPy, when it is installed.
+
+    The snapshot does not follow later changes to the graph.
+    """
+
+    __slots__ = ('graph', '_ids', '_terms', '_pids', '_forward', '_reverse', '_size')
+
+    def __init__(self, graph: 'GraphLike'):
+        """
+        :param graph: The graph to take a snapshot of
+        :type graph: rdflib.Graph
+        """
+        self.graph = graph
+        ids: Dict = {}
+        terms: List = []
+        pids: Dict = {}
+        edge_pids = array('q')
+        edge_subjects = array('q')
+        edge_objects = array('q')
+        for s, p, o in graph.triples((None, None, None)):
+            try:
+                pid = pids[p]
+            except KeyError:
+                pid = pids[p] = len(pids)
+            try:
+                sid = ids[s]
+            except KeyError:
+                sid = ids[s] = len(terms)
+                terms.append(s)
+            try:
+                oid = ids[o]
+            except KeyError:
+                oid = ids[o] = len(terms)
+                terms.append(o)
+            edge_pids.append(pid)
+            edge_subjects.append(sid)
+            edge_objects.append(oid)
+        self._ids = ids
+        self._terms = terms
+        self._pids = pids
+        n_nodes = max(len(terms), 1)
+        self._forward = _Adjacency.build(edge_pids, edge_subjects, edge_objects, len(pids), n_nodes)
+        self._reverse = _Adjacency.build(edge_pids, edge_objects, edge_subjects, len(pids), n_nodes)
+        self._size = len(self._forward.targets)
+
+    def __len__(self):
+        return self._size
+
+    def objects(self, subject, predicate) -> List:
+        """
+        :returns: The objects of the triples with this subject and predicate
+        :rtype: list
+        """
+        pid = self._pids.get(predicate, None)
+        sid = self._ids.get(subject, None)
+        if pid is None or sid is None:
+            return []
+        terms = self._terms
+        return [terms[i] for i in self._forward.find(pid, sid)]
+
+    def subjects(self, predicate, obj) -> List:
+        """
+        :returns: The subjects of the triples with this predicate and object
+        :rtype: list
+        """
+        pid = self._pids.get(predicate, None)
+        oid = self._ids.get(obj, None)
+        if pid is None or oid is None:
+            return []
+        terms = self._terms
+        return [terms[i] for i in self._reverse.find(pid, oid)]
+
+    def subject_objects(self, predicate) -> Iterator[Tuple]:
+        """
+        :returns: The (subject, object) of each triple with this predicate
+        """
+        pid = self._pids.get(predicate, None)
+        if pid is None:
+            return
+        terms = self._terms
+        for sid, oid in self._forward.pairs(pid):
+            yield terms[sid], terms[oid]
+
+    def degrees(self, predicate, forward: bool = True) -> Dict:
+        """
+        :param predicate:
+        :param forward: Count the objects of each subject, or else the subjects of each object
+        :type forward: bool
+        :returns: Each subject (or object) of a triple with this predicate, with how many objects (or subjects)
+            it has with this predicate. Read from the offsets of the adjacency, without visiting the triples.
+        :rtype: dict
+        """
+        pid = self._pids.get(predicate, None)
+        if pid is None:
+            return {}
+        terms = self._terms
+        adjacency = self._forward if forward else self._reverse
+        return {terms[node]: degree for node, degree in adjacency.degrees(pid)}
+
+    def stats(self) -> Dict[str, int]:
+        return {'terms': len(self._terms), 'predicates': len(self._pids), 'triples': self._size}
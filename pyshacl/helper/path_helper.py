@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+#
+"""
+Evaluation of SHACL Property Paths that keeps track of provenance.
+For each node reachable from a focus node, the evaluator returns the set of data graph triples that lie on
+the paths matching the SHACL path from the focus node to that node (the "witness" triples of that node).
+These triples are what ends up in the neighborhood of the focus node when extracting a shape fragment.
+"""
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, FrozenSet, List, Set, Tuple, Union
+
+from rdflib import BNode, Literal, URIRef
+
+from pyshacl.consts import (
+    RDF,
+    SH_alternativePath,
+    SH_inversePath,
+    SH_oneOrMorePath,
+    SH_zeroOrMorePath,
+    SH_zeroOrOnePath,
+)
+from pyshacl.errors import ReportableRuntimeError
+from pyshacl.profiler import COUNT_TRIPLES_TOUCHED
+
+
+if TYPE_CHECKING:
+    from pyshacl.pytypes import GraphLike
+    from pyshacl.shapes_graph import ShapesGraph
+
+PATH_PREDICATE = 0
+PATH_INVERSE = 1
+PATH_SEQUENCE = 2
+PATH_ALTERNATIVE = 3
+PATH_ZERO_OR_MORE = 4
+PATH_ONE_OR_MORE = 5
+PATH_ZERO_OR_ONE = 6
+
+# Path expressions are kept as nested tuples: (kind, path_node, argument)
+# argument is the predicate for PATH_PREDICATE, a tuple of sub-expressions for sequences and alternatives,
+# or a single sub-expression for the inverse and the closure paths.
+PathExpression = Tuple
+Witnesses = Dict[Union[URIRef, BNode, Literal], FrozenSet[Tuple]]
+
+EMPTY_WITNESS: FrozenSet[Tuple] = frozenset()
+
+
+def compile_path(sg: 'ShapesGraph', path_val, recursion=0) -> PathExpression:
+    """
+    Parse a SHACL Property Path from the Shapes Graph into a path expression.
+    Link: https://www.w3.org/TR/shacl/#property-paths
+    :param sg:
+    :type sg: ShapesGraph
+    :param path_val:
+    :type path_val: URIRef | BNode
+    :param recursion:
+    :type recursion: int
+    :rtype: tuple
+    """
+    if isinstance(path_val, URIRef):
+        return PATH_PREDICATE, path_val, path_val
+    elif isinstance(path_val, Literal):
+        raise ReportableRuntimeError("Values of a property path cannot be a Literal.")
+    # At this point, path_val _must_ be a BNode
+    if recursion >= 10:
+        raise ReportableRuntimeError("Path traversal depth is too much!")
+    g = sg.graph
+    if len(set(g.objects(path_val, RDF.first))) > 0:
+        items = tuple(compile_path(sg, i, recursion=recursion + 1) for i in g.items(path_val))
+        if len(items) < 2:
+            raise ReportableRuntimeError("A list of SHACL Paths must contain at least two path items.")
+        return PATH_SEQUENCE, path_val, items
+
+    find_inverse = set(g.objects(path_val, SH_inversePath))
+    if len(find_inverse) > 0:
+        return PATH_INVERSE, path_val, compile_path(sg, next(iter(find_inverse)), recursion=recursion + 1)
+
+    find_alternatives = set(g.objects(path_val, SH_alternativePath))
+    if len(find_alternatives) > 0:
+        alternatives_list = next(iter(find_alternatives))
+        items = tuple(compile_path(sg, a, recursion=recursion + 1) for a in g.items(alternatives_list))
+        if len(items) < 2:
+            raise ReportableRuntimeError("List of SHACL alternate paths must have at least two path items.")
+        return PATH_ALTERNATIVE, path_val, items
+
+    for predicate, kind in (
+        (SH_zeroOrMorePath, PATH_ZERO_OR_MORE),
+        (SH_oneOrMorePath, PATH_ONE_OR_MORE),
+        (SH_zeroOrOnePath, PATH_ZERO_OR_ONE),
+    ):
+        found = set(g.objects(path_val, predicate))
+        if len(found) > 0:
+            return kind, path_val, compile_path(sg, next(iter(found)), recursion=recursion + 1)
+
+    raise NotImplementedError("That path method to get value nodes of property shapes is not yet implemented.")
+
+
+def path_signature(expression: PathExpression):
+    """
+    The structure of a path expression, without the nodes of the Shapes Graph it was compiled from.
+    Paths that are written out separately, eg the same sequence path given as two different RDF lists,
+    have the same signature, and reach the same nodes.
+    :param expression: A path expression from compile_path()
+    :type expression: tuple
+    :returns: The predicate of a predicate path, or a (kind, signatures of its sub-paths) tuple
+    """
+    kind, _, arg = expression
+    if kind == PATH_PREDICATE:
+        return arg
+    if kind in (PATH_SEQUENCE, PATH_ALTERNATIVE):
+        return kind, tuple(path_signature(a) for a in arg)
+    return kind, path_signature(arg)
+
+
+class PathEvaluator(object):
+    """
+    Evaluates SHACL Property Paths against one data graph, returning witness triples for each reachable node.
+
+    Results of non-trivial sub-paths are cached per (sub-path, start node, direction), so a sub-path is only
+    evaluated once from each node, and focus nodes that reach the same node share the evaluation of the sub-paths
+    that start there. Predicate paths are not cached, they are a single lookup in the graph.
+    The closure paths (sh:zeroOrMorePath and sh:oneOrMorePath) keep the steps they take from each node. A closure
+    is walked once, a strongly connected component at a time, and cached for the nodes of the start component.
+    The closure from a node joins the cached closures of its steps, so focus nodes that step into a hierarchy that
+    is already walked do not walk the rest of the hierarchy again.
+    Without witnesses, every reachable node gets an empty witness, and paths are only walked for reachability.
+    When the Shapes Graph has a frozen snapshot of the target graph, the triples are looked up in the snapshot.
+    """
+
+    __slots__ = ('sg', 'target_graph', 'profiler', 'witnesses', '_compiled', '_results', '_steps', '_closures')
+
+    def __init__(self, sg: 'ShapesGraph', target_graph: 'GraphLike', witnesses: bool = True):
+        self.sg = sg
+        frozen = sg.frozen_graph if sg is not None else None
+        # Only the objects() and subjects() of the target graph are read, the snapshot has the same ones
+        self.target_graph = frozen if frozen is not None and frozen.graph is target_graph else target_graph
+        # Counts the triples read by each predicate step when the run is profiled
+        self.profiler = sg.profiler if sg is not None else None
+        self.witnesses = witnesses
+        self._compiled: Dict = {}
+        self._results: Dict[Tuple, Witnesses] = {}
+        self._steps: Dict[Tuple, Witnesses] = {}
+        self._closures: Dict[Tuple, Tuple[Witnesses, bool]] = {}
+
+    def compile(self, path_val) -> PathExpression:
+        try:
+            return self._compiled[path_val]
+        except KeyError:
+            expression = self._compiled[path_val] = compile_path(self.sg, path_val)
+            return expression
+
+    def value_nodes(self, focus, path_val) -> Witnesses:
+        """
+        :param focus: The node to start walking the path from
+        :param path_val: The value of sh:path, a URIRef or a BNode in the Shapes Graph
+        :returns: A dict of each reachable node, to the triples on the paths from focus to that node.
+        :rtype: dict
+        """
+        return self._evaluate(self.compile(path_val), focus, True)
+
+    def evaluate(self, focus, expression: PathExpression) -> Witnesses:
+        """
+        Like value_nodes(), for a path that was already compiled with compile_path()
+        :param focus: The node to start walking the path from
+        :param expression: The compiled path expression
+        :rtype: dict
+        """
+        return self._evaluate(expression, focus, True)
+
+    def _evaluate(self, expression: PathExpression, node, forward: bool) -> Witnesses:
+        kind, path_node, arg = expression
+        if kind == PATH_PREDICATE:
+            if not self.witnesses:
+                if forward:
+                    found = dict.fromkeys(self.target_graph.objects(node, arg), EMPTY_WITNESS)
+                else:
+                    found = dict.fromkeys(self.target_graph.subjects(arg, node), EMPTY_WITNESS)
+            elif forward:
+                found = {o: frozenset(((node, arg, o),)) for o in self.target_graph.objects(node, arg)}
+            else:
+                found = {s: frozenset(((s, arg, node),)) for s in self.target_graph.subjects(arg, node)}
+            if self.profiler is not None:
+                self.profiler.count(COUNT_TRIPLES_TOUCHED, len(found))
+            return found
+        cache_key = (path_node, node, forward)
+        try:
+            return self._results[cache_key]
+        except KeyError:
+            pass
+        if kind == PATH_INVERSE:
+            result = self._evaluate(arg, node, not forward)
+        elif kind == PATH_SEQUENCE:
+            result = self._evaluate_sequence(arg if forward else tuple(reversed(arg)), node, forward)
+        elif kind == PATH_ALTERNATIVE:
+            found: Dict = {}
+            for a in arg:
+                self._merge_into(found, self._evaluate(a, node, forward))
+            result = {n: frozenset(w) for n, w in found.items()}
+        elif kind == PATH_ZERO_OR_ONE:
+            result = dict(self._evaluate(arg, node, forward))
+            # The zero-or-one path always includes the current node too!
+            result.setdefault(node, EMPTY_WITNESS)
+        elif kind == PATH_ZERO_OR_MORE:
+            # The zero-or-more path always includes the current node too!
+            result = self._evaluate_closure(arg, node, forward, include_start=True)
+        elif kind == PATH_ONE_OR_MORE:
+            # The one-or-more path should _not_ include the current node, unless it is on a cycle
+            result = self._evaluate_closure(arg, node, forward, include_start=False)
+        else:  # pragma: no cover
+            raise NotImplementedError("That path method to get value nodes of property shapes is not yet implemented.")
+        self._results[cache_key] = result
+        return result
+
+    def _evaluate_sequence(self, items, node, forward: bool) -> Witnesses:
+        if not self.witnesses:
+            reached = {node}
+            for item in items:
+                reached = {n for intermediate in reached for n in self._evaluate(item, intermediate, forward)}
+                if not reached:
+                    return {}
+            return dict.fromkeys(reached, EMPTY_WITNESS)
+        frontier: Dict = {node: EMPTY_WITNESS}
+        for item in items:
+            found: Dict = {}
+            for intermediate, witness in frontier.items():
+                for reached, step_witness in self._evaluate(item, intermediate, forward).items():
+                    reached_witness = found.get(reached)
+                    if reached_witness is None:
+                        reached_witness = found[reached] = set(witness)
+                    else:
+                        reached_witness.update(witness)
+                    reached_witness.update(step_witness)
+            if not found:
+                return {}
+            frontier = found
+        return {n: frozenset(w) for n, w in frontier.items()}
+
+    def _evaluate_closure(self, step, start, forward: bool, include_start: bool) -> Witnesses:
+        if not self.witnesses:
+            return self._reach_closure(step, start, forward, include_start)
+        reached, on_cycle = self._closure(step, start, forward)
+        if include_start or on_cycle:
+            return reached
+        # The one-or-more path only reaches the start node on a cycle
+        return {n: w for n, w in reached.items() if n != start}
+
+    def _step(self, step, node, forward: bool) -> Witnesses:
+        # The steps of a closure are walked again from each node that reaches them, predicate steps are kept here
+        if step[0] != PATH_PREDICATE:
+            return self._evaluate(step, node, forward)
+        key = (step[2], node, forward)
+        try:
+            return self._steps[key]
+        except KeyError:
+            found = self._steps[key] = self._evaluate(step, node, forward)
+            return found
+
+    def _closure(self, step, start, forward: bool) -> Tuple[Witnesses, bool]:
+        """
+        The zero-or-more closure of step from start, and whether start is on a cycle.
+        The witness of a reached node is every step on a walk from start to that node. That is the step from start
+        to one of its successors, and the witness of the node in the closure from that successor, so the closures of
+        the successors are found (and kept) first, and focus nodes that step into the same nodes share them.
+        """
+        key = (step[1], start, forward)
+        try:
+            return self._closures[key]
+        except KeyError:
+            pass
+        found: Dict = {}
+        for successor, step_witness in self._step(step, start, forward).items():
+            try:
+                reached = self._closures[(step[1], successor, forward)][0]
+            except KeyError:
+                reached = self._closure_from(step, successor, forward)[0]
+                if key in self._closures:
+                    # start is on a cycle with successor, its closure was found with it
+                    return self._closures[key]
+            for n, witness in reached.items():
+                known = found.get(n)
+                found[n] = witness.union(step_witness) if known is None else known.union(witness, step_witness)
+        on_cycle = start in found
+        if not on_cycle:
+            found[start] = EMPTY_WITNESS
+        closure = self._closures[key] = (found, on_cycle)
+        return closure
+
+    def _closure_from(self, step, start, forward: bool) -> Tuple[Witnesses, bool]:
+        # The strongly connected components reachable from start, in topological order. The witness of a node is
+        # every step into the components that reach it, which are all before it, so each step is visited once.
+        # The nodes of a component all reach the same nodes with the same witnesses, they share one closure.
+        sccs = []
+        index = {start: 0}
+        low = {start: 0}
+        stack = [start]
+        on_stack = {start}
+        work = [(start, iter(self._step(step, start, forward)))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(self._step(step, successor, forward))))
+                    break
+                if successor in on_stack and index[successor] < low[node]:
+                    low[node] = index[successor]
+            else:
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    scc = []
+                    while True:
+                        n = stack.pop()
+                        on_stack.discard(n)
+                        scc.append(n)
+                        if n == node:
+                            break
+                    sccs.append(scc)
+        sccs.reverse()
+        component = {n: i for i, scc in enumerate(sccs) for n in scc}
+        incoming: List[Set] = [set() for _ in sccs]
+        reached: Dict = {}
+        on_cycle = len(sccs[0]) > 1
+        for i, scc in enumerate(sccs):
+            witness = incoming[i]
+            for u in scc:
+                for n, step_witness in self._step(step, u, forward).items():
+                    if component[n] == i:
+                        witness.update(step_witness)
+                        if i == 0 and n == u:
+                            on_cycle = True
+            frozen = frozenset(witness)
+            witness.clear()
+            for u in scc:
+                reached[u] = frozen
+            for u in scc:
+                for n, step_witness in self._step(step, u, forward).items():
+                    j = component[n]
+                    if j != i:
+                        incoming[j].update(frozen)
+                        incoming[j].update(step_witness)
+        closure = (reached, on_cycle)
+        for n in sccs[0]:
+            self._closures[(step[1], n, forward)] = closure
+        return closure
+
+    def _reach_closure(self, step, start, forward: bool, include_start: bool) -> Witnesses:
+        # Without witnesses, each node is walked from once, breadth-first
+        reached: Dict = {start: EMPTY_WITNESS} if include_start else {}
+        queue: Deque = deque((start,))
+        visited = {start}
+        while queue:
+            current = queue.popleft()
+            for n in self._evaluate(step, current, forward):
+                if n not in reached:
+                    reached[n] = EMPTY_WITNESS
+                if n not in visited:
+                    visited.add(n)
+                    queue.append(n)
+        return reached
+
+    @classmethod
+    def _merge_into(cls, found: Dict, witnesses: Witnesses):
+        for reached, witness in witnesses.items():
+            try:
+                found[reached].update(witness)
+            except KeyError:
+                found[reached] = set(witness)
@@ -7,6 +7,8 @@ import re
 import rdflib
 
 from rdflib import XSD
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.parserutils import CompValue
 
 from ..consts import (
     OWL_PFX,
@@ -32,6 +34,23 @@ SH_declare = SH.declare
 invalid_parameter_names = {'this', 'shapesGraph', 'currentShape', 'path', 'PATH', 'value'}
 
 
+# The VALUES block of a batch is written with this focus node, then its rows are swapped for each batch
+BATCH_PLACEHOLDER = rdflib.URIRef("urn:x-pyshacl:batch-focus-node")
+BATCH_VAR = rdflib.Variable('this')
+# Algebra of LIMIT and OFFSET, and of GROUP BY, HAVING and aggregates
+SOLUTION_MODIFIERS = frozenset(('Slice', 'Group', 'AggregateJoin'))
+
+
+def _algebra_nodes(node):
+    if isinstance(node, CompValue):
+        yield node
+        for v in node.values():
+            yield from _algebra_nodes(v)
+    elif isinstance(node, (list, tuple)):
+        for v in node:
+            yield from _algebra_nodes(v)
+
+
 class SPARQLQueryHelper(object):
     bind_this_regex = re.compile(r"([\s{}()])[\$\?]this", flags=re.M)
     bind_value_regex = re.compile(r"([\s{}()])[\$\?]value", flags=re.M)
@@ -46,6 +65,7 @@ class SPARQLQueryHelper(object):
     )
     has_as_var_regex = re.compile(r"[^\w]+AS[\s]+[\$\?](\w+)", flags=re.M | re.I)
     find_msg_subs = re.compile(r"({[\$\?](.+)})", flags=re.M)
+    where_open_regex = re.compile(r"\bWHERE\s*\{", flags=re.I)
 
     def __init__(self, shape, node, select_text, parameters=None, messages=None, deactivated=False):
         self._shape = None
@@ -61,6 +81,10 @@ class SPARQLQueryHelper(object):
             'rdfs': RDFS_PFX,
             'owl': OWL_PFX,
         }
+        # The query text after binding, and its prepared query, only depend on the shape, the prefixes,
+        # whether there is a value node and the extra variables. So they are made once, not per focus node.
+        self._bound_texts = {}
+        self._prepared_queries = {}
         if shape:
             self.shape = shape
 
@@ -71,6 +95,8 @@ class SPARQLQueryHelper(object):
     @shape.setter
     def shape(self, newshape):
         self._shape = newshape
+        self._bound_texts = {}
+        self._prepared_queries = {}
         if len(self.parameters) > 0:
             self.bind_params()
             self.bind_messages()
@@ -127,6 +153,7 @@ class SPARQLQueryHelper(object):
         self.bound_messages = bound_messages
 
     def collect_prefixes(self):
+        self._prepared_queries = {}
         sg = self.shape.sg.graph
         prefixes_vals = set(sg.objects(self.node, SH_prefixes))
         if len(prefixes_vals) < 1:
@@ -344,22 +371,27 @@ class SPARQLQueryHelper(object):
                 )
         return True
 
-    def pre_bind_variables(self, thisnode, valuenode=None, extravars=None):
+    def _bind_text(self, valuenode=None, extravars=None):
+        """
+        Check the query, and substitute $PATH in it.
+        :returns: The query text, whether it uses $this, whether it uses $value, and the bindings that
+            are the same for every focus node.
+        :rtype: (str, bool, bool, dict)
+        """
+        key = (valuenode is not None, frozenset(extravars) if extravars else frozenset())
+        try:
+            return self._bound_texts[key]
+        except KeyError:
+            pass
         new_query_text = "" + self.select_text
         _ = self.check_invalid_sparql(new_query_text, valuenode=valuenode, extravars=extravars)
-        init_bindings = {}
-        found_this = self.bind_this_regex.search(new_query_text)
-        if found_this:
-            init_bindings['this'] = thisnode
-
-        if valuenode:
-            found_value = self.bind_value_regex.search(new_query_text)
-            if found_value:
-                init_bindings['value'] = valuenode
+        static_bindings = {}
+        binds_this = bool(self.bind_this_regex.search(new_query_text))
+        binds_value = bool(self.bind_value_regex.search(new_query_text))
 
         found_cs = self.bind_cs_regex.search(new_query_text)
         if found_cs:
-            init_bindings['currentShape'] = self.shape.node
+            static_bindings['currentShape'] = self.shape.node
         path = self.shape.path()
         if path:
             path_string = self._shacl_path_to_sparql_path(path)
@@ -376,12 +408,82 @@ class SPARQLQueryHelper(object):
         if shapes_graph:
             found_sg = self.bind_sg_regex.search(new_query_text)
             if found_sg:
-                init_bindings['shapesGraph'] = shapes_graph
+                static_bindings['shapesGraph'] = shapes_graph
         else:
             found_sg = self.bind_sg_regex.search(new_query_text)
             if found_sg:
                 raise NotImplementedError(
                     "SPARQL Constraint text has $shapesGraph in it, but Shapes Graph is not currently supported."
                 )
+        bound = self._bound_texts[key] = (new_query_text, binds_this, binds_value, static_bindings)
+        return bound
+
+    def _init_bindings(self, bound, thisnode, valuenode):
+        _, binds_this, binds_value, static_bindings = bound
+        init_bindings = {}
+        if binds_this:
+            init_bindings['this'] = thisnode
+        if valuenode and binds_value:
+            init_bindings['value'] = valuenode
+        init_bindings.update(static_bindings)
+        return init_bindings
+
+    def pre_bind_variables(self, thisnode, valuenode=None, extravars=None):
+        bound = self._bind_text(valuenode=valuenode, extravars=extravars)
+        return self._init_bindings(bound, thisnode, valuenode), bound[0]
+
+    def bind_prepared(self, thisnode, valuenode=None, extravars=None):
+        """
+        Like pre_bind_variables() followed by apply_prefixes(), but gives the query already parsed and translated
+        to SPARQL algebra by rdflib, so it is not parsed again for every focus node.
+        :returns: The initial bindings, and the prepared query
+        :rtype: (dict, rdflib.plugins.sparql.sparql.Query)
+        """
+        bound = self._bind_text(valuenode=valuenode, extravars=extravars)
+        key = (valuenode is not None, frozenset(extravars) if extravars else frozenset())
+        try:
+            prepared = self._prepared_queries[key]
+        except KeyError:
+            prepared = self._prepared_queries[key] = prepareQuery(self.apply_prefixes(bound[0]))
+        return self._init_bindings(bound, thisnode, valuenode), prepared
+
+    def prepare_batch(self, focus_nodes):
+        """
+        Bind many focus nodes at once, with a VALUES block of $this at the start of the WHERE clause.
+        Only for queries without nested SELECTs, where that is the same as pre-binding $this, and without
+        LIMIT, OFFSET, GROUP BY, HAVING or aggregates, which would apply to the whole batch instead of to each
+        focus node. The solutions can be split back per focus node on their binding of $this.
+        The query is prepared once, like with bind_prepared(), only the rows of its VALUES block change per batch.
+        :param focus_nodes: URIRefs and Literals, BNodes cannot be written in a query
+        :returns: The initial bindings, and the prepared query, or None if this query cannot be batched
+        :rtype: (dict, rdflib.plugins.sparql.sparql.Query) | None
+        """
+        try:
+            batch = self._prepared_queries['batch']
+        except KeyError:
+            batch = self._prepared_queries['batch'] = self._prepare_batch_query()
+        if batch is None:
+            return None
+        prepared, values = batch
+        values['res'] = [{BATCH_VAR: n} for n in focus_nodes]
+        return dict(self._bind_text()[3]), prepared
 
-        return init_bindings, new_query_text
+    def _prepare_batch_query(self):
+        query_text, binds_this, _, _ = self._bind_text()
+        if not binds_this or self.has_nested_select_regex.search(query_text):
+            return None
+        where = self.where_open_regex.search(query_text)
+        if where is None:
+            return None
+        values = "VALUES $this {{ {} }}\n".format(BATCH_PLACEHOLDER.n3())
+        batch_text = "{}\n{}{}".format(query_text[: where.end()], values, query_text[where.end() :])
+        prepared = prepareQuery(self.apply_prefixes(batch_text))
+        values_node = None
+        for node in _algebra_nodes(prepared.algebra):
+            if node.name in SOLUTION_MODIFIERS:
+                return None
+            if node.name == 'values' and node.get('res') == [{BATCH_VAR: BATCH_PLACEHOLDER}]:
+                values_node = node
+        if values_node is None:
+            return None
+        return prepared, values_node
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+#
+"""
+Incremental revalidation of a data graph that changes by a delta of added and removed triples.
+
+In incremental mode (the `incremental` option), the top-level shapes are validated one focus node at a time,
+against a RecordingGraph that notes every triple pattern the evaluation reads from the data graph: path
+traversals, the lookups of the constraint components and the queries of SPARQL-based constraints.
+Nested shape evaluations kept in the run's ShapeMemo have their reads noted too, and these are replayed into
+every evaluation that reuses them. The focus nodes of a shape depend on the triples its targets select,
+see Shape.target_patterns().
+
+Validator.apply_delta() changes the graph, then only re-evaluates the focus nodes (and drops the memoized nested
+evaluations) that read a pattern matched by an added or removed triple. It only resolves the targets again for
+shapes whose targets the delta can change. Then it patches the validation results and the fragment.
+"""
+from typing import TYPE_CHECKING, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import rdflib
+
+from rdflib.paths import Path
+
+from .profiler import COUNT_FOCUS_NODES, PHASE_TARGET_DISCOVERY
+from .target_index import TargetIndex
+
+
+if TYPE_CHECKING:
+    from .pytypes import GraphLike
+    from .shape import Shape
+    from .shapes_graph import ShapesGraph
+
+
+def triple_patterns(triple: Tuple) -> Iterator[Tuple]:
+    """
+    :param triple: A (s, p, o) triple
+    :type triple: tuple
+    :returns: The 8 triple patterns that match the triple, with None as a wildcard
+    :rtype: Iterator[tuple]
+    """
+    s, p, o = triple
+    for ps in (s, None):
+        for pp in (p, None):
+            for po in (o, None):
+                yield ps, pp, po
+
+
+class DependencyIndex(object):
+    """
+    Maps each key (eg a (shape, focus node) pair) to the triple patterns it read, and back again,
+    so the keys that an added or removed triple affects can be looked up without scanning them all.
+    """
+
+    __slots__ = ('_reads', '_readers')
+
+    def __init__(self):
+        self._reads: Dict[Hashable, FrozenSet[Tuple]] = {}
+        self._readers: Dict[Tuple, Set[Hashable]] = {}
+
+    def __len__(self):
+        return len(self._reads)
+
+    def set(self, key: Hashable, reads: Iterable[Tuple]):
+        self.discard(key)
+        reads = frozenset(reads)
+        self._reads[key] = reads
+        readers = self._readers
+        for pattern in reads:
+            try:
+                readers[pattern].add(key)
+            except KeyError:
+                readers[pattern] = {key}
+
+    def get(self, key: Hashable) -> FrozenSet[Tuple]:
+        return self._reads.get(key, frozenset())
+
+    def discard(self, key: Hashable):
+        readers = self._readers
+        for pattern in self._reads.pop(key, ()):
+            keys = readers[pattern]
+            keys.discard(key)
+            if not keys:
+                del readers[pattern]
+
+    def clear(self):
+        self._reads.clear()
+        self._readers.clear()
+
+    def affected(self, triples: Iterable[Tuple]) -> Set[Hashable]:
+        """
+        :param triples: Added or removed triples
+        :type triples: Iterable[tuple]
+        :returns: The keys that read a pattern matched by any of the triples
+        :rtype: set
+        """
+        readers = self._readers
+        found: Set[Hashable] = set()
+        for triple in triples:
+            for pattern in triple_patterns(triple):
+                keys = readers.get(pattern, None)
+                if keys:
+                    found.update(keys)
+        return found
+
+
+class ReadRecorder(object):
+    """
+    Collects the triple patterns read from a RecordingGraph into a stack of scopes. The reads of a nested scope
+    are also reads of the scopes around it.
+    The reads of memoized nested shape evaluations are kept in memo_dependencies, keyed by (shape node, focus node),
+    see Shape.validate() and Shape.validate_each().
+    """
+
+    __slots__ = ('_scopes', 'memo_dependencies')
+
+    def __init__(self):
+        self._scopes: List[Set[Tuple]] = []
+        self.memo_dependencies = DependencyIndex()
+
+    def record(self, pattern: Tuple):
+        if self._scopes:
+            self._scopes[-1].add(pattern)
+
+    def begin(self):
+        self._scopes.append(set())
+
+    def end(self) -> Set[Tuple]:
+        """
+        :returns: The patterns read since the matching begin()
+        :rtype: set
+        """
+        reads = self._scopes.pop()
+        if self._scopes:
+            self._scopes[-1].update(reads)
+        return reads
+
+    def remember(self, shape_node, focus_node, reads: Iterable[Tuple]):
+        self.memo_dependencies.set((shape_node, focus_node), reads)
+
+    def replay(self, shape_node, focus_node):
+        if self._scopes:
+            self._scopes[-1].update(self.memo_dependencies.get((shape_node, focus_node)))
+
+
+class RecordingGraph(rdflib.Graph):
+    """
+    A view of a Graph, on the same store, that notes each triple pattern it is read with in a ReadRecorder.
+    All reads of an rdflib Graph (objects(), value(), `in`, SPARQL queries, etc) go through triples().
+    """
+
+    def __init__(self, graph: rdflib.Graph, recorder: ReadRecorder):
+        super(RecordingGraph, self).__init__(
+            store=graph.store, identifier=graph.identifier, namespace_manager=graph.namespace_manager
+        )
+        self.recorder = recorder
+
+    def triples(self, triple):
+        s, p, o = triple
+        if not isinstance(p, Path):
+            # Property paths are evaluated with a triples() call for each step, those are noted instead
+            self.recorder.record((s, p, o))
+        return super(RecordingGraph, self).triples(triple)
+
+
+class IncrementalValidation(object):
+    """
+    The state kept by an incremental validation run: for each top-level shape, its focus nodes with their
+    target triples, and the conformance, validation results and neighborhood of each focus node, with the
+    triple patterns each of them read. And how many neighborhoods each fragment triple is in.
+    """
+
+    __slots__ = (
+        'data_graph',
+        'graph',
+        'sg',
+        'shapes',
+        'allow_warnings',
+        'recorder',
+        'focus',
+        'results',
+        'dependencies',
+        'target_dependencies',
+        'retarget_always',
+        'fragment_counts',
+        '_target_index',
+    )
+
+    def __init__(
+        self, data_graph: 'GraphLike', shapes: Iterable['Shape'], sg: 'ShapesGraph', allow_warnings: bool = False
+    ):
+        """
+        :param data_graph: The (named) graph being validated
+        :type data_graph: rdflib.Graph
+        :param shapes: The top-level shapes
+        :type shapes: Iterable[Shape]
+        :param sg: The Shapes Graph the shapes are from
+        :type sg: ShapesGraph
+        :param allow_warnings:
+        :type allow_warnings: bool
+        """
+        self.data_graph = data_graph
+        self.recorder = ReadRecorder()
+        self.graph = RecordingGraph(data_graph, self.recorder)
+        self.sg = sg
+        self.shapes: List['Shape'] = list(shapes)
+        self.allow_warnings = allow_warnings
+        self.focus: List[Dict] = [{} for _ in self.shapes]
+        self.results: List[Dict] = [{} for _ in self.shapes]
+        self.dependencies = DependencyIndex()
+        self.target_dependencies = DependencyIndex()
+        self.retarget_always: Set[int] = set()
+        self.fragment_counts: Dict[Tuple, int] = {}
+        self._target_index: Optional[TargetIndex] = None
+
+    def validate_shapes(self) -> Iterator[Tuple[bool, List, Set[Tuple]]]:
+        """
+        Validate each top-level shape from scratch, one focus node at a time.
+        :returns: A (conforms, reports, fragment triples) tuple for each shape, as each shape is done
+        :rtype: Iterator[tuple]
+        """
+        self._target_index = self.sg.target_index
+        for i, s in enumerate(self.shapes):
+            if s.deactivated:
+                yield True, [], set()
+                continue
+            self.focus[i] = self._resolve_targets(i)
+            for fn in self.focus[i]:
+                self._evaluate(i, fn)
+            conforms = all(r[0] for r in self.results[i].values())
+            reports = [report for r in self.results[i].values() for report in r[1]]
+            yield conforms, reports, {t for r in self.results[i].values() for t in r[2]}
+
+    def apply_delta(self, added: Iterable[Tuple], removed: Iterable[Tuple]) -> int:
+        """
+        Change the data graph, then re-evaluate the focus nodes the change affects.
+        Run-scoped state (memo, read recorder) must be set on the Shapes Graph by the caller.
+        :param added: Triples to add to the data graph
+        :type added: Iterable[tuple]
+        :param removed: Triples to remove from the data graph
+        :type removed: Iterable[tuple]
+        :returns: The number of focus nodes that were re-evaluated
+        :rtype: int
+        """
+        added = list(added)
+        removed = list(removed)
+        for t in removed:
+            self.data_graph.remove(t)
+        for t in added:
+            self.data_graph.add(t)
+        delta = added + removed
+        # The index is built again, only if a shape has to resolve its targets again
+        self._target_index = None
+        memo = self.sg.memo
+        memo_dependencies = self.recorder.memo_dependencies
+        for key in memo_dependencies.affected(delta):
+            memo.discard(*key)
+            memo_dependencies.discard(key)
+        pending = self.dependencies.affected(delta)
+        for i in sorted(self.target_dependencies.affected(delta) | self.retarget_always):
+            old_focus = self.focus[i]
+            new_focus = self._resolve_targets(i)
+            for fn in old_focus:
+                if fn not in new_focus:
+                    self._drop(i, fn)
+                    pending.discard((i, fn))
+            for fn, witness in new_focus.items():
+                if old_focus.get(fn, None) != witness:
+                    pending.add((i, fn))
+            self.focus[i] = new_focus
+        for i, fn in pending:
+            self._evaluate(i, fn)
+        return len(pending)
+
+    @property
+    def conforms(self) -> bool:
+        return all(r[0] for results in self.results for r in results.values())
+
+    def reports(self) -> List:
+        return [report for results in self.results for r in results.values() for report in r[1]]
+
+    def fragment(self) -> Set[Tuple]:
+        return set(self.fragment_counts)
+
+    def _resolve_targets(self, i: int) -> Dict:
+        shape = self.shapes[i]
+        if self._target_index is None:
+            self._target_index = TargetIndex(self.data_graph)
+        self.sg.target_index = self._target_index
+        profiler = self.sg.profiler
+        if profiler is None:
+            focus = shape.focus_nodes(self.data_graph)
+        else:
+            with profiler.phase(PHASE_TARGET_DISCOVERY, str(shape.node)):
+                focus = shape.focus_nodes(self.data_graph)
+            profiler.count(COUNT_FOCUS_NODES, len(focus))
+        patterns = shape.target_patterns(self._target_index)
+        if patterns is None:
+            self.retarget_always.add(i)
+        else:
+            self.target_dependencies.set(i, patterns)
+        return focus
+
+    def _evaluate(self, i: int, fn):
+        recorder = self.recorder
+        recorder.begin()
+        conforms, reports, subgraphs = self.shapes[i].validate(
+            self.graph, focus={fn: self.focus[i][fn]}, allow_warnings=self.allow_warnings
+        )
+        self.dependencies.set((i, fn), recorder.end())
+        neighborhood = frozenset(subgraphs.get(fn, ()))
+        old = self.results[i].get(fn, None)
+        if old is not None:
+            self._release(old[2])
+        counts = self.fragment_counts
+        for t in neighborhood:
+            counts[t] = counts.get(t, 0) + 1
+        # A focus node that is evaluated again keeps its place in the results
+        self.results[i][fn] = (conforms, reports, neighborhood)
+
+    def _drop(self, i: int, fn):
+        old = self.results[i].pop(fn, None)
+        self.dependencies.discard((i, fn))
+        if old is not None:
+            self._release(old[2])
+
+    def _release(self, neighborhood: FrozenSet[Tuple]):
+        counts = self.fragment_counts
+        for t in neighborhood:
+            if counts[t] > 1:
+                counts[t] -= 1
+            else:
+                del counts[t]
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+from rdflib import BNode, URIRef
+
+
+class ShapeMemo(object):
+    """
+    Run-scoped memo table of nested shape evaluations, keyed by (shape node, focus node).
+
+    Shape-expecting constraint components (sh:node, sh:property, sh:qualifiedValueShape, sh:and etc.)
+    validate every value node against the referenced shape. When many focus nodes share a value node,
+    the same (shape, value node) pair would otherwise be evaluated, and its neighborhood rebuilt,
+    over and over again.
+    An entry holds the conformance bit, the validation results and the extracted neighborhoods.
+    Evaluations that were cut short by recursion detection depend on the evaluation path they were
+    reached by, so they are never stored.
+    """
+
+    __slots__ = ('_table', '_recursion_events', 'hits', 'misses')
+
+    def __init__(self):
+        self._table: Dict[Tuple, Tuple[bool, List, Dict[Union[URIRef, BNode], FrozenSet]]] = {}
+        self._recursion_events = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def clear(self):
+        """
+        Drop all stored entries, but keep the hit/miss counters.
+        Must be called when the target graph changes (eg, a new named graph, or after rules have run).
+        """
+        self._table.clear()
+
+    def discard(self, shape_node, focus_node):
+        """
+        Drop one entry, eg when a change to the target graph makes it stale. See pyshacl.incremental.
+        """
+        self._table.pop((shape_node, focus_node), None)
+
+    def note_recursion(self):
+        self._recursion_events += 1
+
+    @property
+    def recursion_events(self):
+        return self._recursion_events
+
+    def lookup(self, shape_node, focus_node) -> Optional[Tuple[bool, List, Dict]]:
+        """
+        :param shape_node:
+        :type shape_node: URIRef | BNode
+        :param focus_node:
+        :type focus_node: URIRef | BNode | Literal
+        :return: A fresh (conforms, reports, subgraphs) tuple, or None if the pair has not been evaluated yet.
+        :rtype: tuple | None
+        """
+        try:
+            conforms, reports, subgraphs = self._table[(shape_node, focus_node)]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Callers extend, merge and pop from these, so always hand out fresh copies.
+        return conforms, [r.fresh() for r in reports], {fn: set(n) for fn, n in subgraphs.items()}
+
+    def store(self, shape_node, focus_node, conforms: bool, reports: List, subgraphs: Dict):
+        self._table[(shape_node, focus_node)] = (
+            conforms,
+            list(reports),
+            {fn: frozenset(n) for fn, n in subgraphs.items()},
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._table), 'hits': self.hits, 'misses': self.misses}
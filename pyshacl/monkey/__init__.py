@@ -67,6 +67,7 @@ def apply_patches():
         rdflib_term_ge_le_patch()
     if RDFLIB_421 <= RDFLIB_VERSION:
         plugin.register("Memory2", store.Store, "pyshacl.monkey.memory2", "Memory2")
+        plugin.register("CompactMemory", store.Store, "pyshacl.monkey.compact_memory", "CompactMemory")
     if RDFLIB_421 <= RDFLIB_VERSION < RDFLIB_600:
         # RDFLib 6.0.0+ comes with its own Memory2 store (called "Memory") by default
         plugin.register("default", store.Store, "pyshacl.monkey.memory2", "Memory2")
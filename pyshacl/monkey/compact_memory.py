@@ -0,0 +1,418 @@
+from rdflib.store import Store
+
+
+# Subject and predicate IDs are packed into one int in the object index, the predicate in the low bits
+_PAIR_SHIFT = 32
+_PAIR_MASK = (1 << _PAIR_SHIFT) - 1
+
+
+def _leaf_add(index, key, value):
+    """\
+    Add value to the leaf at index[key], return False when it was there already.
+    A leaf is a bare int while it holds one value, and a set of ints when it holds more.
+    """
+    leaf = index.get(key, None)
+    if leaf is None:
+        index[key] = value
+        return True
+    if leaf.__class__ is int:
+        if leaf == value:
+            return False
+        index[key] = {leaf, value}
+        return True
+    if value in leaf:
+        return False
+    leaf.add(value)
+    return True
+
+
+def _leaf_discard(index, key, value):
+    """remove value from the leaf at index[key], and the leaf when it is left empty"""
+    leaf = index[key]
+    if leaf.__class__ is int:
+        if leaf == value:
+            del index[key]
+        return
+    leaf.discard(value)
+    if len(leaf) == 1:
+        index[key] = next(iter(leaf))
+
+
+def _leaf_contains(leaf, value):
+    if leaf is None:
+        return False
+    if leaf.__class__ is int:
+        return leaf == value
+    return value in leaf
+
+
+def _leaf_values(leaf):
+    """a copy of the values of a leaf, safe to iterate while the store changes"""
+    if leaf is None:
+        return ()
+    if leaf.__class__ is int:
+        return (leaf,)
+    return tuple(leaf)
+
+
+def _in_any_context(key, ctx):
+    return True
+
+
+class CompactMemory(Store):
+    """\
+    An in memory implementation of a triple store, with the same behaviour as Memory2,
+    but dictionary-encoding every term to an integer ID.
+
+    The indexes hold only IDs: [subject][predicate] -> objects, [predicate][object] -> subjects and
+    [object] -> packed (subject, predicate) pairs, where a single value is kept as a bare int instead of
+    a one-entry dict. The contexts of a triple are only stored when they differ from the usual ones,
+    and the number of triples in each context is counted instead of keeping a set of them.
+    Terms keep their ID until the store is discarded, even when all their triples are removed.
+    """
+
+    context_aware = True
+    formula_aware = True
+    graph_aware = True
+
+    def __init__(self, configuration=None, identifier=None):
+        super(CompactMemory, self).__init__(configuration)
+        self.identifier = identifier
+
+        # The ID of each term, and the term of each ID
+        self.__ids = {}
+        self.__terms = []
+
+        # indexed by [subject][predicate] -> objects
+        self.__spo = {}
+
+        # indexed by [predicate][object] -> subjects
+        self.__pos = {}
+
+        # indexed by [object] -> (subject << _PAIR_SHIFT | predicate)
+        self.__osp = {}
+
+        self.__namespace = {}
+        self.__prefix = {}
+        self.__context_obj_map = {}
+        # the contexts of a triple, by its (s, p, o) IDs, when they are not the default ones
+        self.__tripleContexts = {}
+        # every distinct context information, so triples with the same contexts share one dict
+        self.__contextInfos = {}
+        # the number of triples in each context
+        self.__contextCounts = {None: 0}
+        # all contexts used in store (unencoded)
+        self.__all_contexts = set()
+        # default context information for triples
+        self.__defaultContexts = None
+
+    def add(self, triple, context, quoted=False):
+        """\
+        Add a triple to the store of triples.
+        """
+        Store.add(self, triple, context, quoted=quoted)
+        if context is not None:
+            self.__all_contexts.add(context)
+        key = self.__encode(triple)
+        subject, predicate, object_ = key
+
+        spo = self.__spo
+        try:
+            po = spo[subject]
+        except LookupError:
+            po = spo[subject] = {}
+        is_new = _leaf_add(po, predicate, object_)
+        if is_new:
+            pos = self.__pos
+            try:
+                os = pos[predicate]
+            except LookupError:
+                os = pos[predicate] = {}
+            _leaf_add(os, object_, subject)
+            _leaf_add(self.__osp, object_, (subject << _PAIR_SHIFT) | predicate)
+        self.__add_triple_context(key, context, quoted, is_new)
+
+    def remove(self, triple_pattern, context=None):
+        req_ctx = self.__ctx_to_str(context)
+        counts = self.__contextCounts
+        for key in list(self.__match(triple_pattern, req_ctx)):
+            ctxs = self.__get_contexts(key)
+            if context is None:
+                remaining = {}
+            else:
+                remaining = {ctx: quoted for ctx, quoted in ctxs.items() if ctx != req_ctx}
+                unquoted = [ctx for ctx, quoted in remaining.items() if not quoted]
+                if None in unquoted and len(unquoted) == 1:
+                    # remove from default graph too
+                    del remaining[None]
+            for ctx in ctxs:
+                if ctx not in remaining:
+                    counts[ctx] -= 1
+                    if ctx is not None and counts[ctx] == 0:
+                        # all triples are removed out of this context
+                        del counts[ctx]
+            if remaining:
+                self.__set_contexts(key, remaining)
+            else:
+                self.__unindex(key)
+                self.__tripleContexts.pop(key, None)
+
+        if triple_pattern == (None, None, None) and context in self.__all_contexts and not self.graph_aware:
+            # remove the whole context
+            self.__all_contexts.remove(context)
+
+    def triples(self, triple_pattern, context=None):
+        """A generator over all the triples matching"""
+        req_ctx = self.__ctx_to_str(context)
+        terms = self.__terms
+        for key in self.__match(triple_pattern, req_ctx):
+            subject, predicate, object_ = key
+            yield (terms[subject], terms[predicate], terms[object_]), self.__contexts(key)
+
+    def bind(self, prefix, namespace, override=True):
+        bound_namespace = self.__namespace.get(prefix, None)
+        bound_prefix = self.__prefix.get(namespace, None)
+        if bound_namespace is not None or bound_prefix is not None:
+            if not override:
+                return
+            # drop the old bindings of both, so the two mappings stay the inverse of each other
+            self.__prefix.pop(bound_namespace, None)
+            self.__namespace.pop(bound_prefix, None)
+        self.__prefix[namespace] = prefix
+        self.__namespace[prefix] = namespace
+
+    def namespace(self, prefix):
+        return self.__namespace.get(prefix, None)
+
+    def prefix(self, namespace):
+        return self.__prefix.get(namespace, None)
+
+    def namespaces(self):
+        for prefix, namespace in self.__namespace.items():
+            yield prefix, namespace
+
+    def contexts(self, triple=None):
+        if triple is None or triple == (None, None, None):
+            return (context for context in self.__all_contexts)
+
+        key = self.__lookup(triple)
+        if key is None or not _leaf_contains(self.__spo.get(key[0], {}).get(key[1], None), key[2]):
+            return (_ for _ in [])
+        return self.__contexts(key)
+
+    def __len__(self, context=None):
+        return self.__contextCounts.get(self.__ctx_to_str(context), 0)
+
+    def add_graph(self, graph):
+        if not self.graph_aware:
+            Store.add_graph(self, graph)
+        else:
+            self.__all_contexts.add(graph)
+
+    def remove_graph(self, graph):
+        if not self.graph_aware:
+            Store.remove_graph(self, graph)
+        else:
+            self.remove((None, None, None), graph)
+            try:
+                self.__all_contexts.remove(graph)
+            except KeyError:
+                pass  # we didn't know this graph, no problem
+
+    # internal utility methods below
+    def __encode(self, triple):
+        """the IDs of the terms of the triple, giving new terms the next free ID"""
+        ids = self.__ids
+        key = []
+        for term in triple:
+            try:
+                key.append(ids[term])
+            except KeyError:
+                term_id = ids[term] = len(self.__terms)
+                self.__terms.append(term)
+                key.append(term_id)
+        return tuple(key)
+
+    def __lookup(self, triple):
+        """the IDs of the terms of the triple, with None for unbound terms, or None when a term is unknown"""
+        ids = self.__ids
+        subject, predicate, object_ = triple
+        try:
+            return (
+                None if subject is None else ids[subject],
+                None if predicate is None else ids[predicate],
+                None if object_ is None else ids[object_],
+            )
+        except KeyError:
+            return None
+
+    def __match(self, triple_pattern, req_ctx):
+        """A generator over the IDs of all the triples matching, in the given context"""
+        key = self.__lookup(triple_pattern)
+        if key is None:
+            # a term that is not in the store cannot match
+            return
+        subject, predicate, object_ = key
+        if self.__contextCounts.get(req_ctx, 0) == 0:
+            # no triples in the given graph
+            return
+        if len(self.__tripleContexts) == 0 and req_ctx in self.__defaultContexts:
+            # all triples have the default contexts, which hold the given one, there is nothing to check
+            has_context = _in_any_context
+        else:
+            has_context = self.__triple_has_context
+
+        # all triples case (no triple parts given as pattern)
+        if subject is None and predicate is None and object_ is None:
+            # Just dump all known triples from the given graph
+            spo = self.__spo
+            for s in list(spo.keys()):
+                po = spo.get(s, None)
+                if po is None:
+                    continue
+                for p, leaf in list(po.items()):
+                    for o in _leaf_values(leaf):
+                        key = (s, p, o)
+                        if has_context(key, req_ctx):
+                            yield key
+
+        # optimize "triple in graph" case (all parts given)
+        elif subject is not None and predicate is not None and object_ is not None:
+            if _leaf_contains(self.__spo.get(subject, {}).get(predicate, None), object_):
+                if has_context(key, req_ctx):
+                    yield key
+
+        elif subject is not None:  # subject is given
+            po = self.__spo.get(subject, None)
+            if po is None:  # given subject not found
+                return
+            if predicate is not None:  # subject+predicate is given, object unbound
+                for o in _leaf_values(po.get(predicate, None)):
+                    key = (subject, predicate, o)
+                    if has_context(key, req_ctx):
+                        yield key
+            else:  # subject given, predicate unbound
+                for p, leaf in list(po.items()):
+                    if object_ is not None:  # object is given
+                        if _leaf_contains(leaf, object_):
+                            key = (subject, p, object_)
+                            if has_context(key, req_ctx):
+                                yield key
+                    else:  # object unbound
+                        for o in _leaf_values(leaf):
+                            key = (subject, p, o)
+                            if has_context(key, req_ctx):
+                                yield key
+        elif predicate is not None:  # predicate is given, subject unbound
+            os = self.__pos.get(predicate, None)
+            if os is None:
+                return
+            if object_ is not None:  # predicate+object is given, subject unbound
+                for s in _leaf_values(os.get(object_, None)):
+                    key = (s, predicate, object_)
+                    if has_context(key, req_ctx):
+                        yield key
+            else:  # predicate is given, object+subject unbound
+                for o, leaf in list(os.items()):
+                    for s in _leaf_values(leaf):
+                        key = (s, predicate, o)
+                        if has_context(key, req_ctx):
+                            yield key
+        else:  # object is given, subject+predicate unbound
+            for sp in _leaf_values(self.__osp.get(object_, None)):
+                key = (sp >> _PAIR_SHIFT, sp & _PAIR_MASK, object_)
+                if has_context(key, req_ctx):
+                    yield key
+
+    def __unindex(self, key):
+        subject, predicate, object_ = key
+        po = self.__spo[subject]
+        _leaf_discard(po, predicate, object_)
+        if not po:
+            del self.__spo[subject]
+        os = self.__pos[predicate]
+        _leaf_discard(os, object_, subject)
+        if not os:
+            del self.__pos[predicate]
+        _leaf_discard(self.__osp, object_, (subject << _PAIR_SHIFT) | predicate)
+
+    def __add_triple_context(self, key, context, quoted, is_new):
+        """add the given context to the set of contexts for the triple"""
+        ctx = self.__ctx_to_str(context)
+        quoted = bool(quoted)
+        if is_new:
+            # the triple didn't exist before in the store
+            old_ctxs = {}
+            if quoted:  # this context only
+                ctxs = {ctx: quoted}
+            else:  # default context as well
+                ctxs = {ctx: quoted, None: quoted}
+        else:
+            # we know the triple exists somewhere in the store
+            old_ctxs = self.__get_contexts(key)
+            ctxs = dict(old_ctxs)
+            ctxs[ctx] = quoted
+            if not quoted:
+                ctxs[None] = quoted
+        counts = self.__contextCounts
+        for c in ctxs:
+            if c not in old_ctxs:
+                counts[c] = counts.get(c, 0) + 1
+
+        # if this is the first ever triple in the store, set default ctx info
+        if self.__defaultContexts is None:
+            self.__defaultContexts = self.__intern_contexts(ctxs)
+        self.__set_contexts(key, ctxs)
+
+    def __intern_contexts(self, ctxs):
+        """the shared dict equal to ctxs, it must not be changed"""
+        infos = self.__contextInfos
+        info_key = frozenset(ctxs.items())
+        try:
+            return infos[info_key]
+        except KeyError:
+            infos[info_key] = ctxs
+            return ctxs
+
+    def __set_contexts(self, key, ctxs):
+        ctxs = self.__intern_contexts(ctxs)
+        # if the context info is the same as default, no need to store it
+        if ctxs is self.__defaultContexts:
+            self.__tripleContexts.pop(key, None)
+        else:
+            self.__tripleContexts[key] = ctxs
+
+    def __get_contexts(self, key):
+        """the contexts (str) of the triple, and whether the triple is quoted in each"""
+        return self.__tripleContexts.get(key, self.__defaultContexts)
+
+    def __triple_has_context(self, key, ctx):
+        """return True if the triple exists in the given context"""
+        return ctx in self.__tripleContexts.get(key, self.__defaultContexts)
+
+    def __ctx_to_str(self, ctx):
+        if ctx is None:
+            return None
+        try:
+            # ctx could be a graph. In that case, use its identifier
+            ctx_str = "{}:{}".format(str(ctx.identifier.__class__.__name__), str(ctx.identifier))
+            self.__context_obj_map[ctx_str] = ctx
+            return ctx_str
+        except AttributeError:
+            # otherwise, ctx should be a URIRef or BNode or str
+            if isinstance(ctx, str):
+                ctx_str = "{}:{}".format(str(ctx.__class__.__name__), str(ctx))
+                if ctx_str in self.__context_obj_map:
+                    return ctx_str
+                self.__context_obj_map[ctx_str] = ctx
+                return ctx_str
+            raise RuntimeError("Cannot use that type of object as a Graph context")
+
+    def __contexts(self, key):
+        """return a generator for all the non-quoted contexts
+        (dereferenced) the encoded triple appears in"""
+        return (
+            self.__context_obj_map.get(ctx_str, ctx_str)
+            for ctx_str, quoted in self.__get_contexts(key).items()
+            if not quoted and ctx_str is not None
+        )
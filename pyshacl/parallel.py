@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+#
+"""
+Validation of the top-level shapes of a run across a pool of forked worker processes.
+
+Top-level shapes are independent of each other, given a data graph that does not change while they are evaluated.
+The workers are forked once the data graph has been loaded (and inferenced, and had its rules applied), so they
+share it with the parent process copy-on-write, rather than having it pickled to them.
+Each worker validates one shape at a time and sends back its conformance, validation results and fragment triples.
+When the run is profiled, each worker also sends back what it recorded, which is added to the run's profiler,
+so the times of the phases that ran in the workers are summed across the workers.
+The results of each shape are handed back as soon as that shape and the shapes before it are done, in the order
+of the shapes, so the merged output is the same as that of a serial run.
+
+Shapes with very many focus nodes can be split into shards of focus nodes, each shard is then validated by
+a worker of its own. The focus nodes of the shapes are found by the workers, not by the parent. A worker that finds
+more than shard_size of them sends back how many shards there are, and each shard is then handed out as a task of
+its own. Which shard a focus node goes in only depends on the node, so reruns are reproducible.
+"""
+import multiprocessing
+import queue
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from zlib import crc32
+
+from .profiler import COUNT_FOCUS_NODES, PHASE_TARGET_DISCOVERY, Profiler
+from .result import ValidationResult
+
+
+if TYPE_CHECKING:
+    from .pytypes import GraphLike
+    from .shape import Shape
+    from .shapes_graph import ShapesGraph
+
+
+# What the forked workers need to know about the run, inherited from the parent when forking.
+_FORKED_RUN: Optional[Tuple] = None
+# In a worker, the shards of the shape it last split, as (shape index, shards). The shards of a shape are handed
+# out one after the other, so a worker often gets several of them.
+_WORKER_SHARDS: Optional[Tuple[int, List[Dict]]] = None
+
+
+def fork_context():
+    """
+    :returns: The fork multiprocessing context, or None if this platform cannot fork.
+    """
+    try:
+        return multiprocessing.get_context('fork')
+    except ValueError:
+        return None
+
+
+def shard_of(node, shard_count: int) -> int:
+    """
+    The shard a focus node belongs in. Unlike hash(), this does not change from one Python process to the next.
+    :param node:
+    :type node: URIRef | BNode | Literal
+    :param shard_count:
+    :type shard_count: int
+    :rtype: int
+    """
+    return crc32(str(node).encode('utf-8')) % shard_count
+
+
+def shard_focus_nodes(focus_nodes: Dict, shard_count: int) -> List[Dict]:
+    """
+    Partition the output of Shape.focus_nodes(), keeping the triples each focus node was found by.
+    Each shard can be given to Shape.validate() as its focus.
+    :param focus_nodes: A dict of focus nodes to the target triples they were found by
+    :type focus_nodes: dict
+    :param shard_count:
+    :type shard_count: int
+    :returns: shard_count dicts of focus nodes to target triples
+    :rtype: list
+    """
+    shards: List[Dict] = [{} for _ in range(shard_count)]
+    for fn, triples in focus_nodes.items():
+        shards[shard_of(fn, shard_count)][fn] = triples
+    return shards
+
+
+def validate_shapes_in_parallel(
+    shapes: Sequence['Shape'],
+    target_graph: 'GraphLike',
+    shacl_graph: 'ShapesGraph',
+    workers: int,
+    allow_warnings: Optional[bool] = False,
+    shard_size: Optional[int] = None,
+    build_reports: bool = True,
+) -> Iterator[Tuple[bool, List, Set[Tuple]]]:
+    """
+    :param shapes: The top-level shapes to validate
+    :param target_graph: The (named) graph to validate them against
+    :param shacl_graph: The Shapes Graph the shapes are from
+    :param workers: The maximum number of worker processes to use
+    :param allow_warnings:
+    :param shard_size: Split the focus nodes of shapes that have more than this many into shards of about this size
+    :param build_reports: False when the run does not report its validation results, the workers then send none back
+    :returns: A (conforms, reports, fragment triples) tuple for each shape, in the order of the given shapes,
+        as each shape is done
+    :rtype: Iterator[tuple]
+    """
+    global _FORKED_RUN
+    shapes = list(shapes)
+    if len(shapes) < 1:
+        return
+    context = fork_context()
+    if context is None:  # pragma: no cover
+        raise RuntimeError("Validating shapes in parallel needs a platform that can fork processes.")
+    graphs = (target_graph, shacl_graph.graph)
+    # The results of each shape by shard, and how many shards of it are not back yet
+    shape_results: List[Dict] = [{} for _ in shapes]
+    pending = [1] * len(shapes)
+    next_shape = 0
+    done: queue.Queue = queue.Queue()
+    _FORKED_RUN = (shapes, target_graph, shacl_graph, allow_warnings, shard_size, build_reports)
+    try:
+        with context.Pool(processes=workers if shard_size else min(workers, len(shapes))) as pool:
+            # The first task of a shape finds out whether it is split into shards
+            for i in range(len(shapes)):
+                pool.apply_async(_validate_shape, ((i, None, None),), callback=done.put, error_callback=done.put)
+            while next_shape < len(shapes):
+                result = done.get()
+                if isinstance(result, BaseException):
+                    raise result
+                (i, shard_index, shard_count), conforms, reports, fragment, profile = result
+                if profile is not None:
+                    shacl_graph.profiler.merge(profile)
+                if shard_index is None:
+                    for j in range(shard_count):
+                        pool.apply_async(
+                            _validate_shape, ((i, j, shard_count),), callback=done.put, error_callback=done.put
+                        )
+                    pending[i] = shard_count
+                    continue
+                shape_results[i][shard_index] = (conforms, reports, fragment)
+                pending[i] -= 1
+                while next_shape < len(shapes) and pending[next_shape] == 0:
+                    # Merged in shard order, so the reports come in the same order from one run to the next
+                    shards = shape_results[next_shape]
+                    shape_results[next_shape] = {}
+                    shape_reports: List = []
+                    shape_fragment: Set[Tuple] = set()
+                    for j in sorted(shards):
+                        shape_reports.extend(_restore_report(r, graphs, shacl_graph) for r in shards[j][1])
+                        shape_fragment.update(shards[j][2])
+                    next_shape += 1
+                    yield all(r[0] for r in shards.values()), shape_reports, shape_fragment
+    finally:
+        _FORKED_RUN = None
+
+
+def _validate_shape(task: Tuple[int, Optional[int], Optional[int]]):
+    global _WORKER_SHARDS
+    shapes, target_graph, shacl_graph, allow_warnings, shard_size, build_reports = _FORKED_RUN
+    shape_index, shard_index, shard_count = task
+    shape = shapes[shape_index]
+    profiler = shacl_graph.profiler
+    if profiler is not None:
+        # Only send back what was recorded for this task
+        profiler = shacl_graph.profiler = Profiler()
+    focus = None
+    if shard_size and not shape.deactivated:
+        if _WORKER_SHARDS is not None and _WORKER_SHARDS[0] == shape_index:
+            focus = _WORKER_SHARDS[1][shard_index]
+        else:
+            if profiler is None:
+                focus = shape.focus_nodes(target_graph)
+            else:
+                with profiler.phase(PHASE_TARGET_DISCOVERY, str(shape.node)):
+                    focus = shape.focus_nodes(target_graph)
+            if shard_count is None:
+                shard_count = -(-len(focus) // shard_size) if len(focus) > shard_size else 1
+            if shard_count > 1:
+                _WORKER_SHARDS = (shape_index, shard_focus_nodes(focus, shard_count))
+                if shard_index is None:
+                    # Only the number of shards goes back, the parent hands them out as tasks of their own
+                    profile = None if profiler is None else profiler.to_dict()
+                    return (shape_index, None, shard_count), True, [], set(), profile
+                focus = _WORKER_SHARDS[1][shard_index]
+        if profiler is not None:
+            profiler.count(COUNT_FOCUS_NODES, len(focus))
+    conforms, reports, subgraphs = shape.validate(target_graph, focus=focus, allow_warnings=allow_warnings)
+    triples = {t for fn in subgraphs for t in subgraphs[fn]}
+    if build_reports:
+        graphs = (target_graph, shacl_graph.graph)
+        reports = [_portable_report(r, graphs, shacl_graph) for r in reports]
+    else:
+        reports = []
+    profile = None if profiler is None else profiler.to_dict()
+    return (shape_index, shard_index or 0, shard_count or 1), conforms, reports, triples, profile
+
+
+def _portable_report(report, graphs, shacl_graph):
+    # A ValidationResult is sent back as the fields it is rebuilt from in the parent, so that its messages,
+    # description and triples are still only made if the report is built. Its component is referred to by
+    # the node of its shape and its position in the plan of that shape, the forked parent has the same shapes
+    # and compiles the same plans. Its graph is referred to by its position in graphs, rather than pickling it.
+    component = report.component
+    shape = component.shape
+    plan = shacl_graph.shape_plan(shape)
+    position = _position(component, plan.constraints + plan.custom_validators)
+    datagraph = None if report.datagraph is None else _position(report.datagraph, graphs)
+    try:
+        shared = shacl_graph.lookup_shape_from_node(shape.node) is shape
+    except KeyError:
+        shared = False
+    if shared and position is not None and (datagraph is not None or report.datagraph is None):
+        fields = (
+            datagraph,
+            report.focus_node,
+            report.value_node,
+            report.result_path,
+            report.constraint_component,
+            report.source_constraint,
+            report.extra_messages,
+            report.bound_vars,
+        )
+        return (shape.node, position), fields
+    # Otherwise the result is made here, the objects of its triples can be (source graph, node) pairs,
+    # see ValidationResult.triples.
+    desc, r_node, r_triples = report
+    portable = []
+    for s, p, o in r_triples:
+        if isinstance(o, tuple):
+            i = _position(o[0], graphs)
+            if i is not None:
+                o = (i, o[1])
+        portable.append((s, p, o))
+    return None, (desc, r_node, portable)
+
+
+def _position(item, items) -> Optional[int]:
+    for i, x in enumerate(items):
+        if x is item:
+            return i
+    return None
+
+
+def _restore_report(report, graphs, shacl_graph):
+    locator, fields = report
+    if locator is None:
+        desc, r_node, r_triples = fields
+        restored = []
+        for s, p, o in r_triples:
+            if isinstance(o, tuple) and isinstance(o[0], int):
+                o = (graphs[o[0]], o[1])
+            restored.append((s, p, o))
+        return desc, r_node, restored
+    shape_node, position = locator
+    plan = shacl_graph.shape_plan(shacl_graph.lookup_shape_from_node(shape_node))
+    component = (plan.constraints + plan.custom_validators)[position]
+    datagraph = fields[0]
+    return ValidationResult(component, None if datagraph is None else graphs[datagraph], *fields[1:])
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional
+
+from .helper.path_helper import path_signature
+from .profiler import COUNT_PATH_CACHE_EVICTIONS, COUNT_PATH_CACHE_HITS, COUNT_PATH_CACHE_MISSES
+
+
+if TYPE_CHECKING:
+    from .helper.path_helper import PathEvaluator, PathExpression, Witnesses
+    from .profiler import Profiler
+
+
+DEFAULT_PATH_CACHE_SIZE = 100000
+
+
+class PathCache(object):
+    """
+    Run-scoped cache of property path evaluations, keyed by (path, focus node), shared by all shapes.
+
+    Property shapes often have the same sh:path, eg one checks the datatype of ex:name, another its cardinality
+    and a third its sh:pattern, and they walk that path from the same focus nodes. An entry holds the nodes
+    reachable from the focus node on the path, each with its witness triples, as returned by a PathEvaluator.
+    Paths are identified by their structure (see path_signature()), so shapes share entries when they have the
+    same predicate path, or the same complex path, even when it is written out as separate RDF lists.
+    At most max_entries entries are kept, the least recently used entry is dropped to make room for a new one.
+
+    Entries are only valid for the data graph they were evaluated against, and for the witness mode of the run,
+    so the cache must be cleared when either changes. The returned dicts are shared,
+    callers must copy them before changing them.
+    """
+
+    __slots__ = ('max_entries', '_table', '_signatures', 'hits', 'misses', 'evictions')
+
+    def __init__(self, max_entries: int = DEFAULT_PATH_CACHE_SIZE):
+        """
+        :param max_entries: The largest number of (path, focus node) evaluations to keep
+        :type max_entries: int
+        """
+        if max_entries < 1:
+            raise ValueError("A PathCache must be able to hold at least one entry.")
+        self.max_entries = max_entries
+        self._table: 'OrderedDict' = OrderedDict()
+        # The signature of each path, by the node of its sh:path value
+        self._signatures: Dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def clear(self):
+        """
+        Drop all stored entries, but keep the counters.
+        Must be called when the target graph changes (eg, a new named graph, or after rules have run).
+        """
+        self._table.clear()
+
+    def evaluate(
+        self,
+        evaluator: 'PathEvaluator',
+        focus_node,
+        expression: 'PathExpression',
+        profiler: Optional['Profiler'] = None,
+    ) -> 'Witnesses':
+        """
+        Like PathEvaluator.evaluate(), but only walks the path when it was not walked from focus_node before.
+        :param evaluator: The evaluator to walk the path with, on a miss
+        :type evaluator: PathEvaluator
+        :param focus_node: The node to start walking the path from
+        :param expression: The compiled path expression
+        :param profiler: Counts the hits, misses and evictions, when the run is profiled
+        :type profiler: Profiler | None
+        :rtype: dict
+        """
+        table = self._table
+        path_node = expression[1]
+        try:
+            signature = self._signatures[path_node]
+        except KeyError:
+            signature = self._signatures[path_node] = path_signature(expression)
+        key = (signature, focus_node)
+        try:
+            paths = table[key]
+        except KeyError:
+            pass
+        else:
+            table.move_to_end(key)
+            self.hits += 1
+            if profiler is not None:
+                profiler.count(COUNT_PATH_CACHE_HITS)
+            return paths
+        self.misses += 1
+        paths = table[key] = evaluator.evaluate(focus_node, expression)
+        if profiler is not None:
+            profiler.count(COUNT_PATH_CACHE_MISSES)
+        if len(table) > self.max_entries:
+            table.popitem(last=False)
+            self.evictions += 1
+            if profiler is not None:
+                profiler.count(COUNT_PATH_CACHE_EVICTIONS)
+        return paths
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._table), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
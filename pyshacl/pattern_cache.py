@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+import re
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from .profiler import COUNT_PATTERN_CACHE_HITS, COUNT_PATTERN_CACHE_MISSES
+
+
+if TYPE_CHECKING:
+    from .profiler import Profiler
+
+
+DEFAULT_PATTERN_CACHE_SIZE = 1000000
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern: str, flags: int = 0) -> 're.Pattern':
+    """
+    Process-wide cache of compiled sh:pattern regexes, shared by all shapes, runs and Shapes Graphs.
+    :param pattern: The lexical form of the sh:pattern value
+    :param flags: The re flags of the sh:flags value
+    :rtype: re.Pattern
+    """
+    return re.compile(pattern, flags)
+
+
+class PatternCache(object):
+    """
+    Run-scoped cache of sh:pattern matches, keyed by (pattern, flags, string), shared by all shapes.
+
+    Identifier shapes often check the same strings against the same patterns: a literal reachable from many focus
+    nodes, or the same sh:pattern on several shapes with the same path. Matches do not depend on the data graph,
+    so entries are kept for the whole run. At most max_entries entries are kept, once full new matches are no
+    longer stored. Unlike the PathCache, no entry is dropped to make room: the strings of a shape are looked up
+    in one pass, so dropping the oldest entries would only make room for strings that are not looked up again
+    in that pass, and a miss would cost a match, a store and a drop instead of a match. An entry is a string
+    shared with the value of its literal, and a bool.
+    """
+
+    __slots__ = ('max_entries', '_tables', '_size', 'hits', 'misses')
+
+    def __init__(self, max_entries: int = DEFAULT_PATTERN_CACHE_SIZE):
+        """
+        :param max_entries: The largest number of (pattern, flags, string) matches to keep
+        :type max_entries: int
+        """
+        if max_entries < 1:
+            raise ValueError("A PatternCache must be able to hold at least one entry.")
+        self.max_entries = max_entries
+        # The matches of each (pattern, flags), by string
+        self._tables: Dict = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        """
+        Drop all stored entries, but keep the counters.
+        """
+        self._tables.clear()
+        self._size = 0
+
+    def matches(
+        self, pattern: str, flags: int, strings: Iterable[str], profiler: Optional['Profiler'] = None
+    ) -> List[bool]:
+        """
+        :param pattern: The lexical form of the sh:pattern value
+        :param flags: The re flags of the sh:flags value
+        :param strings: The strings to search the pattern in
+        :param profiler: Counts the hits and misses, when the run is profiled
+        :type profiler: Profiler | None
+        :returns: Whether the pattern is found in each of the strings, in the same order
+        :rtype: list
+        """
+        try:
+            table = self._tables[(pattern, flags)]
+        except KeyError:
+            table = self._tables[(pattern, flags)] = {}
+        search = compile_pattern(pattern, flags).search
+        room = self.max_entries - self._size
+        found: List[bool] = []
+        append = found.append
+        misses = 0
+        for s in strings:
+            match = table.get(s, None)
+            if match is None:
+                misses += 1
+                match = search(s) is not None
+                if misses <= room:
+                    table[s] = match
+            append(match)
+        self._size += min(misses, room)
+        hits = len(found) - misses
+        self.hits += hits
+        self.misses += misses
+        if profiler is not None:
+            profiler.count(COUNT_PATTERN_CACHE_HITS, hits)
+            profiler.count(COUNT_PATTERN_CACHE_MISSES, misses)
+        return found
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': self._size, 'hits': self.hits, 'misses': self.misses}
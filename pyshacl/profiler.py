@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+"""
+Instrumentation of a validation run.
+
+A Profiler records the wall clock time and CPU time spent in each phase of a run, and counters of the amounts of
+work done, like the number of focus nodes and value nodes. Pass one to the Validator with the `profiler` option,
+or use the CLI `--profile` flag, then read it with to_dict() or to_json().
+
+Phases can be nested. The time of a phase includes that of the phases nested in it, but when a phase is entered
+again while it is already running (eg a constraint component evaluating a nested shape) only the outermost
+occurrence is timed, so no time is counted twice.
+"""
+import json
+
+from time import perf_counter, process_time
+from typing import Dict, Optional
+
+
+PHASE_LOAD = 'load'
+PHASE_INFERENCE = 'inference'
+PHASE_SHAPE_HARVEST = 'shape harvest'
+PHASE_FREEZE = 'freeze'
+PHASE_TARGET_DISCOVERY = 'target discovery'
+PHASE_CONSTRAINT_EVALUATE = 'constraint evaluate'
+PHASE_NEIGHBORHOOD_MERGE = 'neighborhood merge'
+PHASE_REPORT_BUILDING = 'report building'
+
+COUNT_FOCUS_NODES = 'focus nodes'
+COUNT_VALUE_NODES = 'value nodes'
+COUNT_FRAGMENT_TRIPLES = 'fragment triples'
+# Data graph triples read by the steps of paths, and by the lookups of constraint components (eg sh:class)
+COUNT_TRIPLES_TOUCHED = 'triples touched'
+COUNT_PATH_CACHE_HITS = 'path cache hits'
+COUNT_PATH_CACHE_MISSES = 'path cache misses'
+COUNT_PATH_CACHE_EVICTIONS = 'path cache evictions'
+COUNT_PATTERN_CACHE_HITS = 'pattern cache hits'
+COUNT_PATTERN_CACHE_MISSES = 'pattern cache misses'
+
+# The caches whose hit rate is derived from their hit and miss counters, see Profiler.to_dict()
+_HIT_RATES = (
+    ('path cache', COUNT_PATH_CACHE_HITS, COUNT_PATH_CACHE_MISSES),
+    ('pattern cache', COUNT_PATTERN_CACHE_HITS, COUNT_PATTERN_CACHE_MISSES),
+)
+
+
+class _PhaseTimer(object):
+    __slots__ = ('profiler', 'name', 'detail', 'wall', 'cpu')
+
+    def __init__(self, profiler: 'Profiler', name: str, detail: Optional[str]):
+        self.profiler = profiler
+        self.name = name
+        self.detail = detail
+
+    def __enter__(self):
+        self.wall = perf_counter()
+        self.cpu = process_time()
+        self.profiler._enter(self.name, self.detail)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        wall = perf_counter() - self.wall
+        cpu = process_time() - self.cpu
+        self.profiler._exit(self.name, self.detail, wall, cpu)
+        return False
+
+
+class Profiler(object):
+    """
+    Records the time spent in each phase of a validation run, and counters of the work done.
+    """
+
+    __slots__ = ('phases', 'counters', '_running')
+
+    def __init__(self):
+        self.phases: Dict[str, Dict] = {}
+        self.counters: Dict[str, int] = {}
+        self._running: Dict = {}
+
+    def phase(self, name: str, detail: Optional[str] = None) -> _PhaseTimer:
+        """
+        :param name: The phase, eg PHASE_CONSTRAINT_EVALUATE
+        :type name: str
+        :param detail: What the phase is about, eg the constraint component. Its time is also recorded separately.
+        :type detail: str | None
+        :returns: A context manager that times the phase
+        """
+        return _PhaseTimer(self, name, detail)
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def _enter(self, name, detail):
+        running = self._running
+        running[name] = running.get(name, 0) + 1
+        if detail is not None:
+            running[(name, detail)] = running.get((name, detail), 0) + 1
+
+    def _exit(self, name, detail, wall, cpu):
+        running = self._running
+        running[name] -= 1
+        stats = self.phases.get(name, None)
+        if stats is None:
+            stats = self.phases[name] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0}
+        self._record(stats, wall, cpu, running[name] < 1)
+        if detail is not None:
+            running[(name, detail)] -= 1
+            by_detail = stats.setdefault('by', {})
+            detail_stats = by_detail.get(detail, None)
+            if detail_stats is None:
+                detail_stats = by_detail[detail] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0}
+            self._record(detail_stats, wall, cpu, running[(name, detail)] < 1)
+
+    @staticmethod
+    def _record(stats, wall, cpu, outermost):
+        stats['calls'] += 1
+        if outermost:
+            stats['wall'] += wall
+            stats['cpu'] += cpu
+
+    def merge(self, other: Dict):
+        """
+        Add the phases and counters recorded by another profiler, eg in a worker process.
+        :param other: The to_dict() output of the other profiler
+        :type other: dict
+        """
+        for name, amount in other.get('counters', {}).items():
+            self.count(name, amount)
+        for name, stats in other.get('phases', {}).items():
+            self._merge_stats(self.phases.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0}), stats)
+
+    @classmethod
+    def _merge_stats(cls, into, stats):
+        into['calls'] += stats['calls']
+        into['wall'] += stats['wall']
+        into['cpu'] += stats['cpu']
+        for detail, detail_stats in stats.get('by', {}).items():
+            by_detail = into.setdefault('by', {})
+            cls._merge_stats(by_detail.setdefault(detail, {'calls': 0, 'wall': 0.0, 'cpu': 0.0}), detail_stats)
+
+    def hit_rates(self) -> Dict[str, float]:
+        """
+        :returns: The fraction of lookups that were hits, for each cache that was looked up in
+        :rtype: dict
+        """
+        rates = {}
+        for cache, hits_counter, misses_counter in _HIT_RATES:
+            hits = self.counters.get(hits_counter, 0)
+            lookups = hits + self.counters.get(misses_counter, 0)
+            if lookups > 0:
+                rates[cache] = hits / lookups
+        return rates
+
+    def to_dict(self) -> Dict:
+        return {'phases': self.phases, 'counters': self.counters, 'hit rates': self.hit_rates()}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
@@ -10,12 +10,12 @@ from .consts import RDF_first
 from .pytypes import ConjunctiveLike, GraphLike
 
 
-def clone_dataset(source_ds, target_ds=None):
+def clone_dataset(source_ds, target_ds=None, store='default'):
     if target_ds and not isinstance(target_ds, (rdflib.Dataset, rdflib.ConjunctiveGraph)):
         raise RuntimeError("when cloning a dataset, the target_ds must be a conjunctiveGraph or rdflib Dataset.")
     default_union = source_ds.default_union
     if target_ds is None:
-        target_ds = rdflib.Dataset(default_union=default_union)
+        target_ds = rdflib.Dataset(store=store, default_union=default_union)
     named_graphs = [
         rdflib.Graph(source_ds.store, i, namespace_manager=source_ds.namespace_manager)
         if not isinstance(i, rdflib.Graph)
@@ -35,7 +35,7 @@ def clone_dataset(source_ds, target_ds=None):
     return target_ds
 
 
-def clone_graph(source_graph, target_graph=None, identifier=None):
+def clone_graph(source_graph, target_graph=None, identifier=None, store='default'):
     """
     Make a clone of the source_graph by directly copying triples from source_graph to target_graph
     :param source_graph:
@@ -44,13 +44,15 @@ def clone_graph(source_graph, target_graph=None, identifier=None):
     :type target_graph: rdflib.Graph|None
     :param identifier:
     :type identifier: str | None
+    :param store: The name of the rdflib store plugin of the clone, when no target_graph is given
+    :type store: str
     :return: The cloned graph
     :rtype: rdflib.Graph
     """
     if isinstance(source_graph, (rdflib.Dataset, rdflib.ConjunctiveGraph)):
-        return clone_dataset(source_graph, target_ds=target_graph)
+        return clone_dataset(source_graph, target_ds=target_graph, store=store)
     if target_graph is None:
-        g = rdflib.Graph(identifier=identifier)
+        g = rdflib.Graph(store=store, identifier=identifier)
         for p, n in source_graph.namespace_manager.namespaces():
             g.namespace_manager.bind(p, n, override=True, replace=True)
     else:
@@ -63,7 +65,10 @@ def clone_graph(source_graph, target_graph=None, identifier=None):
 
 
 def mix_datasets(
-    base_ds: ConjunctiveLike, extra_ds: GraphLike, target_ds: Optional[Union[ConjunctiveLike, str]] = None
+    base_ds: ConjunctiveLike,
+    extra_ds: GraphLike,
+    target_ds: Optional[Union[ConjunctiveLike, str]] = None,
+    store: str = 'default',
 ):
     """
     Make a clone of base_ds (dataset) and add in the triples from extra_ds (dataset)
@@ -73,13 +78,15 @@ def mix_datasets(
     :type extra_ds: rdflib.Dataset
     :param target_ds:
     :type target_ds: rdflib.Dataset|str|NoneType
+    :param store: The name of the rdflib store plugin of the clone, when no target_ds is given
+    :type store: str
     :return: The cloned Dataset with mixed in triples from extra_ds
     :rtype: rdflib.Dataset
     """
     default_union = base_ds.default_union
     base_named_graphs = list(base_ds.contexts())
     if target_ds is None:
-        target_ds = rdflib.Dataset(default_union=default_union)
+        target_ds = rdflib.Dataset(store=store, default_union=default_union)
     elif isinstance(target_ds, rdflib.ConjunctiveGraph):
         raise RuntimeError("Cannot mix new graphs into a ConjunctiveGraph, use Dataset instead.")
     elif target_ds == "inplace":
@@ -116,7 +123,12 @@ def mix_datasets(
     return target_ds
 
 
-def mix_graphs(base_graph: GraphLike, extra_graph: GraphLike, target_graph: Optional[Union[GraphLike, str]] = None):
+def mix_graphs(
+    base_graph: GraphLike,
+    extra_graph: GraphLike,
+    target_graph: Optional[Union[GraphLike, str]] = None,
+    store: str = 'default',
+):
     """
     Make a clone of base_graph and add in the triples from extra_graph
     :param base_graph:
@@ -125,6 +137,8 @@ def mix_graphs(base_graph: GraphLike, extra_graph: GraphLike, target_graph: Opti
     :type extra_graph: rdflib.Graph
     :param target_graph:
     :type target_graph: rdflib.Graph|str|NoneType
+    :param store: The name of the rdflib store plugin of the clone, when no target_graph is given
+    :type store: str
     :return: The cloned graph with mixed in triples from extra_graph
     :rtype: rdflib.Graph
     """
@@ -133,7 +147,7 @@ def mix_graphs(base_graph: GraphLike, extra_graph: GraphLike, target_graph: Opti
     ):
         return mix_datasets(base_graph, extra_graph, target_ds=target_graph)
     if target_graph is None:
-        g = clone_graph(base_graph, target_graph=None, identifier=base_graph.identifier)
+        g = clone_graph(base_graph, target_graph=None, identifier=base_graph.identifier, store=store)
     elif target_graph == "inplace":
         # Special case, don't clone the basegraph, just put extra straight in
         g = base_graph
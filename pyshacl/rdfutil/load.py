@@ -79,6 +79,7 @@ def load_from_source(
     multigraph: bool = False,
     do_owl_imports: Union[bool, int] = False,
     import_chain: Optional[List[Union[rdflib.URIRef, str]]] = None,
+    store: str = 'default',
 ):
     """
 
@@ -93,6 +94,8 @@ def load_from_source(
     :type do_owl_imports: bool|int
     :param import_chain:
     :type import_chain: list | None
+    :param store: The name of the rdflib store plugin of the new graph, when source is not a graph and g is None
+    :type store: str
     :return:
     """
     source_is_graph = False
@@ -209,7 +212,7 @@ def load_from_source(
         if source_is_graph:
             target_g: Union[rdflib.Graph, rdflib.ConjunctiveGraph, rdflib.Dataset] = source  # type: ignore
         else:
-            target_g = rdflib.Dataset() if multigraph else rdflib.Graph()
+            target_g = rdflib.Dataset(store=store) if multigraph else rdflib.Graph(store=store)
     else:
         if not isinstance(g, (rdflib.Graph, rdflib.Dataset, rdflib.ConjunctiveGraph)):
             raise RuntimeError("Passing in 'g' must be a rdflib Graph or Dataset.")
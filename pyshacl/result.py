@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+#
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+from rdflib import BNode, Literal
+
+from .consts import (
+    RDF_type,
+    SH_focusNode,
+    SH_resultMessage,
+    SH_resultPath,
+    SH_resultSeverity,
+    SH_sourceConstraint,
+    SH_sourceConstraintComponent,
+    SH_sourceShape,
+    SH_ValidationResult,
+    SH_value,
+)
+
+
+if TYPE_CHECKING:
+    from .constraints.constraint_component import ConstraintComponent
+    from .pytypes import GraphLike
+
+
+class ValidationResult(object):
+    """
+    A validation result, as made by ConstraintComponent.make_v_result().
+
+    It only holds what identifies the result: the focus node, value node and result path, the constraint component
+    and shape it comes from, and its severity. Its messages, its description text and its triples in the
+    validation report are made when they are first asked for, eg when the report is built. Many results are never
+    reported, like those of the nested shapes of sh:not and sh:or, or any result of a fragment-only run.
+
+    A result can still be unpacked like the (description, result node, result triples) tuples results used to be.
+
+    The messages and description are made from the data graph the result refers to. When that graph is changed,
+    eg by Validator.apply_delta(), call materialize() first on the results that are kept, or they describe the
+    changed graph.
+    """
+
+    __slots__ = (
+        'component',
+        'datagraph',
+        'focus_node',
+        'value_node',
+        'result_path',
+        'constraint_component',
+        'source_constraint',
+        'extra_messages',
+        'bound_vars',
+        'severity',
+        '_node',
+        '_messages',
+        '_description',
+    )
+
+    def __init__(
+        self,
+        component: 'ConstraintComponent',
+        datagraph: Optional['GraphLike'],
+        focus_node,
+        value_node=None,
+        result_path=None,
+        constraint_component=None,
+        source_constraint=None,
+        extra_messages=None,
+        bound_vars=None,
+    ):
+        shape = component.shape
+        self.component = component
+        self.datagraph = datagraph
+        self.focus_node = focus_node
+        self.value_node = value_node
+        if result_path is None and shape.is_property_shape:
+            result_path = shape.path()
+        self.result_path = result_path
+        self.constraint_component = constraint_component or component.shacl_constraint_component
+        self.source_constraint = source_constraint
+        # Kept as a tuple, the extra messages can be given as any iterable
+        self.extra_messages = None if extra_messages is None else tuple(extra_messages)
+        self.bound_vars = bound_vars
+        self.severity = shape.severity
+        self._node: Optional[BNode] = None
+        self._messages: Optional[List] = None
+        self._description: Optional[str] = None
+
+    def __iter__(self) -> Iterator:
+        return iter((self.description, self.node, self.triples))
+
+    def __repr__(self):
+        return "<ValidationResult {} on {}>".format(self.component.constraint_name(), self.focus_node)
+
+    def fresh(self) -> 'ValidationResult':
+        """
+        A copy of this result, that gets its own sh:ValidationResult node in the report graph.
+        :rtype: ValidationResult
+        """
+        copy = ValidationResult.__new__(ValidationResult)
+        for attr in ValidationResult.__slots__:
+            setattr(copy, attr, getattr(self, attr))
+        copy._node = None
+        return copy
+
+    def materialize(self) -> 'ValidationResult':
+        """
+        Make the messages and description of this result now, from the data graph as it is.
+        :rtype: ValidationResult
+        """
+        _ = self.description
+        return self
+
+    @property
+    def node(self) -> BNode:
+        """
+        The sh:ValidationResult node of this result in the report graph.
+        """
+        if self._node is None:
+            self._node = BNode()
+        return self._node
+
+    @property
+    def messages(self) -> List:
+        """
+        The sh:message values of the shape, or if it has none and no extra messages were given,
+        the generic messages of the constraint component.
+        """
+        if self._messages is None:
+            messages = list(self.component.shape.message)
+            if not self.extra_messages and not messages:
+                messages = self.component.make_generic_messages(self.datagraph, self.focus_node, self.value_node)
+                messages = messages or []
+            self._messages = messages
+        return self._messages
+
+    @property
+    def description(self) -> str:
+        if self._description is None:
+            self._description = self.component.make_v_result_description(
+                self.datagraph,
+                self.focus_node,
+                self.severity,
+                self.value_node,
+                self.messages,
+                result_path=self.result_path,
+                constraint_component=self.constraint_component,
+                source_constraint=self.source_constraint,
+                extra_messages=self.extra_messages,
+                bound_vars=self.bound_vars,
+            )
+        return self._description
+
+    @property
+    def triples(self) -> List[Tuple]:
+        """
+        The triples of this result in the report graph. Objects that are nodes of the data graph or the shapes graph
+        are (graph, node) pairs, see Validator.create_validation_report().
+        """
+        component = self.component
+        sg = component.shape.sg.graph
+        r_node = self.node
+        r_triples = [
+            (r_node, RDF_type, SH_ValidationResult),
+            (r_node, SH_sourceConstraintComponent, (sg, self.constraint_component)),
+            (r_node, SH_sourceShape, (sg, component.shape.node)),
+            (r_node, SH_resultSeverity, self.severity),
+            (r_node, SH_focusNode, (self.datagraph or sg, self.focus_node)),
+        ]
+        if self.value_node is not None:
+            r_triples.append((r_node, SH_value, (self.datagraph, self.value_node)))
+        if self.result_path is not None:
+            r_triples.append((r_node, SH_resultPath, (sg, self.result_path)))
+        if self.source_constraint is not None:
+            r_triples.append((r_node, SH_sourceConstraint, (sg, self.source_constraint)))
+        messages = self.messages
+        if self.extra_messages:
+            for m in self.extra_messages:
+                if m in messages:
+                    continue
+                r_triples.append((r_node, SH_resultMessage, self._format_message(m)))
+        for m in messages:
+            r_triples.append((r_node, SH_resultMessage, self._format_message(m)))
+        return r_triples
+
+    def _format_message(self, m):
+        if isinstance(m, Literal) and self.bound_vars is not None:
+            return Literal(self.component._format_sparql_based_result_message(str(m.value), self.bound_vars))
+        return m
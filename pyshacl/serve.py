@@ -0,0 +1,511 @@
+# -*- coding: utf-8 -*-
+#
+"""
+A long-running validation daemon, that keeps parsed Shapes Graphs and their compiled shapes in memory.
+
+Start it with `pyshacl serve`, on a local TCP port or a Unix socket. Each request is an HTTP POST to /validate,
+with a JSON object holding the data graph to validate, and either the Shapes Graph itself or the shapes_id of
+a Shapes Graph that was sent before:
+
+    {"data": "<RDF text>", "data_format": "turtle", "shapes": "<RDF text>", "shapes_format": "turtle",
+     "report": true, "fragment": true, "report_format": "turtle",
+     "inference": "none", "advanced": false, "abort_on_first": false, "allow_warnings": false}
+
+The response is a JSON object with "conforms", the "shapes_id" of the Shapes Graph, and unless they were turned
+off, the "report" graph and "report_text", and the "fragment" as N-Triples. A request that only asks for the
+report is run conformance-only, one that only asks for the fragment is run fragment-only.
+GET /health tells whether the daemon is up.
+
+Shapes Graphs are identified by a hash of their format and content. The daemon keeps the most recently used
+ones, each parsed, wrapped in a ShapesGraph and harvested once. Requests are validated in a pool of forked
+worker processes, each with its own cache of Shapes Graphs, or, with no workers, one at a time in the daemon.
+Request bodies are always parsed as RDF documents, they are never opened as file paths or fetched as URLs.
+"""
+import argparse
+import hashlib
+import http.client
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Dict, Optional, Tuple, Union
+
+from .errors import ReportableRuntimeError, ValidationFailure
+from .fragment_sink import NTriplesFragmentSink
+from .monkey import apply_patches, rdflib_bool_patch, rdflib_bool_unpatch
+from .parallel import fork_context
+from .rdfutil import load_from_source
+from .shapes_graph import ShapesGraph
+from .validate import Validator, assign_baked_in
+
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8099
+DEFAULT_CACHE_SIZE = 16
+# Requests with larger bodies are refused
+DEFAULT_MAX_BODY = 64 * 1024 * 1024
+# The format of data graphs and Shapes Graphs that are sent without one
+DEFAULT_FORMAT = 'turtle'
+
+
+class BadRequest(Exception):
+    """
+    A request the daemon cannot validate, answered with an HTTP error status and the message.
+    """
+
+    def __init__(self, message: str, status: int = 400):
+        super(BadRequest, self).__init__(message)
+        self.message = message
+        self.status = status
+
+
+def shapes_id(shapes: str, shapes_format: Optional[str]) -> str:
+    """
+    :returns: The identifier of a Shapes Graph, a hash of its format and content
+    :rtype: str
+    """
+    digest = hashlib.sha256((shapes_format or "").encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(shapes.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _load_text(text: str, rdf_format: Optional[str]):
+    # As a stream, so the text is parsed, and not taken for a file path or a URL
+    return load_from_source(BytesIO(text.encode('utf-8')), rdf_format=rdf_format, multigraph=True)
+
+
+class ShapesGraphCache(object):
+    """
+    The most recently used Shapes Graphs of a process, by shapes_id, each parsed and harvested once.
+    The least recently used one is dropped to make room for a new one.
+    """
+
+    __slots__ = ('max_entries', '_table', 'hits', 'misses')
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._table: 'OrderedDict[str, ShapesGraph]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def get(self, key: str, shapes: str, shapes_format: Optional[str]) -> ShapesGraph:
+        """
+        :param key: The shapes_id of the Shapes Graph
+        :param shapes: The Shapes Graph, as RDF text. Only parsed when it is not in the cache yet.
+        :param shapes_format: The RDF format of the text
+        :rtype: ShapesGraph
+        """
+        table = self._table
+        try:
+            sg = table[key]
+        except KeyError:
+            pass
+        else:
+            table.move_to_end(key)
+            self.hits += 1
+            return sg
+        self.misses += 1
+        rdflib_bool_patch()
+        try:
+            loaded_sg = _load_text(shapes, shapes_format)
+        finally:
+            rdflib_bool_unpatch()
+        sg = ShapesGraph(loaded_sg, log)
+        _ = sg.shapes  # This property getter triggers shapes harvest.
+        table[key] = sg
+        if len(table) > self.max_entries:
+            table.popitem(last=False)
+        return sg
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._table), 'hits': self.hits, 'misses': self.misses}
+
+
+def validate_request(cache: ShapesGraphCache, request: Dict) -> Dict:
+    """
+    Validate the data graph of a request, against its Shapes Graph from the cache.
+    :param cache: The Shapes Graphs of this process
+    :type cache: ShapesGraphCache
+    :param request: A request, with the "shapes" text and "shapes_id" filled in by the daemon
+    :type request: dict
+    :returns: The response
+    :rtype: dict
+    """
+    sg = cache.get(request['shapes_id'], request['shapes'], request.get('shapes_format'))
+    want_report = bool(request.get('report', True))
+    want_fragment = bool(request.get('fragment', True))
+    data_graph = _load_text(request['data'], request.get('data_format') or DEFAULT_FORMAT)
+    validator = Validator(
+        data_graph,
+        shacl_graph=sg,
+        options={
+            'inference': request.get('inference', None),
+            'advanced': bool(request.get('advanced', False)),
+            'abort_on_first': bool(request.get('abort_on_first', False)),
+            'allow_warnings': bool(request.get('allow_warnings', False)),
+            'conformance_only': not want_fragment,
+            'fragment_only': want_fragment and not want_report,
+            'logger': log,
+        },
+    )
+    response = {'shapes_id': request['shapes_id']}
+    try:
+        conforms, report_graph, report_text, fragment = validator.run()
+    except ValidationFailure as e:
+        response['conforms'] = False
+        response['failure'] = str(e.message)
+        return response
+    response['conforms'] = conforms
+    if want_report:
+        report = report_graph.serialize(None, encoding='utf-8', format=request.get('report_format', 'turtle'))
+        response['report'] = report.decode('utf-8')
+        response['report_text'] = report_text
+    if want_fragment:
+        out = StringIO()
+        sink = NTriplesFragmentSink(out, capacity=0)
+        sink.add(fragment)
+        sink.close()
+        response['fragment'] = out.getvalue()
+    return response
+
+
+# The Shapes Graphs of a forked worker process of the daemon
+_WORKER_CACHE = None  # type: Optional[ShapesGraphCache]
+
+
+def _init_worker(cache_size: int):
+    global _WORKER_CACHE
+    _WORKER_CACHE = ShapesGraphCache(cache_size)
+
+
+def _validate_in_worker(request: Dict) -> Tuple[bool, Union[Dict, str]]:
+    return _answer(_WORKER_CACHE, request)
+
+
+def _answer(cache: ShapesGraphCache, request: Dict) -> Tuple[bool, Union[Dict, str]]:
+    # Exceptions are turned into messages, they may not survive being sent back from a worker
+    try:
+        return True, validate_request(cache, request)
+    except (ReportableRuntimeError, NotImplementedError) as e:
+        return False, str(e.args[0]) if e.args else repr(e)
+    except Exception as e:
+        return False, "Cannot validate the data graph: {!r}".format(e)
+
+
+class ValidationDaemon(object):
+    """
+    Answers validation requests, in a pool of forked worker processes or, with no workers, in this process.
+    Keeps the text of the most recently used Shapes Graphs by shapes_id, so requests can refer to them.
+    """
+
+    __slots__ = ('cache_size', 'workers', '_shapes', '_shapes_lock', '_pool', '_cache', '_cache_lock')
+
+    def __init__(self, workers: int = 0, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        :param workers: The number of worker processes, 0 to validate in this process
+        :type workers: int
+        :param cache_size: How many Shapes Graphs to keep, in each process
+        :type cache_size: int
+        """
+        # Done once, before the workers are forked, so they start with them done
+        apply_patches()
+        assign_baked_in()
+        if workers > 0 and fork_context() is None:
+            log.warning("Cannot validate in worker processes, this platform cannot fork processes.")
+            workers = 0
+        self.cache_size = cache_size
+        self.workers = workers
+        self._shapes: 'OrderedDict[str, Tuple[str, Optional[str]]]' = OrderedDict()
+        self._shapes_lock = threading.Lock()
+        self._pool = None
+        self._cache = None  # type: Optional[ShapesGraphCache]
+        # Runs keep their state on the Shapes Graph, so only one runs at a time in this process
+        self._cache_lock = threading.Lock()
+        if workers > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=fork_context(), initializer=_init_worker, initargs=(cache_size,)
+            )
+            # Forks the workers now, before the server starts its threads
+            self._pool.submit(int).result()
+        else:
+            self._cache = ShapesGraphCache(cache_size)
+
+    def close(self):
+        if self._pool is not None:
+            # Unlike a multiprocessing Pool, this does not hang when a worker was killed (eg, by a SIGTERM
+            # sent to the whole process group)
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _resolve_shapes(self, request: Dict) -> Dict:
+        shapes = request.get('shapes', None)
+        shapes_format = request.get('shapes_format') or DEFAULT_FORMAT
+        with self._shapes_lock:
+            if shapes is not None:
+                key = shapes_id(shapes, shapes_format)
+                self._shapes[key] = (shapes, shapes_format)
+            else:
+                key = request.get('shapes_id', None)
+                if key is None:
+                    raise BadRequest("A request needs the shapes of its Shapes Graph, or their shapes_id.")
+                try:
+                    shapes, shapes_format = self._shapes[key]
+                except KeyError:
+                    raise BadRequest("Unknown shapes_id {}, send the shapes instead.".format(key), status=404)
+            self._shapes.move_to_end(key)
+            if len(self._shapes) > self.cache_size:
+                self._shapes.popitem(last=False)
+        return dict(request, shapes=shapes, shapes_format=shapes_format, shapes_id=key)
+
+    def handle(self, request: Dict) -> Dict:
+        """
+        :param request: A validation request, see pyshacl.serve
+        :type request: dict
+        :returns: The response
+        :rtype: dict
+        :raises BadRequest: When the request cannot be validated
+        """
+        if not isinstance(request, dict) or not isinstance(request.get('data', None), str):
+            raise BadRequest("A request must be a JSON object, with the data graph as a string in \"data\".")
+        request = self._resolve_shapes(request)
+        if self._pool is None:
+            with self._cache_lock:
+                ok, response = _answer(self._cache, request)
+        else:
+            try:
+                ok, response = self._pool.submit(_validate_in_worker, request).result()
+            except BrokenProcessPool:
+                raise BadRequest("A worker process of the daemon has died, restart the daemon.", status=500)
+        if not ok:
+            raise BadRequest(response)
+        return response
+
+    def health(self) -> Dict:
+        with self._shapes_lock:
+            known = len(self._shapes)
+        return {'status': 'ok', 'workers': self.workers, 'shapes_graphs': known}
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    server_version = "pySHACL"
+
+    def do_GET(self):
+        if self.path != '/health':
+            return self._reply(404, {'error': "Not found, POST requests to /validate."})
+        self._reply(200, self.server.validation_daemon.health())
+
+    def do_POST(self):
+        if self.path != '/validate':
+            return self._reply(404, {'error': "Not found, POST requests to /validate."})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length > self.server.max_body:
+                raise BadRequest("The request is too large.", status=413)
+            try:
+                request = json.loads(self.rfile.read(length).decode('utf-8'))
+            except ValueError as e:
+                raise BadRequest("The request is not JSON: {}".format(e))
+            response = self.server.validation_daemon.handle(request)
+        except BadRequest as e:
+            return self._reply(e.status, {'error': e.message})
+        self._reply(200, response)
+
+    def _reply(self, status: int, body: Dict):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else "unix socket"
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+class ValidationHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, daemon: ValidationDaemon, max_body: int = DEFAULT_MAX_BODY):
+        self.validation_daemon = daemon
+        self.max_body = max_body
+        super(ValidationHTTPServer, self).__init__(address, ValidationRequestHandler)
+
+
+class ValidationUnixServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: ValidationDaemon, max_body: int = DEFAULT_MAX_BODY):
+        self.validation_daemon = daemon
+        self.max_body = max_body
+        super(ValidationUnixServer, self).__init__(socket_path, ValidationRequestHandler)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super(_UnixHTTPConnection, self).__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ValidationClient(object):
+    """
+    A client of a validation daemon, on a local TCP port or a Unix socket.
+    """
+
+    __slots__ = ('host', 'port', 'socket_path', 'timeout')
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = DEFAULT_PORT,
+        socket_path: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: Optional[Dict] = None) -> Tuple[int, Dict]:
+        if self.socket_path is not None:
+            connection = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        else:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            payload = None if body is None else json.dumps(body).encode('utf-8')
+            headers = {} if payload is None else {'Content-Type': 'application/json'}
+            connection.request(method, path, body=payload, headers=headers)
+            reply = connection.getresponse()
+            return reply.status, json.loads(reply.read().decode('utf-8'))
+        finally:
+            connection.close()
+
+    def validate(self, data: str, shapes: Optional[str] = None, shapes_id: Optional[str] = None, **options) -> Dict:
+        """
+        :param data: The data graph, as RDF text
+        :param shapes: The Shapes Graph, as RDF text
+        :param shapes_id: Instead of shapes, the shapes_id from the response to an earlier request
+        :param options: The other fields of the request, eg data_format="json-ld", fragment=False
+        :returns: The response
+        :rtype: dict
+        :raises ReportableRuntimeError: When the daemon cannot validate the request
+        """
+        request = dict(options, data=data)
+        if shapes is not None:
+            request['shapes'] = shapes
+        if shapes_id is not None:
+            request['shapes_id'] = shapes_id
+        status, response = self._request('POST', '/validate', request)
+        if status != 200:
+            raise ReportableRuntimeError("The validation daemon answered {}: {}".format(status, response['error']))
+        return response
+
+    def health(self) -> Dict:
+        return self._request('GET', '/health')[1]
+
+
+def make_server(
+    host: str = '127.0.0.1',
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+    workers: int = 0,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    max_body: int = DEFAULT_MAX_BODY,
+):
+    """
+    :returns: A server of a new ValidationDaemon, on the TCP port, or on the Unix socket when one is given.
+        Call serve_forever() on it, and server_close() then server.validation_daemon.close() when done.
+    """
+    daemon = ValidationDaemon(workers=workers, cache_size=cache_size)
+    try:
+        if socket_path is not None:
+            return ValidationUnixServer(socket_path, daemon, max_body=max_body)
+        return ValidationHTTPServer((host, port), daemon, max_body=max_body)
+    except BaseException:
+        daemon.close()
+        raise
+
+
+parser = argparse.ArgumentParser(
+    prog='pyshacl serve', description='Keep Shapes Graphs in memory, and validate data graphs sent over HTTP.'
+)
+parser.add_argument('--host', dest='host', default='127.0.0.1', help='The address to listen on. Default=127.0.0.1.')
+parser.add_argument(
+    '--port',
+    dest='port',
+    type=int,
+    default=DEFAULT_PORT,
+    help='The TCP port to listen on. Default={}.'.format(DEFAULT_PORT),
+)
+parser.add_argument('--socket', dest='socket_path', default=None, help='Listen on this Unix socket instead of a port.')
+parser.add_argument(
+    '--workers',
+    dest='workers',
+    type=int,
+    default=1,
+    help='Validate this many requests at a time, in worker processes. 0 validates in the daemon. Default=1.',
+)
+parser.add_argument(
+    '--cache-size',
+    dest='cache_size',
+    type=int,
+    default=DEFAULT_CACHE_SIZE,
+    help='How many Shapes Graphs to keep, parsed and compiled. Default={}.'.format(DEFAULT_CACHE_SIZE),
+)
+parser.add_argument(
+    '-d', '--debug', dest='debug', action='store_true', default=False, help='Output additional runtime messages.'
+)
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt()
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    server = make_server(
+        host=args.host, port=args.port, socket_path=args.socket_path, workers=args.workers, cache_size=args.cache_size
+    )
+    # Stop the same way on a SIGTERM as on a Ctrl-C, so the workers and the socket are cleaned up.
+    # Only set once the workers are forked, they are stopped with a SIGTERM.
+    signal.signal(signal.SIGTERM, _stop)
+    where = args.socket_path if args.socket_path is not None else "http://{}:{}".format(*server.server_address[:2])
+    sys.stderr.write("pySHACL validation daemon listening on {}\n".format(where))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.validation_daemon.close()
+        if args.socket_path is not None:
+            os.unlink(args.socket_path)
+
+
+if __name__ == "__main__":
+    main()
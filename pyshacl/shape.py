@@ -4,7 +4,8 @@ import logging
 import sys
 
 from decimal import Decimal
-from typing import TYPE_CHECKING, List, Optional, Set, Tuple, Type, Union
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple, Type, Union
 
 from rdflib import BNode, Literal, URIRef
 
@@ -22,7 +23,6 @@ from .consts import (
     SH_name,
     SH_order,
     SH_property,
-    SH_resultSeverity,
     SH_select,
     SH_severity,
     SH_SPARQLTarget,
@@ -34,12 +34,19 @@ from .consts import (
     SH_targetSubjectsOf,
     SH_Violation,
     SH_Warning,
-    SH_inversePath,
 )
 from .errors import ConstraintLoadError, ConstraintLoadWarning, ReportableRuntimeError, ShapeLoadError
 from .helper import get_query_helper_cls
-from .helper.expression_helper import value_nodes_from_path
+from .helper.path_helper import PATH_INVERSE, PATH_PREDICATE, PathEvaluator, compile_path
+from .profiler import (
+    COUNT_FOCUS_NODES,
+    COUNT_VALUE_NODES,
+    PHASE_CONSTRAINT_EVALUATE,
+    PHASE_NEIGHBORHOOD_MERGE,
+    PHASE_TARGET_DISCOVERY,
+)
 from .pytypes import GraphLike
+from .target_index import TargetIndex
 
 if TYPE_CHECKING:
     from pyshacl.constraints import ConstraintComponent
@@ -48,6 +55,42 @@ if TYPE_CHECKING:
 module = sys.modules[__name__]
 
 
+class ShapePlan(object):
+    """
+    The compiled form of a Shape, built once per Shapes Graph by Shape.compile_plan().
+
+    It holds the constraint component instances of the shape in the order their parameters were found,
+    the validators of the applicable SHACL-SPARQL/SHACL-JS custom constraint components, and the
+    parsed sh:path (None for a Node Shape). Shape.validate() only has to execute it.
+
+    When the only constraints of a Property Shape are sh:minCount and sh:maxCount, and its path is a predicate
+    or the inverse of one, count_path is that (predicate, forward) pair. In runs that do not extract the fragment,
+    the number of value nodes of each focus node is then read from the degrees of the TargetIndex, instead of
+    finding the value nodes.
+    """
+
+    __slots__ = ('constraints', 'custom_validators', 'path', 'has_forall_constraint', 'count_path')
+
+    def __init__(self, constraints, custom_validators, path, has_forall_constraint: bool, count_path=None):
+        """
+        :param constraints:
+        :type constraints: list[ConstraintComponent]
+        :param custom_validators:
+        :type custom_validators: list
+        :param path:
+        :type path: tuple | None
+        :param has_forall_constraint:
+        :type has_forall_constraint: bool
+        :param count_path:
+        :type count_path: tuple | None
+        """
+        self.constraints = tuple(constraints)
+        self.custom_validators = tuple(custom_validators)
+        self.path = path
+        self.has_forall_constraint = has_forall_constraint
+        self.count_path = count_path
+
+
 class Shape(object):
     __slots__ = (
         'logger',
@@ -329,41 +372,27 @@ class Shape(object):
             advanced_targets = self.advanced_target()
         else:
             advanced_targets = False
-        found_node_targets = {}
+        target_index = self.sg.target_index
+        if target_index is None or target_index.data_graph is not data_graph:
+            # Not during a validation run, or for another graph
+            target_index = TargetIndex(data_graph)
+        found_node_targets: Dict = {}
         # Just add _all_ target_nodes to the set,
         # they don't need to actually exist in the graph
         for target_node in target_nodes:
             found_node_targets[target_node] = set()
         target_classes = set(target_classes)
         target_classes.update(set(implicit_classes))
-        for tc in target_classes:
-            for instance in data_graph.subjects(RDF_type, tc):
-                if instance in found_node_targets:
-                    found_node_targets[instance].add((instance, RDF_type, tc))
-                else:
-                    found_node_targets[instance] = {(instance, RDF_type, tc)}
-            for subclass in data_graph.subjects(RDFS_subClassOf, tc):
-                if subclass == tc:
-                    continue
-                for instance in data_graph.subjects(RDF_type, subclass):
-                    if instance in found_node_targets:
-                        found_node_targets[instance].add((instance, RDF_type, subclass),
-                                                         (subclass, RDFS_subClassOf, tc))
-                    else:
-                        found_node_targets[instance] = {(instance, RDF_type, subclass),
-                                                        (subclass, RDFS_subClassOf, tc)}
-        for s_of in target_subjects_of:
-            for sub, obj in data_graph.subject_objects(s_of):
-                if sub in found_node_targets:
-                    found_node_targets[sub].add((sub, s_of, obj))
+        found = [target_index.class_instances(tc) for tc in target_classes]
+        found.extend(target_index.subjects_of(s_of) for s_of in target_subjects_of)
+        found.extend(target_index.objects_of(o_of) for o_of in target_objects_of)
+        for targets in found:
+            for node, witness in targets.items():
+                # The index is shared by all shapes, so copy its sets
+                if node in found_node_targets:
+                    found_node_targets[node].update(witness)
                 else:
-                    found_node_targets[sub] = {(sub, s_of, obj)}
-        for o_of in target_objects_of:
-            for sub, obj in data_graph.subject_objects(o_of):
-                if obj in found_node_targets:
-                    found_node_targets[obj].add((sub, o_of, obj))
-                else:
-                    found_node_targets[obj] = {(sub, o_of, obj)}
+                    found_node_targets[node] = set(witness)
         if advanced_targets:
             for at_node, at in advanced_targets.items():
                 if at['type'] == SH_SPARQLTarget:
@@ -374,134 +403,51 @@ class Shape(object):
                         continue
                     for r in results:
                         t = r['this']
-                        found_node_targets.add(t)
+                        found_node_targets.setdefault(t, set())
                 elif at['type'] in (SH_JSTarget, SH_JSTargetType):
                     results = at['targeter'].find_targets(data_graph)
                     for r in results:
-                        found_node_targets.add(r)
+                        found_node_targets.setdefault(r, set())
                 else:
                     results = at['qt'].find_targets(data_graph)
                     if not results or len(results.bindings) < 1:
                         continue
                     for r in results:
                         t = r['this']
-                        found_node_targets.add(t)
+                        found_node_targets.setdefault(t, set())
         return found_node_targets
 
+    def target_patterns(self, target_index: TargetIndex) -> Optional[Set[Tuple]]:
+        """
+        The triple patterns of the data graph that select the focus nodes of this shape. Adding or removing a
+        triple that matches none of them cannot change the focus nodes, see pyshacl.incremental.
+        :param target_index: The index the focus nodes were resolved with
+        :type target_index: TargetIndex
+        :returns: A set of (s, p, o) patterns, with None as a wildcard. None if the shape has SPARQL-based or
+            JS-based targets, those can depend on any triple.
+        :rtype: set | None
+        """
+        if self._advanced and self.advanced_target():
+            return None
+        (_, target_classes, implicit_classes, target_objects_of, target_subjects_of) = self.target()
+        patterns = set()
+        for tc in chain(target_classes, implicit_classes):
+            patterns.add((None, RDFS_subClassOf, None))
+            patterns.update((None, RDF_type, subclass) for subclass in target_index.subclasses(tc))
+        for p in chain(target_objects_of, target_subjects_of):
+            patterns.add((None, p, None))
+        return patterns
+
     @classmethod
     def value_nodes_from_path(cls, sg, focus, path_val, target_graph, recursion=0):
+        """
+        :returns: The set of nodes reachable from focus on the given path, and for each reachable node,
+            the set of triples on the paths from focus to that node.
+        :rtype: (set, dict)
+        """
         # Link: https://www.w3.org/TR/shacl/#property-paths
-        if isinstance(path_val, URIRef):
-            # replaced by following if:
-            # set of reachable nodes
-            reachable_nodes = set(target_graph.objects(focus, path_val))
-            # for each reachable node, a triple
-            paths = {reachable: [(focus, path_val, reachable)] for reachable in reachable_nodes}
-            return reachable_nodes, paths
-        elif isinstance(path_val, Literal):
-            raise ReportableRuntimeError("Values of a property path cannot be a Literal.")
-
-        # At this point, path_val _must_ be a BNode
-
-        find_inverse = set(sg.graph.objects(path_val, SH_inversePath))
-        if len(find_inverse) > 0:
-            inverse_path = next(iter(find_inverse))
-            reachable_nodes = set(target_graph.subjects(inverse_path, focus))
-            return reachable_nodes, {reachable: [(reachable, inverse_path, focus)] for reachable in reachable_nodes}
-
-        # returning paths is so far only implemented for simple paths and their inverses
-        raise NotImplementedError("Returning paths is so far only implemented for simple paths and their inverses")
-
-        # TODO, the path_val BNode must be value of exactly one sh:path subject in the SG.
-        if recursion >= 10:
-            raise ReportableRuntimeError("Path traversal depth is too much!")
-        find_list = set(sg.graph.objects(path_val, RDF.first))
-        if len(find_list) > 0:
-            first_node = next(iter(find_list))
-            rest_nodes = set(sg.graph.objects(path_val, RDF.rest))
-            go_deeper = True
-            if len(rest_nodes) < 1:
-                if recursion == 0:
-                    raise ReportableRuntimeError("A list of SHACL Paths must contain at least two path items.")
-                else:
-                    go_deeper = False
-            rest_node = next(iter(rest_nodes))
-            if rest_node == RDF.nil:
-                if recursion == 0:
-                    raise ReportableRuntimeError("A list of SHACL Paths must contain at least two path items.")
-                else:
-                    go_deeper = False
-            this_level_nodes = cls.value_nodes_from_path(sg, focus, first_node, target_graph, recursion=recursion + 1)
-            if not go_deeper:
-                return this_level_nodes
-            found_value_nodes = set()
-            for tln in iter(this_level_nodes):
-                value_nodes = cls.value_nodes_from_path(sg, tln, rest_node, target_graph, recursion=recursion + 1)
-                found_value_nodes.update(value_nodes)
-            return found_value_nodes
-
-        find_alternatives = set(sg.graph.objects(path_val, SH_alternativePath))
-        if len(find_alternatives) > 0:
-            alternatives_list = next(iter(find_alternatives))
-            all_collected = set()
-            visited_alternatives = 0
-            for a in sg.graph.items(alternatives_list):
-                found_nodes = cls.value_nodes_from_path(sg, focus, a, target_graph, recursion=recursion + 1)
-                visited_alternatives += 1
-                all_collected.update(found_nodes)
-            if visited_alternatives < 2:
-                raise ReportableRuntimeError("List of SHACL alternate paths must have at least two path items.")
-            return all_collected
-
-        find_zero_or_more = set(sg.graph.objects(path_val, SH_zeroOrMorePath))
-        if len(find_zero_or_more) > 0:
-            zm_path = next(iter(find_zero_or_more))
-            collection_set = set()
-            # Note, the zero-or-more path always includes the current subject too!
-            collection_set.add(focus)
-            found_nodes = cls.value_nodes_from_path(sg, focus, zm_path, target_graph, recursion=recursion + 1)
-            search_deeper_nodes = set(iter(found_nodes))
-            while len(search_deeper_nodes) > 0:
-                current_node = search_deeper_nodes.pop()
-                if current_node in collection_set:
-                    continue
-                collection_set.add(current_node)
-                found_more_nodes = cls.value_nodes_from_path(
-                    sg, current_node, zm_path, target_graph, recursion=recursion + 1
-                )
-                search_deeper_nodes.update(found_more_nodes)
-            return collection_set
-
-        find_one_or_more = set(sg.graph.objects(path_val, SH_oneOrMorePath))
-        if len(find_one_or_more) > 0:
-            one_or_more_path = next(iter(find_one_or_more))
-            collection_set = set()
-            found_nodes = cls.value_nodes_from_path(sg, focus, one_or_more_path, target_graph, recursion=recursion + 1)
-            # Note, the one-or-more path should _not_ include the current focus
-            search_deeper_nodes = set(iter(found_nodes))
-            while len(search_deeper_nodes) > 0:
-                current_node = search_deeper_nodes.pop()
-                if current_node in collection_set:
-                    continue
-                collection_set.add(current_node)
-                found_more_nodes = cls.value_nodes_from_path(
-                    sg, current_node, one_or_more_path, target_graph, recursion=recursion + 1
-                )
-                search_deeper_nodes.update(found_more_nodes)
-            return collection_set
-
-        find_zero_or_one = set(sg.graph.objects(path_val, SH_zeroOrOnePath))
-        if len(find_zero_or_one) > 0:
-            zero_or_one_path = next(iter(find_zero_or_one))
-            collection_set = set()
-            # Note, the zero-or-one path always includes the current subject too!
-            collection_set.add(focus)
-            found_nodes = cls.value_nodes_from_path(sg, focus, zero_or_one_path, target_graph, recursion=recursion + 1)
-            collection_set.update(found_nodes)
-            return collection_set
-
-        raise NotImplementedError("That path method to get value nodes of property shapes is not yet implemented.")
-
+        paths = PathEvaluator(sg, target_graph).value_nodes(focus, path_val)
+        return set(paths.keys()), paths
 
     def value_nodes(self, target_graph, focus):
         """
@@ -512,23 +458,33 @@ class Shape(object):
         :param focus:
         :return:
         """
+        if not self.is_property_shape:
+            return self._value_nodes_from_expression(target_graph, focus, None)
+        return self._value_nodes_from_expression(target_graph, focus, compile_path(self.sg, self.path()))
+
+    def _value_nodes_from_expression(self, target_graph, focus, path_expression):
         if not isinstance(focus, (tuple, list, set, dict)):
             focus = [focus]
-        if not self.is_property_shape:
+        if path_expression is None:
             return {f: {f: set()} for f in focus}
-        path_val = self.path()
-        focus_dict = {}
-        paths_dict = {}
-        for f in focus:
-            reachable_nodes, paths = self.value_nodes_from_path(self.sg, f, path_val, target_graph)
-            focus_dict[f] = reachable_nodes
-            # value_nodes_from_paths returns for each reachable node a list of triples that form the path the
-            # node is reached on. In the remainder of the code however, a set of triples on those paths is expected
-            # So next lines group those lists into sets:
-            paths_dict[f] = {reachable: set() for reachable in reachable_nodes}
-            for reachable in reachable_nodes:
-                paths_dict[f][reachable].update({triple for triple in paths[reachable]})
-        return paths_dict
+        # One evaluator for all focus nodes, so they share the evaluation of common intermediate nodes
+        if not self.sg.extract_fragment:
+            evaluator = PathEvaluator(self.sg, target_graph, witnesses=False)
+        else:
+            evaluator = PathEvaluator(self.sg, target_graph)
+        path_cache = self.sg.path_cache
+        if path_cache is None:
+            evaluate = evaluator.evaluate
+        else:
+            # Other shapes with the same path may have walked it from these focus nodes already
+            profiler = self.sg.profiler
+
+            def evaluate(f, expression):
+                return path_cache.evaluate(evaluator, f, expression, profiler)
+
+        # When extracting fragments, evaluate returns for each reachable node the frozenset of triples on the
+        # paths that node is reached on. Those can be shared with other focus nodes, nothing adds to them.
+        return {f: dict(evaluate(f, path_expression)) for f in focus}
 
     def find_custom_constraints(self):
         applicable_custom_constraints = set()
@@ -545,6 +501,73 @@ class Shape(object):
                 applicable_custom_constraints.add(c)
         return applicable_custom_constraints
 
+    def compile_plan(self) -> 'ShapePlan':
+        """
+        Resolve the parts of this shape's validation that only depend on the Shapes Graph.
+        Use ShapesGraph.shape_plan() to get the (cached) plan of a shape, rather than calling this directly.
+        :rtype: ShapePlan
+        """
+        # Lazy import here to avoid an import loop
+        CONSTRAINT_PARAMETERS, PARAMETER_MAP = getattr(module, 'CONSTRAINT_PARAMS', (None, None))
+        if not CONSTRAINT_PARAMETERS:
+            from .constraints import ALL_CONSTRAINT_PARAMETERS, CONSTRAINT_PARAMETERS_MAP
+
+            setattr(module, 'CONSTRAINT_PARAMS', (ALL_CONSTRAINT_PARAMETERS, CONSTRAINT_PARAMETERS_MAP))
+            CONSTRAINT_PARAMETERS = ALL_CONSTRAINT_PARAMETERS
+            PARAMETER_MAP = CONSTRAINT_PARAMETERS_MAP
+        if self.sg.js_enabled or self._advanced:
+            search_parameters = CONSTRAINT_PARAMETERS.copy()
+            constraint_map = PARAMETER_MAP.copy()
+            if self._advanced:
+                from pyshacl.constraints.advanced import ExpressionConstraint, SH_expression
+
+                search_parameters.append(SH_expression)
+                constraint_map[SH_expression] = ExpressionConstraint
+            if self.sg.js_enabled:
+                from pyshacl.extras.js.constraint import JSConstraint, SH_js
+
+                search_parameters.append(SH_js)
+                constraint_map[SH_js] = JSConstraint
+        else:
+            search_parameters = CONSTRAINT_PARAMETERS
+            constraint_map = PARAMETER_MAP
+        path_expression = compile_path(self.sg, self.path()) if self.is_property_shape else None
+        parameters = (p for p, v in self.sg.predicate_objects(self.node) if p in search_parameters)
+        constraints = []
+        done_constraints = set()
+        has_forall_constraint = False
+        for constraint_component in [constraint_map[p] for p in iter(parameters)]:  # type: Type[ConstraintComponent]
+            if constraint_component in done_constraints:
+                continue
+            done_constraints.add(constraint_component)
+            try:
+                c = constraint_component(self)
+            except ConstraintLoadWarning as w:
+                self.logger.warning(repr(w))
+                continue
+            except ConstraintLoadError as e:
+                self.logger.error(repr(e))
+                raise e
+            # keep flag for case where there is at least one "for all" constraint (see end of validate())
+            if not type(c).__name__ in {"QualifiedValueShapeConstraintComponent", "HasValueConstraintComponent"}:
+                has_forall_constraint = True
+            constraints.append(c)
+        custom_validators = [a.make_validator_for_shape(self) for a in self.find_custom_constraints()]
+        count_path = None
+        if path_expression is not None and constraints and not custom_validators:
+            from .constraints.core.cardinality_constraints import (
+                MaxCountConstraintComponent,
+                MinCountConstraintComponent,
+            )
+
+            if all(isinstance(c, (MinCountConstraintComponent, MaxCountConstraintComponent)) for c in constraints):
+                kind, _, arg = path_expression
+                if kind == PATH_PREDICATE:
+                    count_path = (arg, True)
+                elif kind == PATH_INVERSE and arg[0] == PATH_PREDICATE:
+                    count_path = (arg[2], False)
+        return ShapePlan(constraints, custom_validators, path_expression, has_forall_constraint, count_path)
+
     def validate(
         self,
         target_graph: GraphLike,
@@ -553,6 +576,7 @@ class Shape(object):
                 Tuple[Union[URIRef, BNode]],
                 List[Union[URIRef, BNode]],
                 Set[Union[URIRef, BNode]],
+                Dict[Union[URIRef, BNode], Set],
                 Union[URIRef, BNode],
             ]
         ] = None,
@@ -563,51 +587,158 @@ class Shape(object):
         subgraphs = {}
         if self.deactivated:
             return True, [], {}
-        if focus is not None:
+        # A dict of focus nodes is taken to be (part of) the output of focus_nodes(), for example a shard of it.
+        # The triples each target focus node was found by are part of its neighborhood.
+        explicit_focus = focus is not None and not isinstance(focus, dict)
+        if explicit_focus:
             if not isinstance(focus, (tuple, list, set)):
                 focus = [focus]
             subgraphs = {fn: set() for fn in focus}
         else:
-            focus = self.focus_nodes(target_graph)
-            subgraphs = focus
+            if focus is None:
+                profiler = self.sg.profiler
+                if profiler is None:
+                    focus = self.focus_nodes(target_graph)
+                else:
+                    with profiler.phase(PHASE_TARGET_DISCOVERY, str(self.node)):
+                        focus = self.focus_nodes(target_graph)
+                    profiler.count(COUNT_FOCUS_NODES, len(focus))
+            if not self.sg.extract_fragment:
+                subgraphs = {fn: set() for fn in focus}
+            else:
+                subgraphs = {fn: set(triples) for fn, triples in focus.items()}
         if len(focus) < 1:
             # Its possible for shapes to have _no_ focus nodes
             # (they are called in other ways)
             return True, [], {}
 
+        # Nested shape-expecting constraints validate value nodes one at a time (or in batches, see
+        # validate_each), those evaluations are shared across the whole validation run.
+        memo = self.sg.memo
+        if memo is not None and explicit_focus and len(focus) == 1 and not (abort_on_first or allow_warnings):
+            memo_focus = next(iter(focus))
+            # In incremental mode, the reads of a memoized evaluation are also reads of each evaluation reusing it
+            recorder = self.sg.read_recorder
+            memoized = memo.lookup(self.node, memo_focus)
+            if memoized is not None:
+                if recorder is not None:
+                    recorder.replay(self.node, memo_focus)
+                return memoized
+            recursion_events = memo.recursion_events
+            if recorder is not None:
+                recorder.begin()
+            conforms, reports, subgraphs = self._validate_plan(target_graph, focus, subgraphs, _evaluation_path)
+            reads = recorder.end() if recorder is not None else None
+            if memo.recursion_events == recursion_events:
+                memo.store(self.node, memo_focus, conforms, reports, subgraphs)
+                if recorder is not None:
+                    recorder.remember(self.node, memo_focus, reads)
+            return conforms, reports, subgraphs
+        return self._validate_plan(
+            target_graph,
+            focus,
+            subgraphs,
+            _evaluation_path,
+            abort_on_first=abort_on_first,
+            allow_warnings=allow_warnings,
+        )
+
+    def validate_each(self, target_graph: GraphLike, focus_nodes, _evaluation_path: Optional[List] = None):
+        """
+        Validate a collection of nodes against this shape in one pass, but get the result of each node separately.
+        This is what shape-expecting constraint components (sh:node, sh:property, sh:and, etc) use to validate
+        all of their value nodes at once, rather than calling validate() once per value node.
+
+        The nodes are evaluated together; nodes that the batch shows to conform get their own neighborhood
+        from it. Nodes that may not conform are evaluated again on their own, so that they get exactly
+        the conformance and validation results that a call to validate() with only that node would give.
+        :param target_graph:
+        :type target_graph: rdflib.Graph
+        :param focus_nodes:
+        :type focus_nodes: Iterable[URIRef | BNode | Literal]
+        :param _evaluation_path:
+        :type _evaluation_path: list | None
+        :returns: A dict of each distinct node to its (conforms, reports, neighborhood) tuple
+        :rtype: dict
+        """
+        if _evaluation_path is None:
+            _evaluation_path = []
+        focus_nodes = set(focus_nodes)
+        if self.deactivated:
+            return {fn: (True, [], set()) for fn in focus_nodes}
+        results = {}
+        memo = self.sg.memo
+        recorder = self.sg.read_recorder
+        pending = []
+        for fn in focus_nodes:
+            memoized = memo.lookup(self.node, fn) if memo is not None else None
+            if memoized is None:
+                pending.append(fn)
+            else:
+                if recorder is not None:
+                    recorder.replay(self.node, fn)
+                conforms, reports, subgraphs = memoized
+                results[fn] = (conforms, reports, subgraphs.get(fn, set()))
+        if len(pending) < 1:
+            return results
+        recursion_events = memo.recursion_events if memo is not None else 0
+        if recorder is not None:
+            # The reads of the batch are taken to be reads of each node in it
+            recorder.begin()
+        conforms, reports, subgraphs = self._validate_plan(
+            target_graph, pending, {fn: set() for fn in pending}, _evaluation_path[:]
+        )
+        if conforms or len(pending) == 1:
+            exact = {fn: (conforms, reports if len(pending) == 1 else [], subgraphs) for fn in pending}
+        else:
+            # A node that conforms is still in the neighborhoods, and no validation result is about it.
+            reported = {r.focus_node for r in reports}
+            exact = {}
+            for fn in pending:
+                if fn in subgraphs and fn not in reported:
+                    exact[fn] = (True, [], {fn: subgraphs[fn]})
+                else:
+                    exact[fn] = self._validate_plan(target_graph, [fn], {fn: set()}, _evaluation_path[:])
+        reads = recorder.end() if recorder is not None else None
+        store = memo is not None and memo.recursion_events == recursion_events
+        for fn, (fn_conforms, fn_reports, fn_subgraphs) in exact.items():
+            fn_subgraphs = {fn: fn_subgraphs[fn]} if fn in fn_subgraphs else {}
+            if store:
+                memo.store(self.node, fn, fn_conforms, fn_reports, fn_subgraphs)
+                if recorder is not None:
+                    recorder.remember(self.node, fn, reads)
+            results[fn] = (fn_conforms, fn_reports, fn_subgraphs.get(fn, set()))
+        return results
+
+    def _validate_plan(
+        self,
+        target_graph: GraphLike,
+        focus,
+        subgraphs,
+        _evaluation_path: Optional[List],
+        abort_on_first: Optional[bool] = False,
+        allow_warnings: Optional[bool] = False,
+    ):
         if _evaluation_path is None:
             _evaluation_path = []
         elif len(_evaluation_path) >= 30:
             # 27 is the depth required to successfully do the meta-shacl test on shacl.ttl
             path_str = "->".join((str(e) for e in _evaluation_path))
             raise ReportableRuntimeError("Evaluation path too deep!\n{}".format(path_str))
-        # Lazy import here to avoid an import loop
-        CONSTRAINT_PARAMETERS, PARAMETER_MAP = getattr(module, 'CONSTRAINT_PARAMS', (None, None))
-        if not CONSTRAINT_PARAMETERS:
-            from .constraints import ALL_CONSTRAINT_PARAMETERS, CONSTRAINT_PARAMETERS_MAP
-
-            setattr(module, 'CONSTRAINT_PARAMS', (ALL_CONSTRAINT_PARAMETERS, CONSTRAINT_PARAMETERS_MAP))
-            CONSTRAINT_PARAMETERS = ALL_CONSTRAINT_PARAMETERS
-            PARAMETER_MAP = CONSTRAINT_PARAMETERS_MAP
-        if self.sg.js_enabled or self._advanced:
-            search_parameters = CONSTRAINT_PARAMETERS.copy()
-            constraint_map = PARAMETER_MAP.copy()
-            if self._advanced:
-                from pyshacl.constraints.advanced import ExpressionConstraint, SH_expression
-
-                search_parameters.append(SH_expression)
-                constraint_map[SH_expression] = ExpressionConstraint
-            if self.sg.js_enabled:
-                from pyshacl.extras.js.constraint import JSConstraint, SH_js
-
-                search_parameters.append(SH_js)
-                constraint_map[SH_js] = JSConstraint
-        else:
-            search_parameters = CONSTRAINT_PARAMETERS
-            constraint_map = PARAMETER_MAP
-        parameters = (p for p, v in self.sg.predicate_objects(self.node) if p in search_parameters)
+        plan = self.sg.shape_plan(self)
+        profiler = self.sg.profiler
+        # Without fragment extraction, only which focus nodes conform is kept track of
+        merge_neighborhoods = self._merge_neighborhoods if self.sg.extract_fragment else self._prune_neighborhoods
         reports = []
-        focus_value_nodes = self.value_nodes(target_graph, focus)
+        focus_counts = self._value_node_counts(target_graph, focus, plan)
+        if focus_counts is None:
+            focus_value_nodes = self._value_nodes_from_expression(target_graph, focus, plan.path)
+            if profiler is not None:
+                profiler.count(COUNT_VALUE_NODES, sum(len(v) for v in focus_value_nodes.values()))
+        else:
+            focus_value_nodes = None
+            if profiler is not None:
+                profiler.count(COUNT_VALUE_NODES, sum(focus_counts.values()))
         filter_reports: bool = False
         allow_conform: bool = False
         if allow_warnings:
@@ -617,69 +748,45 @@ class Shape(object):
                 filter_reports = True
 
         non_conformant = False
-        done_constraints = set()
-        has_forall_constraint = False
         run_count = 0
         _evaluation_path.append(self)
-        # print(_evaluation_path)
-        constraint_components = [constraint_map[p] for p in iter(parameters)]
-        for constraint_component in constraint_components:  # type: Type[ConstraintComponent]
-            if constraint_component in done_constraints:
-                continue
-            try:
-                c = constraint_component(self)
-            except ConstraintLoadWarning as w:
-                self.logger.warning(repr(w))
-                continue
-            except ConstraintLoadError as e:
-                self.logger.error(repr(e))
-                raise e
+        for c in plan.constraints:
             _e_p = _evaluation_path[:]
             _e_p.append(c)
-
-            # keep flag for case where there is at least one "for all" constraint (see end of this function)
-            if not type(c).__name__ in {"QualifiedValueShapeConstraintComponent", "HasValueConstraintComponent"}:
-                has_forall_constraint = True
-
-            _is_conform, _r, _subgraphs = c.evaluate(target_graph, focus_value_nodes, _e_p)
-            # _subgraphs will have a key for each focus node that satisfies c
-            # so if a focus node is not present, it should be removed from the shape's subgraphs
-            # if a focus node is present, c's neighborhood (_subgraphs[fn]) should
-            # be added to the shape's neighborhood (subgraphs[fn])
-            to_delete = set()
-            for fn in subgraphs:
-                if fn not in _subgraphs:
-                    to_delete.add(fn)
-                else:
-                    subgraphs[fn].update(_subgraphs[fn])
-            for fn in to_delete:
-                subgraphs.pop(fn)
+            if focus_counts is None:
+                evaluate, values = c.evaluate, focus_value_nodes
+            else:
+                evaluate, values = c.evaluate_counts, focus_counts
+            if profiler is None:
+                _is_conform, _r, _subgraphs = evaluate(target_graph, values, _e_p)
+                merge_neighborhoods(subgraphs, _subgraphs)
+            else:
+                with profiler.phase(PHASE_CONSTRAINT_EVALUATE, c.constraint_name()):
+                    _is_conform, _r, _subgraphs = evaluate(target_graph, values, _e_p)
+                with profiler.phase(PHASE_NEIGHBORHOOD_MERGE):
+                    merge_neighborhoods(subgraphs, _subgraphs)
             non_conformant = non_conformant or (not _is_conform)
             if _is_conform or allow_conform:
                 ...
             elif filter_reports:
-                all_warn = True
-                for _r_inner in _r:
-                    v_str, v_node, v_parts = _r_inner
-                    severity_bits = list(filter(lambda p: p[0] == v_node and p[1] == SH_resultSeverity, v_parts))
-                    if severity_bits:
-                        all_warn = all_warn and severity_bits[0][2] in (SH_Warning, SH_Info)
+                all_warn = all(r.severity in (SH_Warning, SH_Info) for r in _r)
                 non_conformant = not all_warn
             else:
                 non_conformant = non_conformant or (not _is_conform)
             reports.extend(_r)
             run_count += 1
-            done_constraints.add(constraint_component)
             if non_conformant and abort_on_first:
                 break
-        applicable_custom_constraints = self.find_custom_constraints()
-        for a in applicable_custom_constraints:
+        for validator in plan.custom_validators:
             if non_conformant and abort_on_first:
                 break
             _e_p = _evaluation_path[:]
-            validator = a.make_validator_for_shape(self)
             _e_p.append(validator)
-            _is_conform, _r = validator.evaluate(target_graph, focus_value_nodes, _e_p)
+            if profiler is None:
+                _is_conform, _r = validator.evaluate(target_graph, focus_value_nodes, _e_p)
+            else:
+                with profiler.phase(PHASE_CONSTRAINT_EVALUATE, validator.constraint_name()):
+                    _is_conform, _r = validator.evaluate(target_graph, focus_value_nodes, _e_p)
             non_conformant = non_conformant or (not _is_conform)
             reports.extend(_r)
             run_count += 1
@@ -691,8 +798,55 @@ class Shape(object):
         # (this is different than if there are only qualified value constraints:
         # in that case, only paths starting in the focus node, matching sh:path, and ending in a correct
         # value node belong in the focus node's neighborhood, and this is done in c.evaluate())
-        if has_forall_constraint:
-            for fn in subgraphs:
-                for vn in focus_value_nodes[fn]:
-                    subgraphs[fn].update({triple for triple in focus_value_nodes[fn][vn]})
+        if plan.has_forall_constraint and self.sg.extract_fragment:
+            if profiler is None:
+                self._merge_path_neighborhoods(subgraphs, focus_value_nodes)
+            else:
+                with profiler.phase(PHASE_NEIGHBORHOOD_MERGE):
+                    self._merge_path_neighborhoods(subgraphs, focus_value_nodes)
         return (not non_conformant), reports, subgraphs
+
+    def _value_node_counts(self, target_graph: GraphLike, focus, plan: ShapePlan) -> Optional[Dict]:
+        """
+        :returns: The number of value nodes of each focus node, when the plan can be checked from them alone,
+            and the degrees of the TargetIndex are of target_graph. Otherwise None.
+        :rtype: dict | None
+        """
+        if plan.count_path is None or self.sg.extract_fragment:
+            # The neighborhoods of the conforming focus nodes need their value nodes anyway, and finding the
+            # value nodes of every focus node costs less than counting the degrees of the whole predicate too
+            return None
+        target_index = self.sg.target_index
+        if target_index is None or target_index.data_graph is not target_graph:
+            # Not during a validation run, or for another graph, like the recording graph of an incremental run
+            return None
+        predicate, forward = plan.count_path
+        degrees = target_index.degrees(predicate, forward)
+        return {f: degrees.get(f, 0) for f in focus}
+
+    @staticmethod
+    def _merge_neighborhoods(subgraphs, constraint_subgraphs):
+        # constraint_subgraphs will have a key for each focus node that satisfies the constraint
+        # so if a focus node is not present, it should be removed from the shape's subgraphs
+        # if a focus node is present, the constraint's neighborhood (constraint_subgraphs[fn]) should
+        # be added to the shape's neighborhood (subgraphs[fn])
+        to_delete = set()
+        for fn in subgraphs:
+            if fn not in constraint_subgraphs:
+                to_delete.add(fn)
+            else:
+                subgraphs[fn].update(constraint_subgraphs[fn])
+        for fn in to_delete:
+            subgraphs.pop(fn)
+
+    @staticmethod
+    def _prune_neighborhoods(subgraphs, constraint_subgraphs):
+        # Like _merge_neighborhoods, but the neighborhoods are not added to
+        to_delete = [fn for fn in subgraphs if fn not in constraint_subgraphs]
+        for fn in to_delete:
+            subgraphs.pop(fn)
+
+    @staticmethod
+    def _merge_path_neighborhoods(subgraphs, focus_value_nodes):
+        for fn in subgraphs:
+            subgraphs[fn].update(*focus_value_nodes[fn].values())
@@ -2,6 +2,8 @@
 import logging
 import warnings
 
+from typing import TYPE_CHECKING, Optional
+
 import rdflib
 
 from .constraints.constraint_component import CustomConstraintComponentFactory
@@ -27,7 +29,19 @@ from .consts import (
     SH_targetSubjectsOf,
 )
 from .errors import ShapeLoadError
-from .shape import Shape
+from .shape import Shape, ShapePlan
+
+
+if TYPE_CHECKING:
+    from .extras.js.context import SHACLJSContextPool
+    from .frozen_graph import FrozenGraph
+    from .incremental import ReadRecorder
+    from .memo import ShapeMemo
+    from .path_cache import PathCache
+    from .pattern_cache import PatternCache
+    from .profiler import Profiler
+    from .target_index import TargetIndex
+    from .typed_literals import TypedLiteralCache
 
 
 class ShapesGraph(object):
@@ -53,12 +67,38 @@ class ShapesGraph(object):
         self._custom_constraints = None
         self._shacl_functions = {}
         self._shacl_target_types = {}
+        self._shape_plans = {}
         self._use_js = False
+        # Run-scoped memo of nested shape evaluations, owned by Validator.run()
+        self.memo: Optional['ShapeMemo'] = None
+        # Run-scoped instrumentation, only set when the run is profiled
+        self.profiler: Optional['Profiler'] = None
+        # Run-scoped index of the targets in the data graph being validated, see Validator.run()
+        self.target_index: Optional['TargetIndex'] = None
+        # Run-scoped read-only snapshot of the data graph being validated, only set with the freeze option
+        self.frozen_graph: Optional['FrozenGraph'] = None
+        # Run-scoped cache of the property paths walked from each focus node, shared by all shapes
+        self.path_cache: Optional['PathCache'] = None
+        # Run-scoped cache of sh:pattern matches, shared by all shapes
+        self.pattern_cache: Optional['PatternCache'] = None
+        # Run-scoped cache of the decoded values of numeric and date/time literals, for the value range constraints
+        self.typed_literals: Optional['TypedLiteralCache'] = None
+        # Run-scoped pool of SHACL-JS contexts, only set when JS is enabled
+        self.js_contexts: Optional['SHACLJSContextPool'] = None
+        # How many focus nodes to bind at once in the queries of SPARQL-based constraints, see Validator.run()
+        self.sparql_batch_size: Optional[int] = None
+        # Run-scoped recorder of the triple patterns read from the data graph, only set in incremental mode
+        self.read_recorder: Optional['ReadRecorder'] = None
+        # Whether neighborhoods are built, off in conformance-only runs, see Validator.run()
+        self.extract_fragment = True
         self._add_system_triples()
 
     def enable_js(self):
         self._use_js = True
 
+    def disable_js(self):
+        self._use_js = False
+
     @property
     def js_enabled(self):
         return bool(self._use_js)
@@ -145,6 +185,12 @@ class ShapesGraph(object):
         else:
             self._shacl_target_types[uri] = tt
 
+    def remove_shacl_target_type(self, uri):
+        self._shacl_target_types.pop(str(uri), None)
+
+    def has_shacl_target_type(self, uri):
+        return str(uri) in self._shacl_target_types
+
     def get_shacl_target_type(self, uri):
         uri = str(uri)
         try:
@@ -168,6 +214,23 @@ class ShapesGraph(object):
         # This will throw a KeyError if it is not found. This is intentionally not caught here.
         return self._node_shape_cache[node]
 
+    def shape_plan(self, shape: Shape) -> ShapePlan:
+        """
+        Get the compiled plan of a shape, compiling it the first time it is asked for.
+        Compilation is deferred to the first validation of a shape, so constraints on shapes that are never
+        evaluated cannot fail the run. The plan depends on advanced mode and SHACL-JS being enabled,
+        so those are part of the key.
+        :param shape:
+        :type shape: Shape
+        :rtype: ShapePlan
+        """
+        key = (shape.node, shape.is_property_shape, shape._advanced, self.js_enabled)
+        try:
+            return self._shape_plans[key]
+        except KeyError:
+            plan = self._shape_plans[key] = shape.compile_plan()
+            return plan
+
     """
     A shape is an IRI or blank node s that fulfills at least one of the following conditions in the shapes graph:
 
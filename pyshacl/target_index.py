@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+#
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Set
+
+from .consts import RDF_type, RDFS_subClassOf
+from .helper.path_helper import PATH_INVERSE, PATH_PREDICATE, PATH_ZERO_OR_MORE, PathEvaluator
+
+
+if TYPE_CHECKING:
+    from .frozen_graph import FrozenGraph
+    from .pytypes import GraphLike
+
+
+# The path ^rdfs:subClassOf*, from a class to each of its SHACL subclasses (including itself)
+_SUBCLASSES_PATH = (
+    PATH_ZERO_OR_MORE,
+    'subclasses',
+    (PATH_INVERSE, 'superclasses', (PATH_PREDICATE, RDFS_subClassOf, RDFS_subClassOf)),
+)
+# The path rdfs:subClassOf*, from a class to each of its SHACL superclasses (including itself)
+SUPERCLASSES_PATH = (PATH_ZERO_OR_MORE, 'superclass closure', (PATH_PREDICATE, RDFS_subClassOf, RDFS_subClassOf))
+
+
+class TargetIndex(object):
+    """
+    Run-scoped index of the data graph, shared by all shapes to resolve their targets.
+
+    The rdf:type triples of the data graph are scanned once, into a map of each class to its instances.
+    The instances of a class, for sh:targetClass and implicit class targets, are those of the class and of all
+    of its transitive SHACL subclasses, each with its witness triples: the rdf:type triple, and every
+    rdfs:subClassOf triple on a chain from the instance's class up to the target class.
+    The transitive superclasses of a class, for sh:class, are walked once per class, with the same chains.
+    The subjects and objects of a predicate, for sh:targetSubjectsOf and sh:targetObjectsOf, are collected
+    on the first request for that predicate, and so are the number of objects of each subject of a predicate
+    (and of subjects of each object), for sh:minCount and sh:maxCount. Every lookup is cached, so shapes with the
+    same targets share them.
+    When a frozen snapshot of the data graph is given, the triples are read from the snapshot instead.
+
+    The returned dicts and sets are shared, callers must copy them before changing them.
+    """
+
+    __slots__ = (
+        'data_graph',
+        '_lookup',
+        '_types',
+        '_evaluator',
+        '_class_instances',
+        '_subjects_of',
+        '_objects_of',
+        '_degrees',
+    )
+
+    def __init__(self, data_graph: 'GraphLike', frozen: Optional['FrozenGraph'] = None):
+        """
+        :param data_graph: The graph to index
+        :type data_graph: rdflib.Graph
+        :param frozen: A frozen snapshot of data_graph, to read the triples from
+        :type frozen: FrozenGraph | None
+        """
+        self.data_graph = data_graph
+        lookup = self._lookup = frozen if frozen is not None else data_graph
+        types: Dict = {}
+        for instance, cls in lookup.subject_objects(RDF_type):
+            try:
+                types[cls].append(instance)
+            except KeyError:
+                types[cls] = [instance]
+        self._types: Dict[object, List] = types
+        self._evaluator = PathEvaluator(None, lookup)
+        self._class_instances: Dict = {}
+        self._subjects_of: Dict = {}
+        self._objects_of: Dict = {}
+        self._degrees: Dict = {}
+
+    def subclasses(self, cls) -> Dict[object, FrozenSet]:
+        """
+        :param cls: A class in the data graph
+        :returns: The class itself and each of its transitive subclasses,
+            with the rdfs:subClassOf triples on the chains from that subclass up to cls.
+        :rtype: dict
+        """
+        return self._evaluator.evaluate(cls, _SUBCLASSES_PATH)
+
+    def superclasses(self, cls) -> Dict[object, FrozenSet]:
+        """
+        :param cls: A class in the data graph
+        :returns: The class itself and each of its transitive superclasses,
+            with the rdfs:subClassOf triples on the chains from cls up to that superclass.
+        :rtype: dict
+        """
+        return self._evaluator.evaluate(cls, SUPERCLASSES_PATH)
+
+    def class_instances(self, cls) -> Dict[object, Set]:
+        """
+        :param cls: A class in the data graph
+        :returns: Each SHACL instance of cls, with its witness triples
+        :rtype: dict
+        """
+        try:
+            return self._class_instances[cls]
+        except KeyError:
+            pass
+        instances: Dict = {}
+        types = self._types
+        for subclass, chain in self.subclasses(cls).items():
+            for instance in types.get(subclass, ()):
+                witness = instances.get(instance, None)
+                if witness is None:
+                    witness = instances[instance] = set(chain)
+                else:
+                    witness.update(chain)
+                witness.add((instance, RDF_type, subclass))
+        self._class_instances[cls] = instances
+        return instances
+
+    def subjects_of(self, predicate) -> Dict[object, Set]:
+        """
+        :param predicate:
+        :returns: Each subject of a triple with this predicate, with those triples
+        :rtype: dict
+        """
+        try:
+            return self._subjects_of[predicate]
+        except KeyError:
+            pass
+        subjects: Dict = {}
+        for s, o in self._lookup.subject_objects(predicate):
+            try:
+                subjects[s].add((s, predicate, o))
+            except KeyError:
+                subjects[s] = {(s, predicate, o)}
+        self._subjects_of[predicate] = subjects
+        return subjects
+
+    def objects_of(self, predicate) -> Dict[object, Set]:
+        """
+        :param predicate:
+        :returns: Each object of a triple with this predicate, with those triples
+        :rtype: dict
+        """
+        try:
+            return self._objects_of[predicate]
+        except KeyError:
+            pass
+        objects: Dict = {}
+        for s, o in self._lookup.subject_objects(predicate):
+            try:
+                objects[o].add((s, predicate, o))
+            except KeyError:
+                objects[o] = {(s, predicate, o)}
+        self._objects_of[predicate] = objects
+        return objects
+
+    def degrees(self, predicate, forward: bool = True) -> Dict[object, int]:
+        """
+        :param predicate:
+        :param forward: Count the objects of each subject, or else the subjects of each object
+        :type forward: bool
+        :returns: Each subject (or object) of a triple with this predicate, with how many objects (or subjects)
+            it has with this predicate. Nodes that are not in the dict have none.
+        :rtype: dict
+        """
+        key = (predicate, forward)
+        try:
+            return self._degrees[key]
+        except KeyError:
+            pass
+        lookup = self._lookup
+        if lookup is not self.data_graph:
+            degrees = lookup.degrees(predicate, forward)
+        else:
+            degrees = {}
+            for s, o in lookup.subject_objects(predicate):
+                node = s if forward else o
+                degrees[node] = degrees.get(node, 0) + 1
+        self._degrees[key] = degrees
+        return degrees
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+import datetime
+import math
+
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rdflib import Literal
+from rdflib.namespace import XSD
+
+
+_NUMERIC_DATATYPES = frozenset(
+    (
+        XSD.integer,
+        XSD.decimal,
+        XSD.float,
+        XSD.double,
+        XSD.nonPositiveInteger,
+        XSD.negativeInteger,
+        XSD.long,
+        XSD.int,
+        XSD.short,
+        XSD.byte,
+        XSD.nonNegativeInteger,
+        XSD.unsignedLong,
+        XSD.unsignedInt,
+        XSD.unsignedShort,
+        XSD.unsignedByte,
+        XSD.positiveInteger,
+    )
+)
+_TEMPORAL_DATATYPES = {
+    XSD.dateTime: datetime.datetime,
+    XSD.date: datetime.date,
+    XSD.time: datetime.time,
+}
+# All numeric literals compare with each other, by value
+NUMERIC = 'numeric'
+_MISSING = object()
+
+
+def decode_literal(literal) -> Optional[Tuple]:
+    """
+    :returns: A (kind, value) pair, for a well-formed numeric or date/time literal. The values of the literals of
+        the same kind compare like compare_literal() compares those literals. None for any other term.
+    :rtype: tuple | None
+    """
+    if not isinstance(literal, Literal) or getattr(literal, 'ill_typed', False):
+        return None
+    datatype = literal.datatype
+    value = literal.value
+    if datatype in _NUMERIC_DATATYPES:
+        # bool is an int, but never the value of a numeric literal that parsed
+        if isinstance(value, int) and not isinstance(value, bool):
+            return NUMERIC, value
+        # NaN is left to compare_literal(), a Decimal raises an error when it is ordered with one
+        if isinstance(value, float) and not math.isnan(value):
+            return NUMERIC, value
+        if isinstance(value, Decimal) and not value.is_nan():
+            return NUMERIC, value
+        return None
+    value_type = _TEMPORAL_DATATYPES.get(datatype, None)
+    if value_type is None or type(value) is not value_type:
+        return None
+    # A date/time with a timezone does not compare with one without
+    if value_type is datetime.date:
+        return datatype, value
+    return (datatype, value.tzinfo is not None), value
+
+
+class TypedLiteralCache(object):
+    """
+    Run-scoped cache of the values of the numeric and date/time literals that the value range constraints
+    (sh:minInclusive, sh:maxExclusive, etc) compare, so each literal is decoded once per run.
+
+    compare() compares all of the value nodes of a constraint with one of its bounds at once, as plain Python
+    values, rather than comparing each pair of rdflib terms. Value nodes that are not of the same kind as the
+    bound (strings, mixed numbers and dates, ill-typed literals, etc) are left for compare_literal().
+    """
+
+    __slots__ = ('_values', 'hits', 'misses')
+
+    def __init__(self):
+        self._values: Dict = {}
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, literal) -> Optional[Tuple]:
+        """
+        Like decode_literal(), but each literal is decoded only once.
+        :rtype: tuple | None
+        """
+        decoded = self._values.get(literal, _MISSING)
+        if decoded is _MISSING:
+            self.misses += 1
+            decoded = self._values[literal] = decode_literal(literal)
+        else:
+            self.hits += 1
+        return decoded
+
+    def compare(self, bound, value_nodes: Iterable) -> Optional[List[Optional[int]]]:
+        """
+        :param bound: The value of a value range constraint parameter
+        :param value_nodes: The value nodes to compare with it
+        :returns: One order for each value node, in the same order, with the result of
+            compare_literal(value node, bound): 0 when equal, 1 when greater, -1 otherwise. None for the value
+            nodes that are not of the same kind as the bound. None when the bound is not a numeric or date/time.
+        :rtype: list | None
+        """
+        decoded_bound = self.decode(bound)
+        if decoded_bound is None:
+            return None
+        kind, bound_value = decoded_bound
+        values = self._values
+        orders: List[Optional[int]] = []
+        append = orders.append
+        misses = 0
+        for v in value_nodes:
+            decoded = values.get(v, _MISSING)
+            if decoded is _MISSING:
+                misses += 1
+                decoded = values[v] = decode_literal(v)
+            if decoded is None or decoded[0] != kind:
+                append(None)
+                continue
+            value = decoded[1]
+            append(0 if value == bound_value else (1 if value > bound_value else -1))
+        self.misses += misses
+        self.hits += len(orders) - misses
+        return orders
+
+    def clear(self):
+        self._values.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._values)}
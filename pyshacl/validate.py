@@ -3,11 +3,11 @@
 import logging
 import sys
 
+from contextlib import nullcontext
 from functools import wraps
 from os import path
 from sys import stderr
-from typing import Dict, List, Optional, Set, Tuple, Union
-from time import process_time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import rdflib
 from rdflib import BNode, Literal, URIRef
@@ -27,8 +27,25 @@ from .consts import (
 )
 from .errors import ReportableRuntimeError, ValidationFailure
 from .extras import check_extra_installed
+from .fragment_sink import CallbackFragmentSink, FragmentSink
+from .frozen_graph import FrozenGraph
 from .functions import apply_functions, gather_functions, unapply_functions
+from .incremental import IncrementalValidation
+from .memo import ShapeMemo
 from .monkey import apply_patches, rdflib_bool_patch, rdflib_bool_unpatch
+from .parallel import fork_context, validate_shapes_in_parallel
+from .path_cache import DEFAULT_PATH_CACHE_SIZE, PathCache
+from .pattern_cache import DEFAULT_PATTERN_CACHE_SIZE, PatternCache
+from .profiler import (
+    COUNT_FRAGMENT_TRIPLES,
+    PHASE_FREEZE,
+    PHASE_INFERENCE,
+    PHASE_LOAD,
+    PHASE_NEIGHBORHOOD_MERGE,
+    PHASE_REPORT_BUILDING,
+    PHASE_SHAPE_HARVEST,
+    Profiler,
+)
 from .pytypes import GraphLike
 from .rdfutil import (
     clone_blank_node,
@@ -44,6 +61,8 @@ from .rdfutil.load import add_baked_in
 from .rules import apply_rules, gather_rules
 from .shapes_graph import ShapesGraph
 from .target import apply_target_types, gather_target_types
+from .target_index import TargetIndex
+from .typed_literals import TypedLiteralCache
 
 log_handler = logging.StreamHandler(stderr)
 log = logging.getLogger(__name__)
@@ -64,6 +83,18 @@ class Validator(object):
         options_dict.setdefault('iterate_rules', False)
         options_dict.setdefault('abort_on_first', False)
         options_dict.setdefault('allow_warnings', False)
+        options_dict.setdefault('fragment_sink', None)
+        options_dict.setdefault('workers', 1)
+        options_dict.setdefault('shard_size', None)
+        options_dict.setdefault('profiler', None)
+        options_dict.setdefault('sparql_batch_size', None)
+        options_dict.setdefault('path_cache_size', DEFAULT_PATH_CACHE_SIZE)
+        options_dict.setdefault('pattern_cache_size', DEFAULT_PATTERN_CACHE_SIZE)
+        options_dict.setdefault('incremental', False)
+        options_dict.setdefault('conformance_only', False)
+        options_dict.setdefault('fragment_only', False)
+        options_dict.setdefault('store', 'default')
+        options_dict.setdefault('freeze', False)
         if 'logger' not in options_dict:
             options_dict['logger'] = logging.getLogger(__name__)
 
@@ -121,23 +152,41 @@ class Validator(object):
             raise ReportableRuntimeError("Error while running OWL-RL Deductive Closure\n{}".format(str(e.args[0])))
 
     @classmethod
-    def create_validation_report(cls, sg, conforms: bool, results: List[Tuple]):
-        v_text = "Validation Report\nConforms: {}\n".format(str(conforms))
-        result_len = len(results)
-        if not conforms and result_len < 1:
-            raise RuntimeError("A Non-Conformant Validation Report must have at least one result.")
-        if result_len > 0:
-            v_text += "Results ({}):\n".format(str(result_len))
+    def _new_report_graph(cls, sg, conforms: bool):
         vg = rdflib.Graph()
         for p, n in sg.graph.namespace_manager.namespaces():
             vg.namespace_manager.bind(p, n)
         vr = BNode()
         vg.add((vr, RDF_type, SH_ValidationReport))
         vg.add((vr, SH_conforms, Literal(conforms)))
+        return vg, vr
+
+    @classmethod
+    def create_conformance_report(cls, sg, conforms: bool):
+        """
+        A validation report with only the conformance, for fragment-only runs, where no results are kept.
+        """
+        vg, _ = cls._new_report_graph(sg, conforms)
+        return vg, "Validation Report\nConforms: {}\n".format(str(conforms))
+
+    @classmethod
+    def create_validation_report(cls, sg, conforms: bool, results: List):
+        """
+        :param results: ValidationResults, or (description, result node, result triples) tuples
+        :type results: list
+        """
+        texts = ["Validation Report\nConforms: {}\n".format(str(conforms))]
+        result_len = len(results)
+        if not conforms and result_len < 1:
+            raise RuntimeError("A Non-Conformant Validation Report must have at least one result.")
+        if result_len > 0:
+            texts.append("Results ({}):\n".format(str(result_len)))
+        vg, vr = cls._new_report_graph(sg, conforms)
         cloned_nodes: Dict[Tuple[GraphLike, str], Union[BNode, URIRef]] = {}
         for result in iter(results):
+            # This is where the description and the triples of a ValidationResult are made
             _d, _bn, _tr = result
-            v_text += _d
+            texts.append(_d)
             vg.add((vr, SH_result, _bn))
             for tr in iter(_tr):
                 s, p, o = tr
@@ -155,13 +204,13 @@ class Validator(object):
                         else:
                             cloned_nodes[(source, _id)] = o = URIRef(_id)
                 vg.add((s, p, o))
-        return vg, v_text
+        return vg, "".join(texts)
 
     def __init__(
         self,
         data_graph: GraphLike,
         *args,
-        shacl_graph: Optional[GraphLike] = None,
+        shacl_graph: Optional[Union[GraphLike, ShapesGraph]] = None,
         ont_graph: Optional[GraphLike] = None,
         options: Optional[dict] = None,
         **kwargs,
@@ -172,33 +221,157 @@ class Validator(object):
         self.logger = options['logger']  # type: logging.Logger
         self.pre_inferenced = kwargs.pop('pre_inferenced', False)
         self.inplace = options['inplace']
+        if options['fragment_sink'] is not None and not isinstance(options['fragment_sink'], FragmentSink):
+            # A plain function is called with each batch of fragment triples
+            options['fragment_sink'] = CallbackFragmentSink(options['fragment_sink'])
         if not isinstance(data_graph, rdflib.Graph):
             raise RuntimeError("data_graph must be a rdflib Graph object")
         self.data_graph = data_graph  # type: GraphLike
         self._target_graph = None
+        self.memo = None  # type: Optional[ShapeMemo]
+        self.path_cache = None  # type: Optional[PathCache]
+        self.pattern_cache = None  # type: Optional[PatternCache]
+        self.typed_literals = None  # type: Optional[TypedLiteralCache]
+        self._incremental = None  # type: Optional[IncrementalValidation]
+        self._advanced = {}  # type: Dict
         self.ont_graph = ont_graph  # type: Optional[GraphLike]
         self.data_graph_is_multigraph = isinstance(self.data_graph, (rdflib.Dataset, rdflib.ConjunctiveGraph))
         if self.ont_graph is not None and isinstance(self.ont_graph, (rdflib.Dataset, rdflib.ConjunctiveGraph)):
             self.ont_graph.default_union = True
 
-        if shacl_graph is None:
-            shacl_graph = clone_graph(data_graph, identifier='shacl')
-        assert isinstance(shacl_graph, rdflib.Graph), "shacl_graph must be a rdflib Graph object"
-        self.shacl_graph = ShapesGraph(shacl_graph, self.logger)  # type: ShapesGraph
+        if isinstance(shacl_graph, ShapesGraph):
+            # Already built, and maybe used by other runs, its shapes are only harvested and compiled once
+            self.shacl_graph = shacl_graph  # type: ShapesGraph
+        else:
+            if shacl_graph is None:
+                shacl_graph = clone_graph(data_graph, identifier='shacl')
+            assert isinstance(shacl_graph, rdflib.Graph), "shacl_graph must be a rdflib Graph object"
+            self.shacl_graph = ShapesGraph(shacl_graph, self.logger)
 
+        self._use_js = False
         if options['use_js']:
             is_js_installed = check_extra_installed('js')
             if is_js_installed:
-                self.shacl_graph.enable_js()
+                self._use_js = True
+                if not isinstance(shacl_graph, ShapesGraph):
+                    self.shacl_graph.enable_js()
+        # What the run scope changed on the shapes of a shared Shapes Graph, to undo it, see _open_run_scope()
+        self._shape_options = None  # type: Optional[Tuple]
 
     @property
     def target_graph(self):
         return self._target_graph
 
     def mix_in_ontology(self):
+        store = self.options['store']
         if not self.data_graph_is_multigraph:
-            return mix_graphs(self.data_graph, self.ont_graph, "inplace" if self.inplace else None)
-        return mix_datasets(self.data_graph, self.ont_graph, "inplace" if self.inplace else None)
+            return mix_graphs(self.data_graph, self.ont_graph, "inplace" if self.inplace else None, store=store)
+        return mix_datasets(self.data_graph, self.ont_graph, "inplace" if self.inplace else None, store=store)
+
+    def _phase(self, name):
+        profiler = self.options['profiler']
+        return nullcontext() if profiler is None else profiler.phase(name)
+
+    def _open_run_scope(self):
+        """
+        Set the run-scoped state of the Shapes Graph, for run() or apply_delta().
+        """
+        self.shacl_graph.memo = self.memo
+        self.shacl_graph.path_cache = self.path_cache
+        self.shacl_graph.pattern_cache = self.pattern_cache
+        self.shacl_graph.typed_literals = self.typed_literals
+        self.shacl_graph.profiler = self.options['profiler']
+        # Set per data graph by run(), or by apply_delta(), never inherited from an earlier run
+        self.shacl_graph.target_index = None
+        self.shacl_graph.frozen_graph = None
+        self.shacl_graph.read_recorder = None
+        self.shacl_graph.sparql_batch_size = self.options['sparql_batch_size']
+        # Conformance-only runs skip building the neighborhoods, the returned fragment is empty
+        self.shacl_graph.extract_fragment = not self.options['conformance_only']
+        self._set_shape_options()
+        if self.shacl_graph.js_enabled:
+            from pyshacl.extras.js.context import SHACLJSContextPool
+
+            # JS interpreters, with their libraries loaded, are reused by every JS execution of the run
+            self.shacl_graph.js_contexts = SHACLJSContextPool()
+
+    def _set_shape_options(self):
+        """
+        Make the shapes advanced and enable SHACL-JS for this run, as its options ask. A Shapes Graph can be shared
+        by runs with other options, eg by the validation daemon, so _close_run_scope() undoes this.
+        """
+        sg = self.shacl_graph
+        shapes = sg.shapes
+        advanced = [s for s in shapes if not s._advanced] if self.options['advanced'] else []
+        use_js = self._use_js and not sg.js_enabled
+        if use_js:
+            sg.enable_js()
+        for s in advanced:
+            s.set_advanced(True)
+        target_types = []
+        if self.options['advanced']:
+            target_types = [t for t in gather_target_types(sg) if not sg.has_shacl_target_type(t.node)]
+            apply_target_types(target_types)
+        self._shape_options = (advanced, use_js, target_types)
+
+    def _unset_shape_options(self):
+        if self._shape_options is None:
+            return
+        advanced, use_js, target_types = self._shape_options
+        self._shape_options = None
+        sg = self.shacl_graph
+        for t in target_types:
+            sg.remove_shacl_target_type(t.node)
+        for s in advanced:
+            s.set_advanced(False)
+        if use_js:
+            sg.disable_js()
+
+    def _close_run_scope(self):
+        js_contexts = self.shacl_graph.js_contexts
+        self._unset_shape_options()
+        self.shacl_graph.memo = None
+        self.shacl_graph.path_cache = None
+        self.shacl_graph.pattern_cache = None
+        self.shacl_graph.typed_literals = None
+        self.shacl_graph.profiler = None
+        self.shacl_graph.target_index = None
+        self.shacl_graph.frozen_graph = None
+        self.shacl_graph.sparql_batch_size = None
+        self.shacl_graph.read_recorder = None
+        self.shacl_graph.extract_fragment = True
+        if js_contexts is not None:
+            self.logger.debug("JS contexts: {created} created, {reused} reused".format(**js_contexts.stats()))
+            js_contexts.close()
+            self.shacl_graph.js_contexts = None
+        self.logger.debug("Shape memo: {hits} hits, {misses} misses, {entries} entries".format(**self.memo.stats()))
+        if self.path_cache is not None:
+            self.logger.debug(
+                "Path cache: {hits} hits, {misses} misses, {evictions} evictions, {entries} entries".format(
+                    **self.path_cache.stats()
+                )
+            )
+        if self.pattern_cache is not None:
+            self.logger.debug(
+                "Pattern cache: {hits} hits, {misses} misses, {entries} entries".format(**self.pattern_cache.stats())
+            )
+        if self.typed_literals is not None:
+            self.logger.debug(
+                "Typed literals: {hits} hits, {misses} misses, {entries} entries".format(**self.typed_literals.stats())
+            )
+
+    def _validate_shapes(self, shapes, target_graph, abort_on_first, allow_warnings):
+        """
+        Validate the top-level shapes one after the other, in this process.
+        :returns: A (conforms, reports, fragment triples) tuple for each shape, as each shape is done
+        :rtype: Iterator[tuple]
+        """
+        for s in shapes:
+            _is_conform, _reports, _subgraph = s.validate(
+                target_graph, abort_on_first=abort_on_first, allow_warnings=allow_warnings
+            )
+            # _subgraphs will contain neighborhoods for each conforming focus node
+            yield _is_conform, _reports, (t for fn in _subgraph for t in _subgraph[fn])
 
     def run(self):
         if self.target_graph is not None:
@@ -207,31 +380,31 @@ class Validator(object):
             has_cloned = False
             if self.ont_graph is not None:
                 # creates a copy of self.data_graph, doesn't modify it
-                the_target_graph = self.mix_in_ontology()
+                with self._phase(PHASE_LOAD):
+                    the_target_graph = self.mix_in_ontology()
                 has_cloned = True
             else:
                 the_target_graph = self.data_graph
             inference_option = self.options.get('inference', 'none')
             if inference_option and not self.pre_inferenced and str(inference_option) != "none":
-                if not has_cloned and not self.inplace:
-                    the_target_graph = clone_graph(the_target_graph)
-                self._run_pre_inference(the_target_graph, inference_option, self.logger)
+                with self._phase(PHASE_INFERENCE):
+                    if not has_cloned and not self.inplace:
+                        the_target_graph = clone_graph(the_target_graph, store=self.options['store'])
+                    self._run_pre_inference(the_target_graph, inference_option, self.logger)
                 self.pre_inferenced = True
             self._target_graph = the_target_graph
 
-        shapes = self.shacl_graph.shapes  # This property getter triggers shapes harvest.
         iterate_rules = self.options.get("iterate_rules", False)
-        if self.options['advanced']:
-            target_types = gather_target_types(self.shacl_graph)
-            advanced = {
-                'functions': gather_functions(self.shacl_graph),
-                'rules': gather_rules(self.shacl_graph, iterate_rules=iterate_rules),
-            }
-            for s in shapes:
-                s.set_advanced(True)
-            apply_target_types(target_types)
-        else:
-            advanced = {}
+        with self._phase(PHASE_SHAPE_HARVEST):
+            shapes = self.shacl_graph.shapes  # This property getter triggers shapes harvest.
+            if self.options['advanced']:
+                advanced = {
+                    'functions': gather_functions(self.shacl_graph),
+                    'rules': gather_rules(self.shacl_graph, iterate_rules=iterate_rules),
+                }
+            else:
+                advanced = {}
+            self._advanced = advanced
         if isinstance(the_target_graph, (rdflib.Dataset, rdflib.ConjunctiveGraph)):
             named_graphs = [
                 rdflib.Graph(the_target_graph.store, i, namespace_manager=the_target_graph.namespace_manager)
@@ -244,34 +417,166 @@ class Validator(object):
         reports = []
         abort_on_first: bool = bool(self.options.get("abort_on_first", False))
         allow_warnings: bool = bool(self.options.get("allow_warnings", False))
+        fragment_only: bool = bool(self.options['fragment_only'])
         non_conformant = False
         subgraph = set()
         aborted = False
-        for g in named_graphs:
-            if advanced:
-                apply_functions(advanced['functions'], g)
-                apply_rules(advanced['rules'], g, iterate=iterate_rules)
-            try:
-                for s in shapes:
-                    _is_conform, _reports, _subgraph = s.validate(g, abort_on_first=abort_on_first,
-                                                                  allow_warnings=allow_warnings)
-                    # _subgraphs will contain neighborhoods for each conforming focus node
-                    # we will gather these neighborhoods in subgraph and later return them:
-                    for fn in _subgraph:
-                        subgraph.update(_subgraph[fn])
-                    non_conformant = non_conformant or (not _is_conform)
-                    reports.extend(_reports)
-                    if abort_on_first and non_conformant:
-                        aborted = True
-                        break
-                if aborted:
-                    break
-            finally:
+        self.memo = memo = ShapeMemo()
+        path_cache_size = self.options['path_cache_size']
+        # Paths are only walked once from each focus node, for all the shapes with that path
+        self.path_cache = PathCache(path_cache_size) if path_cache_size else None
+        pattern_cache_size = self.options['pattern_cache_size']
+        # sh:pattern matches do not depend on the graph either, they are kept for all the named graphs
+        self.pattern_cache = PatternCache(pattern_cache_size) if pattern_cache_size else None
+        # The values of literals do not depend on the graph, they are decoded once for all the named graphs
+        self.typed_literals = TypedLiteralCache()
+        profiler = self.options['profiler']  # type: Optional[Profiler]
+        self._open_run_scope()
+        try:
+            fragment_sink = self.options['fragment_sink']  # type: Optional[FragmentSink]
+            workers = int(self.options['workers'] or 1)
+            incremental = bool(self.options['incremental'])
+            self._incremental = None
+            if incremental and abort_on_first:
+                self.logger.warning("Cannot validate incrementally when aborting on the first failure.")
+                incremental = False
+            elif incremental and len(named_graphs) > 1:
+                self.logger.warning("Cannot validate incrementally a data graph with more than one named graph.")
+                incremental = False
+            freeze = bool(self.options['freeze'])
+            if incremental:
+                # A cache hit would skip the reads that the evaluation of a focus node depends on
+                self.path_cache = self.shacl_graph.path_cache = None
+            if incremental and freeze:
+                # The reads of each focus node are recorded on the data graph, and apply_delta() changes it
+                self.logger.warning("Cannot freeze the data graph in incremental mode.")
+                freeze = False
+            if incremental and workers > 1:
+                self.logger.warning("Cannot validate shapes in parallel in incremental mode.")
+                workers = 1
+            if workers > 1 and abort_on_first:
+                self.logger.warning("Cannot validate shapes in parallel when aborting on the first failure.")
+                workers = 1
+            elif workers > 1 and fork_context() is None:
+                self.logger.warning("Cannot validate shapes in parallel, this platform cannot fork processes.")
+                workers = 1
+            for g in named_graphs:
                 if advanced:
-                    unapply_functions(advanced['functions'], g)
-        v_report, v_text = self.create_validation_report(self.shacl_graph, not non_conformant, reports)
+                    apply_functions(advanced['functions'], g)
+                    apply_rules(advanced['rules'], g, iterate=iterate_rules)
+                # Memoized evaluations are only valid for the graph they were made against
+                memo.clear()
+                if self.path_cache is not None:
+                    self.path_cache.clear()
+                # After the rules are applied, so their triples are indexed
+                if freeze:
+                    with self._phase(PHASE_FREEZE):
+                        frozen = self.shacl_graph.frozen_graph = FrozenGraph(g)
+                    self.logger.debug(
+                        "Frozen graph: {terms} terms, {predicates} predicates, {triples} triples".format(
+                            **frozen.stats()
+                        )
+                    )
+                else:
+                    frozen = None
+                self.shacl_graph.target_index = TargetIndex(g, frozen)
+                try:
+                    if incremental:
+                        # Validate one focus node at a time, noting what each one read, see apply_delta()
+                        self._incremental = IncrementalValidation(g, shapes, self.shacl_graph, allow_warnings)
+                        self.shacl_graph.read_recorder = self._incremental.recorder
+                        shape_results = self._incremental.validate_shapes()
+                    elif workers > 1:
+                        shape_results = validate_shapes_in_parallel(
+                            shapes,
+                            g,
+                            self.shacl_graph,
+                            workers,
+                            allow_warnings=allow_warnings,
+                            shard_size=self.options['shard_size'],
+                            build_reports=not fragment_only,
+                        )
+                    else:
+                        shape_results = self._validate_shapes(shapes, g, abort_on_first, allow_warnings)
+                    for _is_conform, _reports, fragment in shape_results:
+                        with self._phase(PHASE_NEIGHBORHOOD_MERGE):
+                            if fragment_sink is not None:
+                                # stream the fragment of this shape out now it is done
+                                fragment_sink.add(fragment)
+                            else:
+                                # we will gather these fragments in subgraph and later return them:
+                                subgraph.update(fragment)
+                        non_conformant = non_conformant or (not _is_conform)
+                        if not fragment_only:
+                            reports.extend(_reports)
+                        if abort_on_first and non_conformant:
+                            aborted = True
+                            break
+                    if aborted:
+                        break
+                finally:
+                    if advanced:
+                        unapply_functions(advanced['functions'], g)
+        finally:
+            self._close_run_scope()
+        if profiler is not None:
+            profiler.count(COUNT_FRAGMENT_TRIPLES, len(subgraph) if fragment_sink is None else fragment_sink.count)
+        with self._phase(PHASE_REPORT_BUILDING):
+            if fragment_only:
+                v_report, v_text = self.create_conformance_report(self.shacl_graph, not non_conformant)
+            else:
+                v_report, v_text = self.create_validation_report(self.shacl_graph, not non_conformant, reports)
         return (not non_conformant), v_report, v_text, subgraph
 
+    def apply_delta(self, added=(), removed=()):
+        """
+        Add and remove triples, and revalidate only the focus nodes that the change can affect.
+        Needs a previous run() with the `incremental` option, see pyshacl.incremental.
+        The triples are added to and removed from the graph that run() validated, which is the data graph itself
+        unless run() made a copy of it (with an ont_graph, or inference without inplace).
+        OWL/RDFS inference and SHACL rules are not run again on the changed graph.
+        The results of the focus nodes that are not revalidated are described as they were found before the change.
+        :param added: Triples to add to the data graph
+        :type added: Iterable[tuple]
+        :param removed: Triples to remove from the data graph
+        :type removed: Iterable[tuple]
+        :returns: A (conforms, report graph, report text, fragment) tuple for the changed graph, like run()
+        :rtype: tuple
+        """
+        state = self._incremental
+        if state is None:
+            raise ReportableRuntimeError("apply_delta() needs a previous run() in incremental mode.")
+        inference_option = self.options.get('inference', 'none')
+        if (inference_option and str(inference_option) != "none") or self._advanced.get('rules', None):
+            self.logger.warning("Inferences and SHACL rule results are not updated for the added or removed triples.")
+        functions = self._advanced.get('functions', None)
+        if not self.options['fragment_only']:
+            # The results of the focus nodes that are not revalidated are kept, as found before the change
+            for r in state.reports():
+                r.materialize()
+        self._open_run_scope()
+        self.shacl_graph.read_recorder = state.recorder
+        try:
+            if functions:
+                apply_functions(functions, state.data_graph)
+            revalidated = state.apply_delta(added, removed)
+        finally:
+            if functions:
+                unapply_functions(functions, state.data_graph)
+            self._close_run_scope()
+        self.logger.debug("Incremental revalidation of {} focus nodes".format(revalidated))
+        fragment = state.fragment()
+        profiler = self.options['profiler']  # type: Optional[Profiler]
+        if profiler is not None:
+            profiler.count(COUNT_FRAGMENT_TRIPLES, len(fragment))
+        conforms = state.conforms
+        with self._phase(PHASE_REPORT_BUILDING):
+            if self.options['fragment_only']:
+                v_report, v_text = self.create_conformance_report(self.shacl_graph, conforms)
+            else:
+                v_report, v_text = self.create_validation_report(self.shacl_graph, conforms, state.reports())
+        return conforms, v_report, v_text, fragment
+
 
 def assign_baked_in():
     if getattr(sys, 'frozen', False):
@@ -326,9 +631,29 @@ def meta_validate(shacl_graph: Union[GraphLike, str], inference: Optional[str] =
     shacl_shacl_graph = meta_validate.graph_cache
     shacl_graph = load_from_source(shacl_graph, rdf_format=kwargs.pop('shacl_graph_format', None), multigraph=True)
     _ = kwargs.pop('meta_shacl', None)
+    # Only the conformance of the Shapes Graph is wanted, not a fragment of it
+    kwargs['conformance_only'] = True
     return validate(shacl_graph, shacl_graph=shacl_shacl_graph, inference=inference, **kwargs)
 
 
+def _pop_run_options(kwargs: dict) -> dict:
+    """
+    Take the Validator options that validate() and validate_many() accept as keyword arguments out of kwargs.
+    :rtype: dict
+    """
+    return {
+        'use_js': kwargs.pop('js', None),
+        'iterate_rules': kwargs.pop('iterate_rules', False),
+        'sparql_batch_size': kwargs.pop('sparql_batch_size', None),
+        'path_cache_size': kwargs.pop('path_cache_size', DEFAULT_PATH_CACHE_SIZE),
+        'pattern_cache_size': kwargs.pop('pattern_cache_size', DEFAULT_PATTERN_CACHE_SIZE),
+        'conformance_only': kwargs.pop('conformance_only', False),
+        'fragment_only': kwargs.pop('fragment_only', False),
+        'store': kwargs.pop('store', 'default'),
+        'freeze': kwargs.pop('freeze', False),
+    }
+
+
 def validate(
     data_graph: Union[GraphLike, str, bytes],
     *args,
@@ -361,7 +686,23 @@ def validate(
     :type abort_on_first: bool | None
     :param allow_warnings: Shapes marked with severity of sh:Warning or sh:Info will not cause result to be invalid.
     :type allow_warnings: bool | None
-    :param kwargs:
+    :param kwargs: Also accepts fragment_sink, a FragmentSink or a function taking a list of triples, that is given the fragment triples
+    as each shape is evaluated. The returned fragment is then empty.
+    And workers=N, to validate the top-level shapes in a pool of N forked processes.
+    And shard_size=N, with workers, to split the focus nodes of shapes with more than N of them across the workers.
+    And profiler, a Profiler that records the time spent in each phase of the run, see pyshacl.profiler.
+    And sparql_batch_size=N, to run the queries of sh:sparql constraints for N focus nodes at a time.
+    And path_cache_size=N, to keep the nodes reachable on a path from a focus node for at most N
+    (path, focus node) pairs, shared by the shapes with the same path. 0 turns the cache off.
+    And pattern_cache_size=N, to keep whether an sh:pattern is found in a string for at most N
+    (pattern, flags, string) triples, shared by all shapes. 0 turns the cache off.
+    And conformance_only=True, to only validate, without building the neighborhoods. The fragment is then empty.
+    And fragment_only=True, to only extract the fragment. The report then has no results, only the conformance.
+    And store, the name of the rdflib store plugin to load the data graph into, and to clone it into for
+    inference, eg "CompactMemory" to keep its terms encoded as integers. A data graph that is passed in as an
+    rdflib Graph keeps its own store, unless it is cloned.
+    And freeze=True, to look up the triples of the data graph in a read-only snapshot of it, taken after the
+    inference and the rules, see pyshacl.frozen_graph. Not in incremental mode.
     :return:
     """
     if kwargs.get('debug', False):
@@ -371,35 +712,43 @@ def validate(
     assign_baked_in()
     do_check_dash_result = kwargs.pop('check_dash_result', False)  # type: bool
     do_check_sht_result = kwargs.pop('check_sht_result', False)  # type: bool
+    profiler = kwargs.pop('profiler', None)  # type: Optional[Profiler]
+    # The options of this run, they do not apply to the validation of the Shapes Graph by meta_validate()
+    run_options = _pop_run_options(kwargs)
+    fragment_sink = kwargs.pop('fragment_sink', None)
+    workers = kwargs.pop('workers', 1)
+    shard_size = kwargs.pop('shard_size', None)
     if kwargs.get('meta_shacl', False):
         to_meta_val = shacl_graph or data_graph
-        conforms, v_r, v_t = meta_validate(to_meta_val, inference=inference, **kwargs)
+        conforms, v_r, v_t, _ = meta_validate(to_meta_val, inference=inference, **kwargs)
         if not conforms:
             msg = "Shacl File does not validate against the Shacl Shapes Shacl file.\n{}".format(v_t)
             log.error(msg)
             raise ReportableRuntimeError(msg)
     do_owl_imports = kwargs.pop('do_owl_imports', False)
     data_graph_format = kwargs.pop('data_graph_format', None)
-    # force no owl imports on data_graph
-    loaded_dg = load_from_source(data_graph, rdf_format=data_graph_format, multigraph=True, do_owl_imports=False)
     ont_graph_format = kwargs.pop('ont_graph_format', None)
-    if ont_graph is not None:
-        loaded_og = load_from_source(
-            ont_graph, rdf_format=ont_graph_format, multigraph=True, do_owl_imports=do_owl_imports
-        )
-    else:
-        loaded_og = None
     shacl_graph_format = kwargs.pop('shacl_graph_format', None)
-    if shacl_graph is not None:
-        rdflib_bool_patch()
-        loaded_sg = load_from_source(
-            shacl_graph, rdf_format=shacl_graph_format, multigraph=True, do_owl_imports=do_owl_imports
+    store = run_options['store']
+    with nullcontext() if profiler is None else profiler.phase(PHASE_LOAD):
+        # force no owl imports on data_graph
+        loaded_dg = load_from_source(
+            data_graph, rdf_format=data_graph_format, multigraph=True, do_owl_imports=False, store=store
         )
-        rdflib_bool_unpatch()
-    else:
-        loaded_sg = None
-    use_js = kwargs.pop('js', None)
-    iterate_rules = kwargs.pop('iterate_rules', False)
+        if ont_graph is not None:
+            loaded_og = load_from_source(
+                ont_graph, rdf_format=ont_graph_format, multigraph=True, do_owl_imports=do_owl_imports, store=store
+            )
+        else:
+            loaded_og = None
+        if shacl_graph is not None:
+            rdflib_bool_patch()
+            loaded_sg = load_from_source(
+                shacl_graph, rdf_format=shacl_graph_format, multigraph=True, do_owl_imports=do_owl_imports
+            )
+            rdflib_bool_unpatch()
+        else:
+            loaded_sg = None
     if "abort_on_error" in kwargs:
         log.warning("Usage of abort_on_error is deprecated. Use abort_on_first instead.")
         ae = kwargs.pop("abort_on_error")
@@ -416,16 +765,15 @@ def validate(
                 'abort_on_first': abort_on_first,
                 'allow_warnings': allow_warnings,
                 'advanced': advanced,
-                'iterate_rules': iterate_rules,
-                'use_js': use_js,
+                'fragment_sink': fragment_sink,
+                'workers': workers,
+                'shard_size': shard_size,
+                'profiler': profiler,
                 'logger': log,
+                **run_options,
             },
         )
-        tic = process_time()
         conforms, report_graph, report_text, subgraph = validator.run()
-        toc = process_time()
-        print(toc - tic)
-        print("^^^^ fragment extraction time")
     except ValidationFailure as e:
         conforms = False
         report_graph = e
@@ -447,6 +795,152 @@ def validate(
     return conforms, report_graph, report_text, subgraph
 
 
+# The validation of one data graph of validate_many(), inherited by its workers when they are forked
+_FORKED_BATCH = None  # type: Optional[Callable]
+
+
+def _validate_forked_document(source):
+    return _FORKED_BATCH(source)
+
+
+def validate_many(
+    data_sources: Iterable[Union[GraphLike, str, bytes]],
+    *args,
+    shacl_graph: Optional[Union[GraphLike, str, bytes]] = None,
+    ont_graph: Optional[Union[GraphLike, str, bytes]] = None,
+    advanced: Optional[bool] = False,
+    inference: Optional[str] = None,
+    inplace: Optional[bool] = False,
+    abort_on_first: Optional[bool] = False,
+    allow_warnings: Optional[bool] = False,
+    **kwargs,
+) -> Iterator[Tuple]:
+    """
+    Validate many data graphs against the same Shapes Graph.
+    The Shapes Graph and the ontology graph are loaded, and the shapes are harvested and compiled, only once.
+    :param data_sources: rdflib.Graphs, or file paths or web urls of the data graphs to validate
+    :type data_sources: Iterable[rdflib.Graph | str | bytes]
+    :param shacl_graph: rdflib.Graph or file path or web url of the SHACL Shapes graph, shared by all data graphs
+    :type shacl_graph: rdflib.Graph | str | bytes
+    :param ont_graph: rdflib.Graph or file path or web url of an extra ontology document to mix into each data graph
+    :type ont_graph: rdflib.Graph | str | bytes
+    :param advanced: Enable advanced SHACL features, default=False
+    :type advanced: bool | None
+    :param inference: One of "rdfs", "owlrl", "both", "none", or None
+    :type inference: str | None
+    :param inplace: If this is enabled, do not clone the datagraphs, manipulate them inplace
+    :type inplace: bool
+    :param abort_on_first: Stop evaluating constraints after first violation is found, in each data graph
+    :type abort_on_first: bool | None
+    :param allow_warnings: Shapes marked with severity of sh:Warning or sh:Info will not cause result to be invalid.
+    :type allow_warnings: bool | None
+    :param kwargs: Accepts the same options as validate(), but for fragment_sink and shard_size.
+    And workers=N, to validate N data graphs at a time, in a pool of forked processes. The workers are forked
+    once the Shapes Graph is compiled, so they share it. Each data graph is validated in one process.
+    :returns: A (conforms, report graph, report text, fragment) tuple for each data graph, as each one is done,
+        in the order of data_sources
+    :rtype: Iterator[tuple]
+    """
+    if kwargs.get('debug', False):
+        log_handler.setLevel(logging.DEBUG)
+        log.setLevel(logging.DEBUG)
+    if shacl_graph is None:
+        raise ReportableRuntimeError("validate_many() needs a shacl_graph, to validate all of the data graphs with.")
+    apply_patches()
+    assign_baked_in()
+    profiler = kwargs.pop('profiler', None)  # type: Optional[Profiler]
+    do_owl_imports = kwargs.pop('do_owl_imports', False)
+    data_graph_format = kwargs.pop('data_graph_format', None)
+    ont_graph_format = kwargs.pop('ont_graph_format', None)
+    shacl_graph_format = kwargs.pop('shacl_graph_format', None)
+    run_options = _pop_run_options(kwargs)
+    store = run_options['store']
+    with nullcontext() if profiler is None else profiler.phase(PHASE_LOAD):
+        rdflib_bool_patch()
+        loaded_sg = load_from_source(
+            shacl_graph, rdf_format=shacl_graph_format, multigraph=True, do_owl_imports=do_owl_imports
+        )
+        rdflib_bool_unpatch()
+        if ont_graph is not None:
+            loaded_og = load_from_source(
+                ont_graph, rdf_format=ont_graph_format, multigraph=True, do_owl_imports=do_owl_imports, store=store
+            )
+        else:
+            loaded_og = None
+    if kwargs.pop('meta_shacl', False):
+        conforms, _, v_t, _ = meta_validate(loaded_sg, inference=inference)
+        if not conforms:
+            msg = "Shacl File does not validate against the Shacl Shapes Shacl file.\n{}".format(v_t)
+            log.error(msg)
+            raise ReportableRuntimeError(msg)
+    workers = int(kwargs.pop('workers', 1) or 1)
+    do_serialize_report_graph = kwargs.pop('serialize_report_graph', False)
+    if do_serialize_report_graph and not isinstance(do_serialize_report_graph, str):
+        do_serialize_report_graph = 'turtle'
+    shapes_graph = ShapesGraph(loaded_sg, log)
+    with nullcontext() if profiler is None else profiler.phase(PHASE_SHAPE_HARVEST):
+        _ = shapes_graph.shapes  # This property getter triggers shapes harvest.
+
+    def validate_document(source, document_profiler: Optional[Profiler]):
+        with nullcontext() if document_profiler is None else document_profiler.phase(PHASE_LOAD):
+            loaded_dg = load_from_source(
+                source, rdf_format=data_graph_format, multigraph=True, do_owl_imports=False, store=store
+            )
+        validator = Validator(
+            loaded_dg,
+            shacl_graph=shapes_graph,
+            ont_graph=loaded_og,
+            options={
+                'inference': inference,
+                'inplace': inplace,
+                'abort_on_first': abort_on_first,
+                'allow_warnings': allow_warnings,
+                'advanced': advanced,
+                'profiler': document_profiler,
+                'logger': log,
+                **run_options,
+            },
+        )
+        try:
+            conforms, report_graph, report_text, subgraph = validator.run()
+        except ValidationFailure as e:
+            conforms = False
+            report_graph = e
+            report_text = "Validation Failure - {}".format(e.message)
+            subgraph = set()
+        if do_serialize_report_graph and isinstance(report_graph, rdflib.Graph):
+            report_graph = report_graph.serialize(None, encoding='utf-8', format=do_serialize_report_graph)
+        return conforms, report_graph, report_text, subgraph
+
+    if workers > 1 and fork_context() is None:
+        log.warning("Cannot validate data graphs in parallel, this platform cannot fork processes.")
+        workers = 1
+    if workers > 1:
+        return _validate_documents_in_parallel(validate_document, data_sources, workers, profiler)
+    return (validate_document(source, profiler) for source in data_sources)
+
+
+def _validate_documents_in_parallel(validate_document: Callable, data_sources: Iterable, workers: int, profiler):
+    global _FORKED_BATCH
+
+    def validate_forked(source):
+        # Only send back what was recorded for this data graph
+        document_profiler = None if profiler is None else Profiler()
+        result = validate_document(source, document_profiler)
+        return result, None if document_profiler is None else document_profiler.to_dict()
+
+    _FORKED_BATCH = validate_forked
+    try:
+        with fork_context().Pool(processes=workers) as pool:
+            # imap hands the data graphs out one at a time, but gives the results back in order
+            for result, profile in pool.imap(_validate_forked_document, data_sources, chunksize=1):
+                if profile is not None:
+                    profiler.merge(profile)
+                yield result
+    finally:
+        _FORKED_BATCH = None
+
+
 def clean_validation_reports(actual_graph, actual_report, expected_graph, expected_report):
     # remove rdfs-added stuff
     # remove resultMessage if expected_report does not include result_message
@@ -0,0 +1,112 @@
+import pickle
+import unittest
+from rdflib import Dataset, Graph, Literal, Namespace, URIRef
+
+from pyshacl import validate
+from pyshacl.monkey import apply_patches
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:Student rdfs:subClassOf ex:Person .
+ex:Alice a ex:Student ; ex:name "Alice" ; ex:knows ex:Bob, ex:Carol .
+ex:Bob a ex:Student ; ex:knows ex:Alice .
+ex:Carol a ex:Person ; ex:name "Carol" .
+'''
+
+PATTERNS = [
+    (None, None, None),
+    (EX.Alice, None, None),
+    (EX.Alice, EX.knows, None),
+    (EX.Alice, None, EX.Bob),
+    (None, EX.knows, None),
+    (None, EX.knows, EX.Alice),
+    (None, None, EX.Alice),
+    (EX.Alice, EX.knows, EX.Bob),
+    (EX.Nobody, None, None),
+]
+
+
+def matches(graph, pattern):
+    return set(graph.triples(pattern))
+
+
+class TestCompactMemory(unittest.TestCase):
+
+    def setUp(self):
+        apply_patches()
+        self.expected = Graph("Memory2").parse(data=data_file, format="turtle")
+        self.graph = Graph("CompactMemory").parse(data=data_file, format="turtle")
+
+    def test_same_triples_as_memory2(self):
+        self.assertEqual(len(self.expected), len(self.graph))
+        for pattern in PATTERNS:
+            self.assertEqual(matches(self.expected, pattern), matches(self.graph, pattern), pattern)
+        self.assertIn((EX.Carol, EX.name, Literal("Carol")), self.graph)
+        self.assertNotIn((EX.Carol, EX.name, Literal("Alice")), self.graph)
+
+    def test_remove(self):
+        for graph in (self.expected, self.graph):
+            graph.remove((EX.Alice, EX.knows, None))
+            graph.remove((None, None, EX.Student))
+            # Removing a triple that is not there changes nothing
+            graph.remove((EX.Nobody, EX.knows, EX.Alice))
+        self.assertEqual(len(self.expected), len(self.graph))
+        for pattern in PATTERNS:
+            self.assertEqual(matches(self.expected, pattern), matches(self.graph, pattern), pattern)
+        self.graph.add((EX.Alice, EX.knows, EX.Bob))
+        self.assertEqual({EX.Bob}, set(self.graph.objects(EX.Alice, EX.knows)))
+
+    def test_named_graphs(self):
+        ds = Dataset(store="CompactMemory")
+        first = ds.graph(URIRef("urn:first"))
+        second = ds.graph(URIRef("urn:second"))
+        first.add((EX.Alice, EX.name, Literal("Alice")))
+        first.add((EX.Bob, EX.name, Literal("Bob")))
+        second.add((EX.Alice, EX.name, Literal("Alice")))
+        self.assertEqual(2, len(first))
+        self.assertEqual(1, len(second))
+        self.assertEqual(
+            {URIRef("urn:first"), URIRef("urn:second")},
+            {c.identifier for c in ds.store.contexts((EX.Alice, EX.name, Literal("Alice")))},
+        )
+        first.remove((EX.Alice, None, None))
+        self.assertEqual(1, len(first))
+        self.assertIn((EX.Alice, EX.name, Literal("Alice")), second)
+        ds.remove_graph(second)
+        self.assertNotIn((EX.Alice, EX.name, Literal("Alice")), ds.graph(URIRef("urn:second")))
+        self.assertEqual({(EX.Bob, EX.name, Literal("Bob"))}, set(first))
+
+    def test_pickles(self):
+        copy = Graph(store=pickle.loads(pickle.dumps(self.graph.store)), identifier=self.graph.identifier)
+        self.assertEqual(set(self.graph), set(copy))
+
+    def test_validate_with_store(self):
+        shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+        expected = validate(data_file, shacl_graph=shacl_graph, data_graph_format="turtle", inference='rdfs')
+        result = validate(
+            data_file, shacl_graph=shacl_graph, data_graph_format="turtle", inference='rdfs', store="CompactMemory"
+        )
+        self.assertFalse(result[0])
+        self.assertEqual(expected[0], result[0])
+        self.assertEqual(expected[2], result[2])
+        self.assertEqual(expected[3], result[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
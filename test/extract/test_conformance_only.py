@@ -0,0 +1,82 @@
+import unittest
+from rdflib import Graph, Namespace
+
+from pyshacl import Validator
+from pyshacl.helper.path_helper import (
+    PATH_INVERSE,
+    PATH_ONE_OR_MORE,
+    PATH_PREDICATE,
+    PATH_SEQUENCE,
+    PATH_ZERO_OR_MORE,
+    PathEvaluator,
+)
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ProductShape a sh:NodeShape ;
+  sh:targetClass ex:Product ;
+  sh:property [ sh:path ex:name ; sh:minCount 1 ] ;
+  sh:property [ sh:path ( ex:madeBy ex:locatedIn ) ; sh:class ex:Country ] ;
+  sh:property [ sh:path [ sh:oneOrMorePath ex:broader ] ; sh:minCount 1 ] ;
+  sh:property [ sh:path ex:madeBy ; sh:node ex:CompanyShape ] .
+
+ex:CompanyShape a sh:NodeShape ;
+  sh:property [ sh:path ex:name ; sh:minCount 1 ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:France a ex:Country .
+ex:ACME ex:name "ACME" ; ex:locatedIn ex:France .
+ex:Nameless ex:locatedIn ex:France .
+ex:Tools ex:broader ex:Things .
+ex:Things ex:broader ex:Tools .
+ex:Hammer a ex:Product ; ex:name "Hammer" ; ex:madeBy ex:ACME ; ex:broader ex:Tools .
+ex:Saw a ex:Product ; ex:name "Saw" ; ex:madeBy ex:Nameless ; ex:broader ex:Tools .
+ex:Drill a ex:Product ; ex:madeBy ex:ACME .
+'''
+
+
+class TestConformanceOnly(unittest.TestCase):
+
+    def test_same_results_without_fragment(self):
+        data_graph = Graph().parse(data=data_file, format="turtle")
+        shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+        full = Validator(data_graph, shacl_graph=shacl_graph).run()
+        validator = Validator(data_graph, shacl_graph=shacl_graph, options={'conformance_only': True})
+        conforms, report_graph, report_text, fragment = validator.run()
+        self.assertFalse(conforms)
+        self.assertEqual(full[0], conforms)
+        self.assertEqual(len(full[1]), len(report_graph))
+        self.assertEqual(len(fragment), 0)
+        self.assertGreater(len(full[3]), 0)
+        # The Shapes Graph is left ready for a run that extracts the fragment
+        self.assertTrue(validator.shacl_graph.extract_fragment)
+
+    def test_path_evaluator_without_witnesses(self):
+        data_graph = Graph().parse(data=data_file, format="turtle")
+        made_by = (PATH_PREDICATE, EX.madeBy, EX.madeBy)
+        located_in = (PATH_PREDICATE, EX.locatedIn, EX.locatedIn)
+        broader = (PATH_PREDICATE, EX.broader, EX.broader)
+        paths = [
+            made_by,
+            (PATH_INVERSE, 'inv', made_by),
+            (PATH_SEQUENCE, 'seq', (made_by, located_in)),
+            (PATH_ONE_OR_MORE, 'oom', broader),
+            (PATH_ZERO_OR_MORE, 'zom', broader),
+        ]
+        for node in (EX.Hammer, EX.Tools, EX.ACME):
+            for expression in paths:
+                with_witnesses = PathEvaluator(None, data_graph).evaluate(node, expression)
+                without_witnesses = PathEvaluator(None, data_graph, witnesses=False).evaluate(node, expression)
+                self.assertEqual(set(with_witnesses), set(without_witnesses))
+                self.assertTrue(all(len(w) == 0 for w in without_witnesses.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+from rdflib import RDF, Graph, Literal, Namespace
+from rdflib.compare import isomorphic
+
+from pyshacl import Validator
+from pyshacl.consts import SH
+from pyshacl.frozen_graph import FrozenGraph
+from pyshacl.shape import Shape
+from pyshacl.target_index import TargetIndex
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property ex:NameCount, ex:KnownByCount, ex:NameDatatype .
+
+ex:NameCount sh:path ex:name ; sh:minCount 1 ; sh:maxCount 1 .
+ex:KnownByCount sh:path [ sh:inversePath ex:knows ] ; sh:maxCount 1 .
+ex:NameDatatype sh:path ex:name ; sh:datatype xsd:string ; sh:maxCount 1 .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:Alice a ex:Person ; ex:name "Alice" ; ex:knows ex:Bob .
+ex:Bob a ex:Person ; ex:name "Bob", "Robert" .
+ex:Carol a ex:Person ; ex:knows ex:Bob .
+ex:Dan a ex:Person ; ex:name "Dan" ; ex:knows ex:Alice .
+'''
+
+
+def run(**options):
+    data_graph = Graph().parse(data=data_file, format="turtle")
+    shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+    validator = Validator(data_graph, shacl_graph=shacl_graph, options=options)
+    return validator, validator.run()
+
+
+class TestCountPath(unittest.TestCase):
+
+    def test_count_path_of_plans(self):
+        validator, _ = run()
+        sg = validator.shacl_graph
+        count_paths = {s.node: sg.shape_plan(s).count_path for s in sg.shapes if s.is_property_shape}
+        self.assertEqual((EX.name, True), count_paths[EX.NameCount])
+        self.assertEqual((EX.knows, False), count_paths[EX.KnownByCount])
+        # The value nodes are needed for sh:datatype anyway
+        self.assertIsNone(count_paths[EX.NameDatatype])
+
+    def test_degrees(self):
+        data_graph = Graph().parse(data=data_file, format="turtle")
+        index = TargetIndex(data_graph)
+        frozen_index = TargetIndex(data_graph, FrozenGraph(data_graph))
+        self.assertEqual({EX.Alice: 1, EX.Bob: 2, EX.Dan: 1}, index.degrees(EX.name))
+        self.assertEqual({EX.Bob: 2, EX.Alice: 1}, index.degrees(EX.knows, False))
+        for predicate in (EX.name, EX.knows, EX.nothing):
+            for forward in (True, False):
+                self.assertEqual(index.degrees(predicate, forward), frozen_index.degrees(predicate, forward))
+
+    def test_same_results_as_value_nodes(self):
+        for options in ({}, {'freeze': True}):
+            with mock.patch.object(Shape, '_value_node_counts', return_value=None):
+                _, expected = run(conformance_only=True, **options)
+            _, (conforms, report_graph, _, _) = run(conformance_only=True, **options)
+            self.assertFalse(conforms)
+            self.assertTrue(isomorphic(expected[1], report_graph))
+            # Bob has two names (for both shapes on ex:name) and is known by two people, Carol has no name
+            self.assertEqual(4, len(list(report_graph.subjects(RDF.type, SH.ValidationResult))))
+
+    def test_value_nodes_for_fragment(self):
+        # The neighborhoods need the value nodes, so they are found rather than counted
+        _, (conforms, _, _, fragment) = run()
+        self.assertFalse(conforms)
+        self.assertIn((EX.Alice, EX.name, Literal("Alice")), fragment)
+        self.assertIn((EX.Dan, EX.knows, EX.Alice), fragment)
+        self.assertFalse({t for t in fragment if t[0] in (EX.Bob, EX.Carol) and t[1] == EX.name})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+from rdflib import Graph, Literal
+
+from pyshacl import Validator, validate
+from pyshacl.consts import SH_conforms, SH_result
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [
+    sh:path ex:worksFor ;
+    sh:node ex:CompanyShape ;
+  ] ;
+  sh:property [
+    sh:path ex:knows ;
+    sh:or ( [ sh:class ex:Person ] [ sh:class ex:Company ] ) ;
+  ] .
+
+ex:CompanyShape a sh:NodeShape ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] .
+
+ex:NicknameShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:severity sh:Warning ;
+  sh:property [
+    sh:path ex:nickname ;
+    sh:minCount 1 ;
+  ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:Alice a ex:Person ; ex:worksFor ex:ACME ; ex:knows ex:Bob ; ex:nickname "Al" .
+ex:Bob a ex:Person ; ex:worksFor ex:ACME ; ex:knows ex:ACME ; ex:nickname "Bobby" .
+ex:Carol a ex:Person ; ex:worksFor ex:Nameless ; ex:knows ex:Rover ; ex:nickname "C" .
+ex:Dave a ex:Person ; ex:worksFor ex:ACME ; ex:knows ex:Alice .
+ex:ACME a ex:Company ; ex:name "ACME" .
+'''
+
+
+def run(**options):
+    data_graph = Graph().parse(data=data_file, format="turtle")
+    shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+    validator = Validator(data_graph, shacl_graph=shacl_graph, options=options)
+    return validator, validator.run()
+
+
+class TestFragmentOnly(unittest.TestCase):
+
+    def test_same_fragment_without_results(self):
+        _, full = run()
+        _, (conforms, report_graph, report_text, fragment) = run(fragment_only=True)
+        self.assertFalse(conforms)
+        self.assertEqual(full[0], conforms)
+        self.assertEqual(full[3], fragment)
+        self.assertEqual(0, len(list(report_graph.objects(None, SH_result))))
+        self.assertEqual([Literal(False)], list(report_graph.objects(None, SH_conforms)))
+        self.assertEqual("Validation Report\nConforms: False\n", report_text)
+
+    def test_allow_warnings(self):
+        _, full = run(allow_warnings=True)
+        _, (conforms, _, _, fragment) = run(allow_warnings=True, fragment_only=True)
+        self.assertEqual(full[0], conforms)
+        self.assertEqual(full[3], fragment)
+
+    def test_run_options_are_not_for_meta_shacl(self):
+        sink = []
+        with mock.patch('pyshacl.validate.meta_validate', return_value=(True, None, "", set())) as meta_validate:
+            conforms, report_graph, _, fragment = validate(
+                data_file,
+                shacl_graph=shapes_file,
+                data_graph_format="turtle",
+                shacl_graph_format="turtle",
+                meta_shacl=True,
+                fragment_only=True,
+                fragment_sink=sink.extend,
+                workers=1,
+                shard_size=10,
+            )
+        self.assertEqual(1, meta_validate.call_count)
+        for option in ('fragment_only', 'conformance_only', 'fragment_sink', 'workers', 'shard_size'):
+            self.assertNotIn(option, meta_validate.call_args.kwargs)
+        # They still apply to the validation of the data graph
+        self.assertFalse(conforms)
+        self.assertEqual(0, len(list(report_graph.objects(None, SH_result))))
+        self.assertTrue(sink)
+        self.assertEqual(set(), fragment)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import unittest
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from examples import example3, example_qvc
+from pyshacl import validate
+from pyshacl.fragment_sink import CallbackFragmentSink, NTriplesFragmentSink
+
+
+def run(input_file, **kwargs):
+    return validate(input_file.return_data_file(), shacl_graph=input_file.return_shapes_file(),
+                    data_graph_format="turtle",
+                    shacl_graph_format="turtle",
+                    inference='rdfs', **kwargs)
+
+
+class TestFragmentSink(unittest.TestCase):
+
+    def test_callback_receives_the_fragment(self):
+        for example in (example3, example_qvc):
+            with self.subTest(example=example.__name__):
+                batches = []
+                _, _, _, subgraph = run(example, fragment_sink=batches.append)
+                self.assertEqual(subgraph, set())
+                streamed = Graph()
+                for batch in batches:
+                    for triple in batch:
+                        streamed.add(triple)
+                expected = Graph()
+                for triple in run(example)[3]:
+                    expected.add(triple)
+                self.assertTrue(isomorphic(streamed, expected))
+
+    def test_ntriples_sink(self):
+        stream = io.StringIO()
+        sink = NTriplesFragmentSink(stream)
+        _, _, _, _ = run(example3, fragment_sink=sink)
+        sink.close()
+        streamed = Graph().parse(data=stream.getvalue(), format="nt")
+        self.assertEqual(len(streamed), sink.count)
+        expected = Graph()
+        for triple in run(example3)[3]:
+            expected.add(triple)
+        self.assertTrue(isomorphic(streamed, expected))
+
+    def test_bounded_dedupe(self):
+        emitted = []
+        sink = CallbackFragmentSink(emitted.extend, capacity=2)
+        sink.add([1, 2, 1])
+        self.assertEqual(emitted, [1, 2])
+        sink.add([3])
+        self.assertEqual(emitted, [1, 2, 3])
+        # 1 was seen again more recently than 2, so 2 dropped out of the window of recently seen triples
+        sink.add([1, 2])
+        self.assertEqual(emitted, [1, 2, 3, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+from rdflib import Graph, Literal, Namespace
+from rdflib.compare import isomorphic
+
+from pyshacl import validate
+from pyshacl import frozen_graph
+from pyshacl.frozen_graph import FrozenGraph
+from pyshacl.profiler import PHASE_FREEZE, Profiler
+
+EX = Namespace("http://example.com/ns#")
+RDF_type = Namespace("http://www.w3.org/1999/02/22-rdf-syntax-ns#").type
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] ;
+  sh:property [
+    sh:path ( ex:knows [ sh:zeroOrMorePath ex:knows ] ) ;
+    sh:class ex:Person ;
+  ] ;
+  sh:property [
+    sh:path [ sh:inversePath ex:knows ] ;
+    sh:maxCount 1 ;
+  ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:Student rdfs:subClassOf ex:Person .
+ex:Alice a ex:Student ; ex:name "Alice" ; ex:knows ex:Bob, ex:Carol .
+ex:Bob a ex:Student ; ex:knows ex:Alice, ex:Dan .
+ex:Carol a ex:Person ; ex:name "Carol", "Caz" ; ex:knows ex:Alice .
+ex:Dan ex:name "Dan" .
+'''
+
+NODES = [EX.Alice, EX.Bob, EX.Carol, EX.Dan, EX.Student, EX.Person, Literal("Alice"), EX.Nobody]
+PREDICATES = [EX.name, EX.knows, RDF_type, EX.nothing]
+
+
+class TestFrozenGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph().parse(data=data_file, format="turtle")
+
+    def assertSameLookups(self, frozen):
+        self.assertEqual(len(self.graph), len(frozen))
+        for p in PREDICATES:
+            self.assertEqual(sorted(self.graph.subject_objects(p)), sorted(frozen.subject_objects(p)), p)
+            for n in NODES:
+                self.assertEqual(sorted(self.graph.objects(n, p)), sorted(frozen.objects(n, p)), (n, p))
+                self.assertEqual(sorted(self.graph.subjects(p, n)), sorted(frozen.subjects(p, n)), (p, n))
+
+    def test_same_lookups_as_graph(self):
+        frozen = FrozenGraph(self.graph)
+        self.assertIs(self.graph, frozen.graph)
+        self.assertSameLookups(frozen)
+        self.assertEqual({'terms': 10, 'predicates': 4, 'triples': len(self.graph)}, frozen.stats())
+
+    def test_same_lookups_without_numpy(self):
+        with mock.patch.object(frozen_graph, '_numpy', lambda: None):
+            self.assertSameLookups(FrozenGraph(self.graph))
+
+    def test_empty_graph(self):
+        frozen = FrozenGraph(Graph())
+        self.assertEqual(0, len(frozen))
+        self.assertEqual([], frozen.objects(EX.Alice, EX.knows))
+        self.assertEqual([], list(frozen.subject_objects(EX.knows)))
+
+    def test_snapshot_does_not_follow_changes(self):
+        frozen = FrozenGraph(self.graph)
+        self.graph.add((EX.Dan, EX.knows, EX.Alice))
+        self.assertEqual([], frozen.objects(EX.Dan, EX.knows))
+
+    def test_validate_frozen(self):
+        shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+        for inference in ('none', 'rdfs'):
+            expected = validate(data_file, shacl_graph=shacl_graph, data_graph_format="turtle", inference=inference)
+            profiler = Profiler()
+            result = validate(
+                data_file,
+                shacl_graph=shacl_graph,
+                data_graph_format="turtle",
+                inference=inference,
+                freeze=True,
+                profiler=profiler,
+            )
+            self.assertFalse(result[0])
+            self.assertEqual(expected[0], result[0])
+            # The results can be in another order
+            self.assertTrue(isomorphic(expected[1], result[1]))
+            self.assertEqual(expected[3], result[3])
+            self.assertEqual(1, profiler.phases[PHASE_FREEZE]['calls'])
+
+
+if __name__ == "__main__":
+    unittest.main()
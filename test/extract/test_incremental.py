@@ -0,0 +1,151 @@
+import re
+import unittest
+from rdflib import Graph, Literal, Namespace, RDF
+
+from pyshacl import Validator
+from pyshacl.errors import ReportableRuntimeError
+from pyshacl.incremental import DependencyIndex
+from pyshacl.profiler import PHASE_CONSTRAINT_EVALUATE, Profiler
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] ;
+  sh:property [
+    sh:path ex:worksFor ;
+    sh:node ex:CompanyShape ;
+  ] .
+
+ex:CompanyShape a sh:NodeShape ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] .
+
+ex:FriendShape a sh:NodeShape ;
+  sh:targetSubjectsOf ex:knows ;
+  sh:sparql [
+    sh:select """
+      SELECT $this ?value WHERE {
+        $this <http://example.com/ns#knows> ?value .
+        FILTER NOT EXISTS { ?value a <http://example.com/ns#Person> }
+      }
+    """ ;
+  ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:Alice a ex:Person ; ex:name "Alice" ; ex:worksFor ex:ACME ; ex:knows ex:Bob .
+ex:Bob a ex:Person ; ex:name "Bob" ; ex:worksFor ex:ACME .
+ex:Carol a ex:Person ; ex:name "Carol" ; ex:worksFor ex:Initech .
+ex:Dave a ex:Person ; ex:worksFor ex:Nameless ; ex:knows ex:Zed .
+ex:ACME ex:name "ACME" .
+ex:Initech ex:name "Initech" .
+'''
+
+bad_pattern_shape = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:BadShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [ sh:path ex:name ; sh:pattern "(" ] .
+'''
+
+
+def load():
+    data_graph = Graph().parse(data=data_file, format="turtle")
+    shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+    return data_graph, shacl_graph
+
+
+def evaluations(profiler):
+    return profiler.phases[PHASE_CONSTRAINT_EVALUATE]['calls']
+
+
+class TestIncremental(unittest.TestCase):
+
+    def assertSameAsFullRun(self, data_graph, shacl_graph, result):
+        conforms, report_graph, report_text, fragment = result
+        full = Validator(data_graph, shacl_graph=shacl_graph).run()
+        self.assertEqual(full[0], conforms)
+        self.assertEqual(len(full[1]), len(report_graph))
+        self.assertEqual(full[3], fragment)
+
+    def test_delta_patches_results_and_fragment(self):
+        data_graph, shacl_graph = load()
+        validator = Validator(data_graph, shacl_graph=shacl_graph, options={'incremental': True})
+        self.assertSameAsFullRun(data_graph, shacl_graph, validator.run())
+        deltas = [
+            # Dave gets a name, his company gets one too
+            ([(EX.Dave, EX.name, Literal("Dave")), (EX.Nameless, EX.name, Literal("Nameless"))], []),
+            # Zed becomes a person, so is a good friend of Dave, but has no name
+            ([(EX.Zed, RDF.type, EX.Person)], []),
+            # ACME loses its name, Alice and Bob no longer conform
+            ([], [(EX.ACME, EX.name, Literal("ACME"))]),
+            # Alice no longer knows Bob, so is not a focus node of ex:FriendShape anymore
+            ([(EX.Zed, EX.name, Literal("Zed"))], [(EX.Alice, EX.knows, EX.Bob)]),
+        ]
+        for added, removed in deltas:
+            result = validator.apply_delta(added=added, removed=removed)
+            self.assertSameAsFullRun(data_graph, shacl_graph, result)
+
+    def test_only_affected_focus_nodes_are_revalidated(self):
+        data_graph, shacl_graph = load()
+        profiler = Profiler()
+        validator = Validator(data_graph, shacl_graph=shacl_graph, options={'incremental': True, 'profiler': profiler})
+        validator.run()
+        calls = evaluations(profiler)
+        # No evaluation read anything about ex:Zed's age
+        validator.apply_delta(added=[(EX.Zed, EX.age, Literal(30))])
+        self.assertEqual(calls, evaluations(profiler))
+        # Only ex:Carol's evaluation against ex:PersonShape read ex:Initech's name,
+        # that is its 2 property shapes, and then ex:CompanyShape and its property shape, again.
+        validator.apply_delta(removed=[(EX.Initech, EX.name, Literal("Initech"))])
+        self.assertEqual(calls + 4, evaluations(profiler))
+        self.assertSameAsFullRun(data_graph, shacl_graph, validator.apply_delta())
+
+    def test_apply_delta_needs_incremental_run(self):
+        data_graph, shacl_graph = load()
+        validator = Validator(data_graph, shacl_graph=shacl_graph)
+        validator.run()
+        with self.assertRaises(ReportableRuntimeError):
+            validator.apply_delta(added=[(EX.Dave, EX.name, Literal("Dave"))])
+
+    def test_failed_run_clears_run_state(self):
+        data_graph, shacl_graph = load()
+        shacl_graph.parse(data=bad_pattern_shape, format="turtle")
+        validator = Validator(data_graph, shacl_graph=shacl_graph, options={'incremental': True})
+        with self.assertRaises(re.error):
+            validator.run()
+        # A later run with the same Shapes Graph must not inherit the index or the recorder of the failed one
+        sg = validator.shacl_graph
+        self.assertIsNone(sg.target_index)
+        self.assertIsNone(sg.read_recorder)
+        self.assertIsNone(sg.memo)
+        self.assertIsNone(sg.typed_literals)
+
+    def test_dependency_index(self):
+        index = DependencyIndex()
+        index.set('a', [(EX.Alice, EX.name, None)])
+        index.set('b', [(None, RDF.type, EX.Person), (EX.Bob, None, None)])
+        self.assertEqual({'a'}, index.affected([(EX.Alice, EX.name, Literal("Alice"))]))
+        self.assertEqual({'b'}, index.affected([(EX.Zed, RDF.type, EX.Person)]))
+        self.assertEqual({'a', 'b'}, index.affected([(EX.Alice, EX.name, Literal("A")), (EX.Bob, EX.age, Literal(3))]))
+        index.discard('b')
+        self.assertEqual(set(), index.affected([(EX.Bob, EX.age, Literal(3))]))
+        self.assertEqual(1, len(index))
+
+
+if __name__ == "__main__":
+    unittest.main()
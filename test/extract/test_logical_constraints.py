@@ -0,0 +1,74 @@
+import unittest
+from rdflib import Literal, Namespace
+
+from pyshacl import Validator
+from pyshacl.consts import SH_focusNode, SH_result
+from pyshacl.rdfutil import load_from_source
+
+EX = Namespace("http://example.com/ns#")
+
+not_shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ItemShape a sh:NodeShape ;
+  sh:targetClass ex:Item ;
+  sh:not [ sh:class ex:D ] .
+'''
+
+xone_shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ItemShape a sh:NodeShape ;
+  sh:targetClass ex:Item ;
+  sh:xone ( ex:NamedShape ex:LabelledShape ) .
+
+ex:NamedShape sh:property [ sh:path ex:name ; sh:minCount 1 ] .
+ex:LabelledShape sh:property [ sh:path ex:label ; sh:minCount 1 ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:i1 a ex:Item ; ex:name "one" .
+ex:i2 a ex:Item, ex:D ; ex:label "two" .
+ex:i3 a ex:Item ; ex:name "three" ; ex:label "three" .
+'''
+
+
+def run(shapes_file, **options):
+    data_graph = load_from_source(data_file, rdf_format="turtle")
+    shacl_graph = load_from_source(shapes_file, rdf_format="turtle")
+    return Validator(data_graph, shacl_graph=shacl_graph, options=options).run()
+
+
+def focus_nodes(report_graph):
+    return {f for r in report_graph.objects(None, SH_result) for f in report_graph.objects(r, SH_focusNode)}
+
+
+class TestLogicalConstraints(unittest.TestCase):
+
+    def test_not(self):
+        for options in ({}, {'conformance_only': True}):
+            conforms, report_graph, _, _ = run(not_shapes_file, **options)
+            self.assertFalse(conforms)
+            self.assertEqual({EX.i2}, focus_nodes(report_graph))
+        _, _, _, subgraph = run(not_shapes_file)
+        # Only the focus nodes that conform are in the fragment, a node that is not an ex:D has no witnesses
+        self.assertFalse(any(t[0] == EX.i2 for t in subgraph))
+
+    def test_xone(self):
+        for options in ({}, {'conformance_only': True}):
+            conforms, report_graph, _, _ = run(xone_shapes_file, **options)
+            self.assertFalse(conforms)
+            self.assertEqual({EX.i3}, focus_nodes(report_graph))
+        _, _, _, subgraph = run(xone_shapes_file)
+        # The neighborhood of the one shape that each conforming focus node conforms to
+        self.assertIn((EX.i1, EX.name, Literal("one")), subgraph)
+        self.assertIn((EX.i2, EX.label, Literal("two")), subgraph)
+        self.assertFalse(any(t[0] == EX.i3 for t in subgraph))
+
+
+if __name__ == '__main__':
+    unittest.main()
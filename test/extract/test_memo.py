@@ -0,0 +1,82 @@
+import unittest
+from rdflib import Literal, Namespace
+
+from pyshacl import Validator
+from pyshacl.consts import SH_result
+from pyshacl.rdfutil import load_from_source
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [
+    sh:path ex:worksFor ;
+    sh:node ex:CompanyShape ;
+  ] .
+
+ex:CompanyShape a sh:NodeShape ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] .
+
+ex:EmployeeShape a sh:NodeShape ;
+  sh:targetClass ex:Employee ;
+  sh:property [
+    sh:path ex:worksFor ;
+    sh:property [
+      sh:path ex:name ;
+      sh:minCount 1 ;
+    ] ;
+  ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:Alice a ex:Person ; ex:worksFor ex:ACME .
+ex:Bob a ex:Person ; ex:worksFor ex:ACME .
+ex:Carol a ex:Person ; ex:worksFor ex:ACME .
+ex:Dave a ex:Person ; ex:worksFor ex:Nameless .
+ex:Erin a ex:Employee ; ex:worksFor ex:Nameless .
+ex:Frank a ex:Employee ; ex:worksFor ex:Nameless .
+ex:ACME ex:name "ACME" .
+'''
+
+
+def run_validator():
+    data_graph = load_from_source(data_file, rdf_format="turtle")
+    shacl_graph = load_from_source(shapes_file, rdf_format="turtle")
+    validator = Validator(data_graph, shacl_graph=shacl_graph)
+    return validator, validator.run()
+
+
+class TestShapeMemo(unittest.TestCase):
+
+    def test_shared_value_node_is_evaluated_once(self):
+        validator, (conforms, _, _, subgraph) = run_validator()
+        self.assertFalse(conforms)
+        # ex:ACME is reached from three focus nodes, but only validated against ex:CompanyShape once
+        self.assertGreaterEqual(validator.memo.hits, 2)
+        self.assertIn((EX.Alice, EX.worksFor, EX.ACME), subgraph)
+        self.assertIn((EX.Carol, EX.worksFor, EX.ACME), subgraph)
+        self.assertIn((EX.ACME, EX.name, Literal("ACME")), subgraph)
+        self.assertFalse(any(t[0] in (EX.Dave, EX.Erin, EX.Frank) for t in subgraph))
+
+    def test_memoized_reports_get_fresh_result_nodes(self):
+        # Erin and Frank share ex:Nameless, each of them still gets its own result in the report
+        _, (_, report_graph, _, _) = run_validator()
+        results = set(report_graph.objects(None, SH_result))
+        self.assertEqual(len(results), 3)
+
+    def test_memo_is_detached_after_run(self):
+        validator, _ = run_validator()
+        self.assertIsNone(validator.shacl_graph.memo)
+
+
+if __name__ == '__main__':
+    unittest.main()
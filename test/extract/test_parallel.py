@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+from rdflib.compare import isomorphic
+
+from examples import example3, example_and, example_class, example_or, example_qvc
+from pyshacl import ShapesGraph, Validator
+from pyshacl import parallel
+from pyshacl.parallel import fork_context
+from pyshacl.rdfutil import load_from_source
+from pyshacl.result import ValidationResult
+from pyshacl.shape import Shape
+
+
+def run(input_file, data_graph, workers, **options):
+    shacl_graph = load_from_source(input_file.return_shapes_file(), rdf_format="turtle")
+    options = dict(options, inference='rdfs', workers=workers)
+    validator = Validator(data_graph, shacl_graph=shacl_graph, options=options)
+    return validator.run()
+
+
+def parallel_reports(input_file, **options):
+    # The reports of each shape as merged from the workers, with whether their description was made yet
+    merged = []
+
+    def validate_shapes(*args, **kwargs):
+        for result in parallel.validate_shapes_in_parallel(*args, **kwargs):
+            merged.extend((r, getattr(r, '_description', None) is not None) for r in result[1])
+            yield result
+
+    data_graph = load_from_source(input_file.return_data_file(), rdf_format="turtle")
+    with mock.patch('pyshacl.validate.validate_shapes_in_parallel', validate_shapes):
+        run(input_file, data_graph, 2, **options)
+    return merged
+
+
+@unittest.skipIf(fork_context() is None, "needs a platform that can fork")
+class TestParallelShapes(unittest.TestCase):
+
+    def test_same_output_as_serial_run(self):
+        for example in (example3, example_or, example_and, example_qvc, example_class):
+            with self.subTest(example=example.__name__):
+                data_graph = load_from_source(example.return_data_file(), rdf_format="turtle")
+                s_conforms, s_report, s_text, s_subgraph = run(example, data_graph, 1)
+                p_conforms, p_report, p_text, p_subgraph = run(example, data_graph, 2)
+                self.assertEqual(s_conforms, p_conforms)
+                self.assertEqual(s_text, p_text)
+                self.assertEqual(s_subgraph, p_subgraph)
+                self.assertTrue(isomorphic(s_report, p_report))
+
+    def test_lazy_reports(self):
+        reports = parallel_reports(example_class)
+        self.assertTrue(reports)
+        for r, described in reports:
+            # Rebuilt in the parent, and only made into a description when the report is built
+            self.assertIsInstance(r, ValidationResult)
+            self.assertFalse(described)
+        self.assertEqual([], parallel_reports(example_class, fragment_only=True))
+
+    def test_results_are_streamed(self):
+        # The last shape only finishes once the results of the first shape have been handed back
+        data_graph = load_from_source(example_class.return_data_file(), rdf_format="turtle")
+        sg = ShapesGraph(load_from_source(example_class.return_shapes_file(), rdf_format="turtle"))
+        shapes = list(sg.shapes)
+        self.assertGreater(len(shapes), 1)
+        context = fork_context()
+        released = context.Event()
+        timed_out = context.Value('b', 0)
+        validate = Shape.validate
+
+        def validate_last_when_released(shape, *args, **kwargs):
+            if shape is shapes[-1] and not released.wait(10):
+                timed_out.value = 1
+            return validate(shape, *args, **kwargs)
+
+        with mock.patch.object(Shape, 'validate', validate_last_when_released):
+            results = parallel.validate_shapes_in_parallel(shapes, data_graph, sg, 2)
+            first = next(results)
+            released.set()
+            rest = list(results)
+        self.assertFalse(timed_out.value)
+        self.assertEqual(len(rest), len(shapes) - 1)
+        conforms, reports, _ = validate(shapes[0], data_graph)
+        self.assertEqual(first[0], conforms)
+        self.assertEqual([r.focus_node for r in first[1]], [r.focus_node for r in reports])
+
+
+if __name__ == '__main__':
+    unittest.main()
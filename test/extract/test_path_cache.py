@@ -0,0 +1,95 @@
+import unittest
+from rdflib import BNode, Graph, Namespace
+
+from pyshacl import Validator
+from pyshacl.helper.path_helper import PATH_INVERSE, PATH_PREDICATE, PATH_SEQUENCE, PathEvaluator, path_signature
+from pyshacl.path_cache import PathCache
+from pyshacl.profiler import COUNT_PATH_CACHE_HITS, COUNT_PATH_CACHE_MISSES, Profiler
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+ex:NameDatatypeShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [ sh:path ex:name ; sh:datatype xsd:string ] .
+
+ex:NameCountShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [ sh:path ex:name ; sh:minCount 1 ; sh:maxCount 1 ] .
+
+ex:NamePatternShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [ sh:path ex:name ; sh:pattern "^[A-Z]" ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:Alice a ex:Person ; ex:name "Alice" .
+ex:Bob a ex:Person ; ex:name "bob", "Robert" .
+ex:Carol a ex:Person .
+'''
+
+
+def run(**options):
+    data_graph = Graph().parse(data=data_file, format="turtle")
+    shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+    validator = Validator(data_graph, shacl_graph=shacl_graph, options=options)
+    return validator, validator.run()
+
+
+class TestPathCache(unittest.TestCase):
+
+    def test_shared_across_shapes(self):
+        profiler = Profiler()
+        validator, (conforms, report_graph, _, fragment) = run(profiler=profiler)
+        _, uncached = run(path_cache_size=0)
+        self.assertFalse(conforms)
+        self.assertEqual(uncached[0], conforms)
+        self.assertEqual(len(uncached[1]), len(report_graph))
+        self.assertEqual(uncached[3], fragment)
+        # The first shape walks ex:name from each of the 3 people, the other two reuse it,
+        # as do the evaluations of the 3 non-conforming (shape, person) pairs on their own
+        self.assertEqual({'entries': 3, 'hits': 9, 'misses': 3, 'evictions': 0}, validator.path_cache.stats())
+        self.assertEqual(9, profiler.counters[COUNT_PATH_CACHE_HITS])
+        self.assertEqual(3, profiler.counters[COUNT_PATH_CACHE_MISSES])
+        self.assertAlmostEqual(9 / 12, profiler.to_dict()['hit rates']['path cache'])
+        self.assertIsNone(validator.shacl_graph.path_cache)
+
+    def test_least_recently_used_are_evicted(self):
+        data_graph = Graph().parse(data=data_file, format="turtle")
+        evaluator = PathEvaluator(None, data_graph)
+        name = (PATH_PREDICATE, EX.name, EX.name)
+        cache = PathCache(2)
+        cache.evaluate(evaluator, EX.Alice, name)
+        bob = cache.evaluate(evaluator, EX.Bob, name)
+        cache.evaluate(evaluator, EX.Alice, name)
+        cache.evaluate(evaluator, EX.Carol, name)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.evictions)
+        # Bob was the least recently used entry
+        self.assertIsNot(bob, cache.evaluate(evaluator, EX.Bob, name))
+        self.assertEqual(set(bob), set(cache.evaluate(evaluator, EX.Bob, name)))
+        self.assertEqual({'entries': 2, 'hits': 2, 'misses': 4, 'evictions': 2}, cache.stats())
+
+    def test_same_structure_shares_entries(self):
+        data_graph = Graph().parse(data=data_file, format="turtle")
+        evaluator = PathEvaluator(None, data_graph)
+        name = (PATH_PREDICATE, EX.name, EX.name)
+        # The same path, written out as two different RDF lists
+        first = (PATH_SEQUENCE, BNode(), ((PATH_INVERSE, BNode(), name), name))
+        second = (PATH_SEQUENCE, BNode(), ((PATH_INVERSE, BNode(), name), name))
+        self.assertEqual(path_signature(first), path_signature(second))
+        self.assertNotEqual(path_signature(first), path_signature(name))
+        cache = PathCache()
+        paths = cache.evaluate(evaluator, EX.Alice, first)
+        self.assertIs(paths, cache.evaluate(evaluator, EX.Alice, second))
+        self.assertEqual({'entries': 1, 'hits': 1, 'misses': 1, 'evictions': 0}, cache.stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+from rdflib import Graph, Namespace
+
+from pyshacl import ShapesGraph
+from pyshacl.consts import SH_path
+from pyshacl.helper.path_helper import PathEvaluator
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:S sh:path ( ex:a ex:b ) .
+ex:A sh:path [ sh:alternativePath ( ex:a ex:b ) ] .
+ex:ZM sh:path [ sh:zeroOrMorePath ex:next ] .
+ex:OM sh:path [ sh:oneOrMorePath ex:next ] .
+ex:ZO sh:path [ sh:zeroOrOnePath ex:a ] .
+ex:IS sh:path [ sh:inversePath ( ex:a ex:b ) ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:x ex:a ex:y1, ex:y2 .
+ex:y1 ex:b ex:z .
+ex:y2 ex:b ex:z .
+ex:x ex:b ex:w .
+
+ex:n1 ex:next ex:n2 .
+ex:n2 ex:next ex:n3 .
+ex:n3 ex:next ex:n1 .
+ex:n3 ex:next ex:n4 .
+'''
+
+
+class TestPathWitnesses(unittest.TestCase):
+
+    def setUp(self):
+        self.sg = ShapesGraph(Graph().parse(data=shapes_file, format="turtle"))
+        self.evaluator = PathEvaluator(self.sg, Graph().parse(data=data_file, format="turtle"))
+
+    def path_of(self, shape):
+        return next(iter(self.sg.objects(shape, SH_path)))
+
+    def test_sequence(self):
+        found = self.evaluator.value_nodes(EX.x, self.path_of(EX.S))
+        self.assertEqual(set(found), {EX.z})
+        # both routes to ex:z are witnesses
+        self.assertEqual(
+            found[EX.z],
+            {(EX.x, EX.a, EX.y1), (EX.y1, EX.b, EX.z), (EX.x, EX.a, EX.y2), (EX.y2, EX.b, EX.z)},
+        )
+
+    def test_alternative(self):
+        found = self.evaluator.value_nodes(EX.x, self.path_of(EX.A))
+        self.assertEqual(set(found), {EX.y1, EX.y2, EX.w})
+        self.assertEqual(found[EX.w], {(EX.x, EX.b, EX.w)})
+
+    def test_zero_or_more(self):
+        found = self.evaluator.value_nodes(EX.n4, self.path_of(EX.ZM))
+        self.assertEqual(found, {EX.n4: frozenset()})
+        found = self.evaluator.value_nodes(EX.n1, self.path_of(EX.ZM))
+        self.assertEqual(set(found), {EX.n1, EX.n2, EX.n3, EX.n4})
+        self.assertEqual(found[EX.n2], {(EX.n1, EX.next, EX.n2), (EX.n2, EX.next, EX.n3), (EX.n3, EX.next, EX.n1)})
+        self.assertIn((EX.n3, EX.next, EX.n4), found[EX.n4])
+        self.assertNotIn((EX.n3, EX.next, EX.n4), found[EX.n1])
+
+    def test_one_or_more(self):
+        found = self.evaluator.value_nodes(EX.n4, self.path_of(EX.OM))
+        self.assertEqual(found, {})
+        found = self.evaluator.value_nodes(EX.n1, self.path_of(EX.OM))
+        # ex:n1 is on a cycle, so it is reachable from itself
+        self.assertEqual(set(found), {EX.n1, EX.n2, EX.n3, EX.n4})
+
+    def test_zero_or_one(self):
+        found = self.evaluator.value_nodes(EX.x, self.path_of(EX.ZO))
+        self.assertEqual(set(found), {EX.x, EX.y1, EX.y2})
+        self.assertEqual(found[EX.x], frozenset())
+
+    def test_inverse_sequence(self):
+        found = self.evaluator.value_nodes(EX.z, self.path_of(EX.IS))
+        self.assertEqual(set(found), {EX.x})
+        self.assertEqual(len(found[EX.x]), 4)
+
+    def test_deep_hierarchy(self):
+        data_graph = Graph()
+        for i in range(3000):
+            data_graph.add((EX["c{}".format(i)], EX.next, EX["c{}".format(i + 1)]))
+        evaluator = PathEvaluator(self.sg, data_graph)
+        found = evaluator.value_nodes(EX.c2990, self.path_of(EX.OM))
+        self.assertEqual(len(found), 10)
+        found = evaluator.value_nodes(EX.c0, self.path_of(EX.OM))
+        self.assertEqual(len(found), 3000)
+
+    def test_focus_nodes_share_closures(self):
+        data_graph = Graph()
+        for i in range(50):
+            data_graph.add((EX["c{}".format(i)], EX.next, EX["c{}".format(i + 1)]))
+        data_graph.add((EX.c50, EX.next, EX.c25))
+        focus_nodes = [EX["f{}".format(i)] for i in range(5)]
+        for f in focus_nodes:
+            data_graph.add((f, EX.next, EX.c0))
+            data_graph.add((f, EX.next, EX.c10))
+        walked = []
+        closure_from = PathEvaluator._closure_from
+
+        def walk(evaluator, step, start, forward):
+            walked.append(start)
+            return closure_from(evaluator, step, start, forward)
+
+        evaluator = PathEvaluator(self.sg, data_graph)
+        with mock.patch.object(PathEvaluator, '_closure_from', walk):
+            found = [evaluator.value_nodes(f, self.path_of(EX.OM)) for f in focus_nodes]
+        # The hierarchy is walked for the first focus node only, from each of its steps
+        self.assertEqual(sorted(walked), [EX.c0, EX.c10])
+        for f, shared in zip(focus_nodes, found):
+            self.assertEqual(shared, PathEvaluator(self.sg, data_graph).value_nodes(f, self.path_of(EX.OM)))
+        self.assertEqual(len(found[0]), 51)
+        chain = {(EX["c{}".format(i)], EX.next, EX["c{}".format(i + 1)]) for i in range(5)}
+        self.assertEqual(found[0][EX.c5], chain | {(EX.f0, EX.next, EX.c0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import re
+import unittest
+from rdflib import Namespace
+from rdflib.compare import isomorphic
+
+from pyshacl import validate
+from pyshacl.pattern_cache import PatternCache, compile_pattern
+from pyshacl.profiler import COUNT_PATTERN_CACHE_HITS, COUNT_PATTERN_CACHE_MISSES, Profiler
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ProductShape a sh:NodeShape ;
+  sh:targetClass ex:Product ;
+  sh:property [ sh:path ex:code ; sh:pattern "^[A-Z]{3}-[0-9]{4}$" ] ;
+  sh:property [ sh:path ex:code ; sh:pattern "^[a-z]{3}-" ; sh:flags "i" ] .
+
+ex:PartShape a sh:NodeShape ;
+  sh:targetClass ex:Part ;
+  sh:property [ sh:path ex:code ; sh:pattern "^[A-Z]{3}-[0-9]{4}$" ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:P1 a ex:Product, ex:Part ; ex:code "ABC-1234" .
+ex:P2 a ex:Product, ex:Part ; ex:code "ABC-1234", "abc-123" .
+ex:P3 a ex:Product ; ex:code "ABC-1234", [ ex:code "XYZ-0000" ] .
+ex:P4 a ex:Part ; ex:code ex:Code .
+'''
+
+
+def run(**options):
+    return validate(
+        data_file, shacl_graph=shapes_file, data_graph_format="turtle", shacl_graph_format="turtle", **options
+    )
+
+
+class TestPatternCache(unittest.TestCase):
+
+    def test_compile_pattern(self):
+        self.assertIs(compile_pattern("^a+$", re.I), compile_pattern("^a+$", re.I))
+        self.assertIsNot(compile_pattern("^a+$", re.I), compile_pattern("^a+$"))
+
+    def test_matches(self):
+        cache = PatternCache()
+        self.assertEqual([True, False, True], cache.matches("b", 0, ["abc", "ABC", "abc"]))
+        self.assertEqual([True, True], cache.matches("b", re.I, ["abc", "ABC"]))
+        self.assertEqual({'entries': 4, 'hits': 1, 'misses': 4}, cache.stats())
+
+    def test_bounded(self):
+        cache = PatternCache(2)
+        self.assertEqual([True, False, True, True], cache.matches("^a", 0, ["a1", "b1", "a2", "a2"]))
+        self.assertEqual(2, len(cache))
+        # Once full, the first matches are kept, and "a2" is matched again
+        self.assertEqual([True, True, False], cache.matches("^a", 0, ["a2", "a1", "b1"]))
+        self.assertEqual({'entries': 2, 'hits': 2, 'misses': 5}, cache.stats())
+        with self.assertRaises(ValueError):
+            PatternCache(0)
+
+    def test_same_results_as_uncached(self):
+        _, expected_graph, expected_text, expected_fragment = run(pattern_cache_size=0)
+        profiler = Profiler()
+        conforms, report_graph, report_text, fragment = run(profiler=profiler)
+        self.assertFalse(conforms)
+        self.assertTrue(isomorphic(expected_graph, report_graph))
+        self.assertEqual(expected_fragment, fragment)
+        # "abc-123" fails the first pattern of both shapes, the blank node both patterns of ex:ProductShape,
+        # and ex:Code the pattern of ex:PartShape
+        self.assertEqual(5, report_text.count("Constraint Violation in"))
+        # Each string is matched once per pattern, then found in the cache by both shapes with the same pattern,
+        # and when the conforming focus nodes are evaluated again to extract the fragment
+        self.assertEqual(5, profiler.counters[COUNT_PATTERN_CACHE_MISSES])
+        self.assertEqual(14, profiler.counters[COUNT_PATTERN_CACHE_HITS])
+        self.assertAlmostEqual(14 / 19, profiler.to_dict()['hit rates']['pattern cache'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import contextlib
+import io
+import json
+import unittest
+
+from examples import example3
+from pyshacl import validate
+from pyshacl.profiler import (
+    COUNT_FOCUS_NODES,
+    COUNT_TRIPLES_TOUCHED,
+    COUNT_VALUE_NODES,
+    PHASE_CONSTRAINT_EVALUATE,
+    PHASE_LOAD,
+    PHASE_REPORT_BUILDING,
+    PHASE_SHAPE_HARVEST,
+    PHASE_TARGET_DISCOVERY,
+    Profiler,
+)
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_nested_phase_is_timed_once(self):
+        profiler = Profiler()
+        with profiler.phase('outer', 'a'):
+            with profiler.phase('outer', 'a'):
+                pass
+        stats = profiler.phases['outer']
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['by']['a']['calls'], 2)
+        self.assertLessEqual(stats['by']['a']['wall'], stats['wall'])
+
+    def test_merge(self):
+        one, two = Profiler(), Profiler()
+        with two.phase('p', 'd'):
+            pass
+        two.count('n', 3)
+        one.count('n', 1)
+        one.merge(two.to_dict())
+        self.assertEqual(one.counters, {'n': 4})
+        self.assertEqual(one.phases['p']['by']['d']['calls'], 1)
+
+    def test_validate_run(self):
+        profiler = Profiler()
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            validate(
+                example3.return_data_file(),
+                shacl_graph=example3.return_shapes_file(),
+                data_graph_format='turtle',
+                shacl_graph_format='turtle',
+                inference='rdfs',
+                profiler=profiler,
+            )
+        self.assertEqual(stdout.getvalue(), "")
+        profile = json.loads(profiler.to_json())
+        for phase in (PHASE_LOAD, PHASE_SHAPE_HARVEST, PHASE_TARGET_DISCOVERY, PHASE_CONSTRAINT_EVALUATE):
+            self.assertIn(phase, profile['phases'])
+        self.assertEqual(profile['phases'][PHASE_REPORT_BUILDING]['calls'], 1)
+        self.assertIn('MinCountConstraintComponent', profile['phases'][PHASE_CONSTRAINT_EVALUATE]['by'])
+        self.assertGreater(profile['counters'][COUNT_FOCUS_NODES], 0)
+        self.assertGreater(profile['counters'][COUNT_VALUE_NODES], 0)
+
+    def test_triples_touched(self):
+        shapes = '''
+        @prefix ex: <http://example.com/ns#> .
+        @prefix sh: <http://www.w3.org/ns/shacl#> .
+        ex:S a sh:NodeShape ; sh:targetNode ex:a ;
+          sh:property [ sh:path ( ex:p ex:q ) ; sh:class ex:C ] ;
+          sh:property [ sh:path ex:p ; sh:equals ex:r ] .
+        '''
+        data = '''
+        @prefix ex: <http://example.com/ns#> .
+        ex:a ex:p ex:b1, ex:b2 ; ex:r ex:d .
+        ex:b1 ex:q ex:c .
+        ex:c a ex:C, ex:D .
+        '''
+        profiler = Profiler()
+        validate(data, shacl_graph=shapes, data_graph_format='turtle', shacl_graph_format='turtle', profiler=profiler)
+        # The ex:p of ex:a for each of the two paths, the ex:q of ex:b1, the two types of ex:c, and the ex:r of ex:a
+        self.assertEqual(profiler.counters[COUNT_TRIPLES_TOUCHED], 2 + 2 + 1 + 2 + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
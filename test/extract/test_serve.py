@@ -0,0 +1,169 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import warnings
+from rdflib import Graph
+
+from pyshacl import validate
+from pyshacl.errors import ReportableRuntimeError
+from pyshacl.parallel import fork_context
+from pyshacl.serve import ShapesGraphCache, ValidationClient, make_server, shapes_id
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+ex:Alice a ex:Person ; ex:name "Alice" .
+ex:Bob a ex:Person .
+'''
+
+# The custom target is only used in advanced mode, it finds ex:Carol, who has no name
+advanced_shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:FlaggedTarget a sh:SPARQLTargetType ;
+  rdfs:subClassOf sh:Target ;
+  sh:select "SELECT ?this WHERE { ?this ex:flagged true . }" .
+
+ex:FlaggedShape a sh:NodeShape ;
+  sh:target [ a ex:FlaggedTarget ] ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] .
+'''
+
+advanced_data_file = '''
+@prefix ex: <http://example.com/ns#> .
+ex:Alice ex:flagged true ; ex:name "Alice" .
+ex:Carol ex:flagged true .
+'''
+
+
+class ServerMixin(object):
+    server = None
+    client = None
+
+    @classmethod
+    def serve(cls, **options):
+        cls.server = make_server(**options)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.thread.join()
+        cls.server.server_close()
+        cls.server.validation_daemon.close()
+
+    def test_same_result_as_validate(self):
+        conforms, report_graph, report_text, fragment = validate(
+            Graph().parse(data=data_file, format="turtle"),
+            shacl_graph=Graph().parse(data=shapes_file, format="turtle"),
+        )
+        response = self.client.validate(data_file, shapes=shapes_file)
+        self.assertFalse(response['conforms'])
+        self.assertEqual(conforms, response['conforms'])
+        self.assertEqual(report_text, response['report_text'])
+        self.assertEqual(len(report_graph), len(Graph().parse(data=response['report'], format="turtle")))
+        self.assertEqual(set(fragment), set(Graph().parse(data=response['fragment'], format="nt")))
+        self.assertEqual(shapes_id(shapes_file, 'turtle'), response['shapes_id'])
+
+    def test_shapes_id_is_reused(self):
+        first = self.client.validate(data_file, shapes=shapes_file)
+        again = self.client.validate(data_file, shapes_id=first['shapes_id'])
+        self.assertEqual(first, again)
+
+    def test_mixed_options_for_the_same_shapes(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            first = self.client.validate(advanced_data_file, shapes=advanced_shapes_file)
+            responses = [first]
+            for advanced in (True, False, True, False):
+                responses.append(
+                    self.client.validate(advanced_data_file, shapes_id=first['shapes_id'], advanced=advanced)
+                )
+        # An advanced run does not change how the cached shapes are used by the runs after it
+        self.assertEqual([True, False, True, False, True], [r['conforms'] for r in responses])
+        self.assertFalse([w for w in caught if "already registered" in str(w.message)])
+
+    def test_report_and_fragment_can_be_turned_off(self):
+        only_fragment = self.client.validate(data_file, shapes=shapes_file, report=False)
+        self.assertNotIn('report', only_fragment)
+        self.assertIn('fragment', only_fragment)
+        only_report = self.client.validate(data_file, shapes=shapes_file, fragment=False)
+        self.assertNotIn('fragment', only_report)
+        self.assertFalse(only_report['conforms'])
+        self.assertIn('ex:Bob', only_report['report_text'])
+
+    def test_bad_requests(self):
+        with self.assertRaisesRegex(ReportableRuntimeError, "answered 404"):
+            self.client.validate(data_file, shapes_id="not-sent-before")
+        with self.assertRaisesRegex(ReportableRuntimeError, "answered 400"):
+            self.client.validate("this is not turtle", shapes=shapes_file)
+        with self.assertRaisesRegex(ReportableRuntimeError, "answered 400"):
+            self.client.validate(data_file)
+
+    def test_health(self):
+        health = self.client.health()
+        self.assertEqual('ok', health['status'])
+        self.assertEqual(self.server.validation_daemon.workers, health['workers'])
+
+
+class TestServeInProcess(ServerMixin, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.serve(port=0, workers=0)
+        cls.client = ValidationClient(port=cls.server.server_address[1])
+
+    def test_data_is_never_opened_as_a_path(self):
+        with self.assertRaisesRegex(ReportableRuntimeError, "answered 400"):
+            self.client.validate(os.path.abspath(__file__), shapes=shapes_file)
+
+
+@unittest.skipIf(fork_context() is None, "This platform cannot fork processes")
+class TestServeWorkers(ServerMixin, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.socket_dir = tempfile.mkdtemp()
+        socket_path = os.path.join(cls.socket_dir, "validate.sock")
+        cls.serve(socket_path=socket_path, workers=1)
+        cls.client = ValidationClient(socket_path=socket_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestServeWorkers, cls).tearDownClass()
+        shutil.rmtree(cls.socket_dir)
+
+
+class TestShapesGraphCache(unittest.TestCase):
+
+    def test_least_recently_used_is_dropped(self):
+        cache = ShapesGraphCache(1)
+        other = shapes_file.replace("minCount", "maxCount")
+        first = cache.get(shapes_id(shapes_file, 'turtle'), shapes_file, 'turtle')
+        self.assertIs(first, cache.get(shapes_id(shapes_file, 'turtle'), shapes_file, 'turtle'))
+        cache.get(shapes_id(other, 'turtle'), other, 'turtle')
+        self.assertIsNot(first, cache.get(shapes_id(shapes_file, 'turtle'), shapes_file, 'turtle'))
+        self.assertEqual({'entries': 1, 'hits': 1, 'misses': 3}, cache.stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from rdflib import Namespace
+
+from pyshacl import Validator
+from pyshacl.rdfutil import load_from_source
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property ex:KnowsShape .
+
+ex:KnowsShape a sh:PropertyShape ;
+  sh:path ( ex:knows ex:name ) ;
+  sh:minCount 1 ;
+  sh:maxCount 2 .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:Alice a ex:Person ; ex:knows ex:Bob .
+ex:Bob a ex:Person ; ex:knows ex:Alice ; ex:name "Bob" .
+ex:Alice ex:name "Alice" .
+'''
+
+
+class TestShapePlan(unittest.TestCase):
+
+    def setUp(self):
+        data_graph = load_from_source(data_file, rdf_format="turtle")
+        shacl_graph = load_from_source(shapes_file, rdf_format="turtle")
+        self.validator = Validator(data_graph, shacl_graph=shacl_graph)
+
+    def test_plan_is_compiled_once(self):
+        conforms, _, _, _ = self.validator.run()
+        self.assertTrue(conforms)
+        sg = self.validator.shacl_graph
+        shape = sg.lookup_shape_from_node(EX.KnowsShape)
+        plan = sg.shape_plan(shape)
+        self.assertIs(plan, sg.shape_plan(shape))
+        self.validator.run()
+        self.assertIs(plan, sg.shape_plan(shape))
+
+    def test_plan_contents(self):
+        sg = self.validator.shacl_graph
+        sg.shapes  # build the shape cache
+        plan = sg.shape_plan(sg.lookup_shape_from_node(EX.KnowsShape))
+        self.assertEqual(
+            {type(c).__name__ for c in plan.constraints},
+            {"MinCountConstraintComponent", "MaxCountConstraintComponent"},
+        )
+        self.assertTrue(plan.has_forall_constraint)
+        self.assertIsNotNone(plan.path)
+        node_plan = sg.shape_plan(sg.lookup_shape_from_node(EX.PersonShape))
+        self.assertIsNone(node_plan.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from rdflib import Graph, Literal, Namespace, RDF
+from rdflib.compare import isomorphic
+
+from pyshacl import Validator
+from pyshacl.parallel import fork_context, shard_focus_nodes, shard_of
+from pyshacl.rdfutil import load_from_source
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ProductShape a sh:NodeShape ;
+  sh:targetClass ex:Product ;
+  sh:property [ sh:path ex:name ; sh:minCount 1 ] ;
+  sh:property [ sh:path ex:madeBy ; sh:node ex:CompanyShape ] .
+
+ex:CompanyShape a sh:NodeShape ;
+  sh:targetClass ex:Company ;
+  sh:property [ sh:path ex:name ; sh:minCount 1 ] .
+'''
+
+
+def build_data_graph():
+    g = Graph()
+    for c in range(3):
+        g.add((EX["company{}".format(c)], RDF.type, EX.Company))
+        if c != 2:
+            g.add((EX["company{}".format(c)], EX.name, Literal("Company {}".format(c))))
+    for i in range(40):
+        product = EX["product{}".format(i)]
+        g.add((product, RDF.type, EX.Product))
+        if i % 7:
+            g.add((product, EX.name, Literal("Product {}".format(i))))
+        g.add((product, EX.madeBy, EX["company{}".format(i % 3)]))
+    return g
+
+
+def run(data_graph, **options):
+    shacl_graph = load_from_source(shapes_file, rdf_format="turtle")
+    return Validator(data_graph, shacl_graph=shacl_graph, options=options).run()
+
+
+class TestShardFocusNodes(unittest.TestCase):
+
+    def test_shards_are_stable(self):
+        products = [EX["product{}".format(i)] for i in range(100)]
+        focus_nodes = {p: {(p, RDF.type, EX.Product)} for p in products}
+        shards = shard_focus_nodes(focus_nodes, 4)
+        self.assertEqual(len(shards), 4)
+        self.assertEqual(sum(len(s) for s in shards), 100)
+        for i, shard in enumerate(shards):
+            for fn, triples in shard.items():
+                self.assertEqual(shard_of(fn, 4), i)
+                self.assertIs(triples, focus_nodes[fn])
+        # does not depend on the order the focus nodes come in
+        self.assertEqual(shard_focus_nodes(dict(reversed(list(focus_nodes.items()))), 4), shards)
+
+
+@unittest.skipIf(fork_context() is None, "needs a platform that can fork")
+class TestShardedValidation(unittest.TestCase):
+
+    def test_same_output_as_serial_run(self):
+        data_graph = build_data_graph()
+        s_conforms, s_report, s_text, s_subgraph = run(data_graph)
+        p_conforms, p_report, p_text, p_subgraph = run(data_graph, workers=3, shard_size=8)
+        self.assertFalse(p_conforms)
+        self.assertEqual(s_conforms, p_conforms)
+        self.assertEqual(s_subgraph, p_subgraph)
+        self.assertTrue(isomorphic(s_report, p_report))
+
+
+if __name__ == '__main__':
+    unittest.main()
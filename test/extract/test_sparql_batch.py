@@ -0,0 +1,140 @@
+import unittest
+from rdflib import BNode, Graph, Literal, Namespace, RDF
+from rdflib.compare import isomorphic
+
+from pyshacl import Validator
+from pyshacl.consts import SH_focusNode
+from pyshacl.rdfutil import load_from_source
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+
+ex: a owl:Ontology ; sh:declare [ sh:prefix "ex" ; sh:namespace "http://example.com/ns#" ] .
+
+ex:ProductShape a sh:NodeShape ;
+  sh:targetClass ex:Product ;
+  sh:sparql [
+    a sh:SPARQLConstraint ;
+    sh:message "Product is cheaper than its parts" ;
+    sh:prefixes ex: ;
+    sh:select """
+      SELECT $this ?value WHERE {
+        $this ex:price ?value ; ex:part ?part .
+        ?part ex:price ?partPrice .
+        FILTER (?value < ?partPrice)
+      }
+    """ ;
+  ] ;
+  sh:property [
+    sh:path ex:part ;
+    sh:sparql [
+      a sh:SPARQLConstraint ;
+      sh:prefixes ex: ;
+      sh:select """
+        SELECT $this ?value WHERE {
+          $this $PATH ?value .
+          FILTER NOT EXISTS { ?value ex:price ?p }
+        }
+      """ ;
+    ] ;
+  ] .
+'''
+
+
+limit_shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ProductShape a sh:NodeShape ;
+  sh:targetSubjectsOf ex:part ;
+  sh:sparql [
+    a sh:SPARQLConstraint ;
+    sh:select "SELECT $this ?value WHERE { $this <http://example.com/ns#part> ?value } LIMIT 1" ;
+  ] .
+'''
+
+
+def build_data_graph():
+    g = Graph()
+    for i in range(30):
+        product = EX["product{}".format(i)] if i % 10 else BNode()
+        part = EX["part{}".format(i)]
+        g.add((product, RDF.type, EX.Product))
+        g.add((product, EX.price, Literal(i)))
+        g.add((product, EX.part, part))
+        if i % 7:
+            g.add((part, EX.price, Literal(15)))
+    return g
+
+
+def run(data_graph, **options):
+    shacl_graph = load_from_source(shapes_file, rdf_format="turtle")
+    return Validator(data_graph, shacl_graph=shacl_graph, options=options).run()
+
+
+class TestSPARQLBatch(unittest.TestCase):
+
+    def test_same_results_as_per_focus_node(self):
+        data_graph = build_data_graph()
+        conforms, report, text, subgraph = run(data_graph)
+        self.assertFalse(conforms)
+        for batch_size in (4, 100):
+            with self.subTest(batch_size=batch_size):
+                b_conforms, b_report, b_text, b_subgraph = run(data_graph, sparql_batch_size=batch_size)
+                self.assertEqual(conforms, b_conforms)
+                self.assertEqual(subgraph, b_subgraph)
+                self.assertTrue(isomorphic(report, b_report))
+
+    def test_query_is_prepared_once(self):
+        shacl_graph = load_from_source(shapes_file, rdf_format="turtle")
+        validator = Validator(build_data_graph(), shacl_graph=shacl_graph)
+        shape = next(s for s in validator.shacl_graph.shapes if s.node == EX.ProductShape)
+        constraints = validator.shacl_graph.shape_plan(shape).constraints
+        constraint = next(c for c in constraints if hasattr(c, 'sparql_constraints'))
+        query_helper = next(iter(constraint.sparql_constraints))
+        binds_a, query_a = query_helper.bind_prepared(EX.product1)
+        binds_b, query_b = query_helper.bind_prepared(EX.product2)
+        self.assertIs(query_a, query_b)
+        self.assertEqual(binds_a, {'this': EX.product1})
+        self.assertEqual(binds_b, {'this': EX.product2})
+        init_binds, batch_a = query_helper.prepare_batch([EX.product1, EX.product2])
+        self.assertEqual({}, init_binds)
+        self.assertEqual({EX.product1, EX.product2}, {r.this for r in validator.data_graph.query(batch_a)})
+        _, batch_b = query_helper.prepare_batch([EX.product3])
+        self.assertIs(batch_a, batch_b)
+        self.assertEqual({EX.product3}, {r.this for r in validator.data_graph.query(batch_b)})
+
+    def test_solution_modifiers_are_not_batched(self):
+        # Each product has three parts, the LIMIT applies to each focus node, not to a whole batch
+        shacl_graph = load_from_source(limit_shapes_file, rdf_format="turtle")
+        data_graph = Graph()
+        for i in range(3):
+            for j in range(3):
+                data_graph.add((EX["product{}".format(i)], EX.part, EX["part{}".format(j)]))
+        for batch_size in (None, 10):
+            with self.subTest(batch_size=batch_size):
+                validator = Validator(data_graph, shacl_graph=shacl_graph, options={'sparql_batch_size': batch_size})
+                _, report, _, _ = validator.run()
+                self.assertEqual(3, len(set(report.subjects(SH_focusNode, None))))
+
+    def test_data_graph_prefixes_are_not_used(self):
+        # Like the queries of each focus node, the batched queries only know the prefixes of the Shapes Graph
+        shacl_graph = load_from_source(shapes_file.replace("sh:prefixes ex: ;", ""), rdf_format="turtle")
+        data_graph = Graph()
+        data_graph.bind("ex", EX)
+        for i in range(3):
+            data_graph.add((EX["product{}".format(i)], RDF.type, EX.Product))
+            data_graph.add((EX["product{}".format(i)], EX.price, Literal(i)))
+        for batch_size in (None, 10):
+            with self.subTest(batch_size=batch_size):
+                validator = Validator(data_graph, shacl_graph=shacl_graph, options={'sparql_batch_size': batch_size})
+                with self.assertRaisesRegex(Exception, "Unknown namespace prefix : ex"):
+                    validator.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from rdflib import Graph, Namespace, RDF, RDFS
+
+from pyshacl import ShapesGraph, Validator
+from pyshacl.target_index import TargetIndex
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ThingShape a sh:NodeShape ;
+  sh:targetClass ex:Thing ;
+  sh:targetSubjectsOf ex:owns ;
+  sh:targetObjectsOf ex:owns .
+'''
+
+class_shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:OwnerShape a sh:NodeShape ;
+  sh:targetSubjectsOf ex:owns ;
+  sh:property [ sh:path ex:owns ; sh:class ex:Thing ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:Product rdfs:subClassOf ex:Thing .
+ex:Book rdfs:subClassOf ex:Product .
+ex:Ebook rdfs:subClassOf ex:Book .
+
+ex:t a ex:Thing .
+ex:b a ex:Book .
+ex:e a ex:Ebook, ex:Product .
+ex:alice ex:owns ex:b, ex:e .
+'''
+
+
+class TestTargetIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.data_graph = Graph().parse(data=data_file, format="turtle")
+        self.index = TargetIndex(self.data_graph)
+
+    def test_transitive_subclasses(self):
+        instances = self.index.class_instances(EX.Thing)
+        self.assertEqual(set(instances), {EX.t, EX.b, EX.e})
+        self.assertEqual(instances[EX.t], {(EX.t, RDF.type, EX.Thing)})
+        chain = {(EX.Book, RDFS.subClassOf, EX.Product), (EX.Product, RDFS.subClassOf, EX.Thing)}
+        self.assertEqual(instances[EX.b], {(EX.b, RDF.type, EX.Book)} | chain)
+        # ex:e is found through both of its classes
+        self.assertIn((EX.e, RDF.type, EX.Ebook), instances[EX.e])
+        self.assertIn((EX.e, RDF.type, EX.Product), instances[EX.e])
+        self.assertIn((EX.Ebook, RDFS.subClassOf, EX.Book), instances[EX.e])
+        self.assertIs(self.index.class_instances(EX.Thing), instances)
+
+    def test_transitive_superclasses(self):
+        superclasses = self.index.superclasses(EX.Ebook)
+        self.assertEqual(set(superclasses), {EX.Ebook, EX.Book, EX.Product, EX.Thing})
+        self.assertEqual(superclasses[EX.Ebook], frozenset())
+        self.assertEqual(
+            superclasses[EX.Thing],
+            {
+                (EX.Ebook, RDFS.subClassOf, EX.Book),
+                (EX.Book, RDFS.subClassOf, EX.Product),
+                (EX.Product, RDFS.subClassOf, EX.Thing),
+            },
+        )
+        self.assertIs(self.index.superclasses(EX.Ebook), superclasses)
+
+    def test_class_constraint_chain(self):
+        shacl_graph = Graph().parse(data=class_shapes_file, format="turtle")
+        conforms, _, _, fragment = Validator(self.data_graph, shacl_graph=shacl_graph).run()
+        self.assertTrue(conforms)
+        self.assertIn((EX.b, RDF.type, EX.Book), fragment)
+        self.assertIn((EX.Book, RDFS.subClassOf, EX.Product), fragment)
+        self.assertIn((EX.Product, RDFS.subClassOf, EX.Thing), fragment)
+        # Only triples of the data graph are in the fragment, not a shortcut from the class to ex:Thing
+        self.assertNotIn((EX.Book, RDFS.subClassOf, EX.Thing), fragment)
+
+    def test_predicates(self):
+        self.assertEqual(set(self.index.subjects_of(EX.owns)), {EX.alice})
+        self.assertEqual(len(self.index.subjects_of(EX.owns)[EX.alice]), 2)
+        self.assertEqual(self.index.objects_of(EX.owns)[EX.b], {(EX.alice, EX.owns, EX.b)})
+
+    def test_focus_nodes(self):
+        sg = ShapesGraph(Graph().parse(data=shapes_file, format="turtle"))
+        shape = next(s for s in sg.shapes if s.node == EX.ThingShape)
+        sg.target_index = self.index
+        focus_nodes = shape.focus_nodes(self.data_graph)
+        self.assertEqual(set(focus_nodes), {EX.t, EX.b, EX.e, EX.alice})
+        self.assertIn((EX.alice, EX.owns, EX.b), focus_nodes[EX.b])
+        self.assertIn((EX.b, RDF.type, EX.Book), focus_nodes[EX.b])
+        # The shared index is not changed by merging the witnesses
+        self.assertNotIn((EX.alice, EX.owns, EX.b), self.index.class_instances(EX.Thing)[EX.b])
+        sg.target_index = None
+        self.assertEqual(shape.focus_nodes(self.data_graph), focus_nodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
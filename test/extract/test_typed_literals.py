@@ -0,0 +1,91 @@
+import unittest
+from unittest import mock
+from decimal import Decimal
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import XSD
+
+from pyshacl import Validator
+from pyshacl.typed_literals import NUMERIC, TypedLiteralCache, decode_literal
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+ex:ReadingShape a sh:NodeShape ;
+  sh:targetClass ex:Reading ;
+  sh:property [ sh:path ex:value ; sh:minInclusive 0 ; sh:maxExclusive 100.5 ] ;
+  sh:property [ sh:path ex:at ; sh:minExclusive "2020-01-01T00:00:00Z"^^xsd:dateTime ] ;
+  sh:property [ sh:path ex:on ; sh:maxInclusive "2020-12-31"^^xsd:date ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+ex:R1 a ex:Reading ; ex:value 0, 100.4, "1e2"^^xsd:double ; ex:at "2020-06-01T12:00:00+02:00"^^xsd:dateTime .
+ex:R2 a ex:Reading ; ex:value -1, 100.5, "abc"^^xsd:integer ; ex:at "2020-01-01T00:00:00Z"^^xsd:dateTime .
+ex:R3 a ex:Reading ; ex:value "50", ex:Fifty ; ex:at "2020-06-01T12:00:00"^^xsd:dateTime, "2021-01-01"^^xsd:date .
+ex:R4 a ex:Reading ; ex:value "NaN"^^xsd:double ; ex:on "2020-12-31"^^xsd:date, "2021-01-01"^^xsd:date, 5 .
+'''
+
+
+def run(**options):
+    data_graph = Graph().parse(data=data_file, format="turtle")
+    shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+    return Validator(data_graph, shacl_graph=shacl_graph, options=options).run()
+
+
+class TestTypedLiterals(unittest.TestCase):
+
+    def test_decode_literal(self):
+        self.assertEqual((NUMERIC, 5), decode_literal(Literal(5)))
+        self.assertEqual((NUMERIC, Decimal("1.5")), decode_literal(Literal("1.5", datatype=XSD.decimal)))
+        self.assertEqual(XSD.date, decode_literal(Literal("2020-01-01", datatype=XSD.date))[0])
+        # Times with a timezone do not compare with times without one
+        self.assertNotEqual(
+            decode_literal(Literal("2020-01-01T00:00:00Z", datatype=XSD.dateTime))[0],
+            decode_literal(Literal("2020-01-01T00:00:00", datatype=XSD.dateTime))[0],
+        )
+        for term in (
+            Literal("abc", datatype=XSD.integer),
+            Literal("NaN", datatype=XSD.double),
+            Literal(True),
+            Literal("5"),
+            URIRef("http://example.com/ns#Five"),
+        ):
+            self.assertIsNone(decode_literal(term), term)
+
+    def test_compare(self):
+        cache = TypedLiteralCache()
+        value_nodes = [
+            Literal(1),
+            Literal("1.0", datatype=XSD.decimal),
+            Literal(2.5),
+            Literal(0),
+            Literal("1"),
+            Literal(1),
+        ]
+        self.assertEqual([0, 0, 1, -1, None, 0], cache.compare(Literal(1), value_nodes))
+        self.assertIsNone(cache.compare(Literal("x"), value_nodes))
+        self.assertEqual([-1, -1, 1, -1, None, -1], cache.compare(Literal(2), value_nodes))
+        # Each distinct literal is only decoded once
+        self.assertEqual({'hits': 8, 'misses': 7, 'entries': 7}, cache.stats())
+
+    def test_same_results_as_per_term(self):
+        with mock.patch.object(TypedLiteralCache, 'compare', return_value=None):
+            expected = run()
+        result = run()
+        self.assertFalse(result[0])
+        self.assertTrue(isomorphic(expected[1], result[1]))
+        self.assertEqual(expected[3], result[3])
+        # -1 and 100.5 fail one bound, "abc", "50", ex:Fifty and NaN fail both,
+        # then the UTC midnight, the local time, the date, 2021-01-01 and 5
+        self.assertEqual(15, result[2].count("Constraint Violation in"))
+
+
+if __name__ == "__main__":
+    unittest.main()
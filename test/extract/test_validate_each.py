@@ -0,0 +1,76 @@
+import unittest
+from rdflib import Literal, Namespace
+
+from pyshacl import Validator
+from pyshacl.consts import SH_focusNode, SH_result
+from pyshacl.rdfutil import load_from_source
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:ProductShape a sh:NodeShape ;
+  sh:targetClass ex:Product ;
+  sh:property [
+    sh:path ex:madeBy ;
+    sh:node ex:CompanyShape ;
+  ] .
+
+ex:CompanyShape a sh:NodeShape ;
+  sh:property ex:CompanyNameShape .
+
+ex:CompanyNameShape a sh:PropertyShape ;
+  sh:path ex:name ;
+  sh:minCount 1 .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:p1 a ex:Product ; ex:madeBy ex:ACME .
+ex:p2 a ex:Product ; ex:madeBy ex:ACME, ex:Nameless .
+ex:p3 a ex:Product ; ex:madeBy ex:Initech .
+ex:ACME ex:name "ACME" .
+ex:Initech ex:name "Initech" .
+'''
+
+
+class TestValidateEach(unittest.TestCase):
+
+    def setUp(self):
+        data_graph = load_from_source(data_file, rdf_format="turtle")
+        shacl_graph = load_from_source(shapes_file, rdf_format="turtle")
+        self.validator = Validator(data_graph, shacl_graph=shacl_graph)
+        self.data_graph = data_graph
+
+    def test_results_per_node(self):
+        sg = self.validator.shacl_graph
+        sg.shapes  # build the shape cache
+        shape = sg.lookup_shape_from_node(EX.CompanyShape)
+        results = shape.validate_each(self.data_graph, [EX.ACME, EX.Nameless, EX.Initech, EX.ACME])
+        self.assertEqual(set(results), {EX.ACME, EX.Nameless, EX.Initech})
+        conforms, reports, neighborhood = results[EX.ACME]
+        self.assertTrue(conforms)
+        self.assertEqual(reports, [])
+        self.assertEqual(neighborhood, {(EX.ACME, EX.name, Literal("ACME"))})
+        conforms, reports, neighborhood = results[EX.Nameless]
+        self.assertFalse(conforms)
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(neighborhood, set())
+
+    def test_batched_nested_shapes(self):
+        conforms, report_graph, _, subgraph = self.validator.run()
+        self.assertFalse(conforms)
+        results = list(report_graph.objects(None, SH_result))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(set(report_graph.objects(results[0], SH_focusNode)), {EX.p2})
+        self.assertIn((EX.p1, EX.madeBy, EX.ACME), subgraph)
+        self.assertIn((EX.p3, EX.madeBy, EX.Initech), subgraph)
+        self.assertIn((EX.Initech, EX.name, Literal("Initech")), subgraph)
+        self.assertFalse(any(t[0] == EX.p2 for t in subgraph))
+
+
+if __name__ == '__main__':
+    unittest.main()
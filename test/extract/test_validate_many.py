@@ -0,0 +1,81 @@
+import unittest
+from rdflib import Graph
+
+from pyshacl import validate, validate_many
+from pyshacl.errors import ReportableRuntimeError
+from pyshacl.profiler import COUNT_FOCUS_NODES, Profiler
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [
+    sh:path ex:worksFor ;
+    sh:node ex:CompanyShape ;
+  ] .
+
+ex:CompanyShape a sh:NodeShape ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] .
+'''
+
+data_files = [
+    '''
+@prefix ex: <http://example.com/ns#> .
+ex:Alice a ex:Person ; ex:worksFor ex:ACME .
+ex:ACME ex:name "ACME" .
+''',
+    '''
+@prefix ex: <http://example.com/ns#> .
+ex:Bob a ex:Person ; ex:worksFor ex:Nameless .
+''',
+    '''
+@prefix ex: <http://example.com/ns#> .
+ex:Carol a ex:Person ; ex:worksFor ex:ACME, ex:Nameless .
+ex:Dave a ex:Person .
+ex:ACME ex:name "ACME" .
+''',
+]
+
+
+def data_graphs():
+    return [Graph().parse(data=d, format="turtle") for d in data_files]
+
+
+class TestValidateMany(unittest.TestCase):
+
+    def setUp(self):
+        self.shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+        self.expected = [validate(g, shacl_graph=self.shacl_graph) for g in data_graphs()]
+
+    def assertSameResults(self, results):
+        self.assertEqual(len(self.expected), len(results))
+        for expected, (conforms, report_graph, report_text, fragment) in zip(self.expected, results):
+            self.assertEqual(expected[0], conforms)
+            self.assertEqual(len(expected[1]), len(report_graph))
+            self.assertEqual(expected[2], report_text)
+            self.assertEqual(expected[3], fragment)
+
+    def test_same_results_as_validate(self):
+        results = validate_many(data_graphs(), shacl_graph=self.shacl_graph)
+        self.assertEqual([True, False, False], [r[0] for r in self.expected])
+        self.assertSameResults(list(results))
+
+    def test_workers(self):
+        profiler = Profiler()
+        results = list(validate_many(data_graphs(), shacl_graph=self.shacl_graph, workers=2, profiler=profiler))
+        self.assertSameResults(results)
+        # What the workers recorded is added to the profiler
+        self.assertEqual(4, profiler.counters[COUNT_FOCUS_NODES])
+
+    def test_needs_shapes_graph(self):
+        with self.assertRaises(ReportableRuntimeError):
+            validate_many(data_graphs())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import logging
+import unittest
+from rdflib import Graph, Literal, Namespace
+
+from pyshacl import Validator
+from pyshacl.consts import SH_focusNode, SH_resultMessage, SH_resultPath, SH_resultSeverity, SH_Violation
+from pyshacl.result import ValidationResult
+
+EX = Namespace("http://example.com/ns#")
+
+shapes_file = '''
+@prefix ex: <http://example.com/ns#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+ex:PersonShape a sh:NodeShape ;
+  sh:targetClass ex:Person ;
+  sh:property [
+    sh:path ex:name ;
+    sh:minCount 1 ;
+  ] ;
+  sh:property [
+    sh:path ex:age ;
+    sh:maxCount 1 ;
+    sh:message "Only one age" ;
+  ] .
+'''
+
+data_file = '''
+@prefix ex: <http://example.com/ns#> .
+
+ex:Alice a ex:Person ; ex:name "Alice" ; ex:age 30, 31 .
+ex:Bob a ex:Person .
+'''
+
+
+def shape_results(data=data_file):
+    data_graph = Graph().parse(data=data, format="turtle")
+    shacl_graph = Graph().parse(data=shapes_file, format="turtle")
+    validator = Validator(data_graph, shacl_graph=shacl_graph)
+    shape = next(s for s in validator.shacl_graph.shapes if s.node == EX.PersonShape)
+    # Results are only described up front when debug logging is on, which other tests may have turned on
+    for s in validator.shacl_graph.shapes:
+        s.logger = logging.getLogger("test_validation_result")
+    logging.getLogger("test_validation_result").setLevel(logging.INFO)
+    conforms, results, _ = shape.validate(data_graph)
+    return conforms, {r.focus_node: r for r in results}
+
+
+class TestValidationResult(unittest.TestCase):
+
+    def test_results_are_lazy(self):
+        conforms, results = shape_results()
+        self.assertFalse(conforms)
+        self.assertEqual({EX.Alice, EX.Bob}, set(results))
+        bob = results[EX.Bob]
+        self.assertIsInstance(bob, ValidationResult)
+        self.assertEqual(EX.name, bob.result_path)
+        self.assertEqual(SH_Violation, bob.severity)
+        self.assertIsNone(bob._description)
+        self.assertIsNone(bob._messages)
+        self.assertIn("Focus Node: ex:Bob", bob.description)
+        self.assertIn("Less than 1 values", bob.description)
+
+    def test_unpacks_like_a_tuple(self):
+        _, results = shape_results()
+        alice = results[EX.Alice]
+        desc, r_node, r_triples = alice
+        self.assertEqual(alice.description, desc)
+        self.assertIs(alice.node, r_node)
+        parts = {p: o for s, p, o in r_triples if s == r_node}
+        self.assertEqual(SH_Violation, parts[SH_resultSeverity])
+        self.assertEqual(EX.Alice, parts[SH_focusNode][1])
+        self.assertEqual(EX.age, parts[SH_resultPath][1])
+        self.assertEqual(Literal("Only one age"), parts[SH_resultMessage])
+
+    def test_fresh_copy_has_its_own_node(self):
+        _, results = shape_results()
+        alice = results[EX.Alice]
+        copy = alice.fresh()
+        self.assertIsNot(alice.node, copy.node)
+        self.assertNotEqual(alice.node, copy.node)
+        self.assertEqual(alice.description, copy.description)
+
+    def test_materialize_before_the_graph_changes(self):
+        _, results = shape_results(data_file + '[ a ex:Person ; ex:nick "Carol" ] .\n')
+        carol = next(r for fn, r in results.items() if fn not in (EX.Alice, EX.Bob))
+        self.assertIs(carol, carol.materialize())
+        carol.datagraph.remove((carol.focus_node, EX.nick, None))
+        # The blank focus node is described as it was
+        self.assertIn('"Carol"', carol.description)
+        self.assertIn('"Carol"', "".join(carol.messages))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+from rdflib import RDF, Graph, Literal, Namespace
+from pyshacl import validate, extras
+
+EX = Namespace("http://example.com/ex#")
+
+shapes_graph = '''\
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix ex: <http://example.com/ex#> .
+
+ex:LanguageExampleShape
+	a sh:NodeShape ;
+	sh:targetClass ex:Country ;
+	sh:js [
+		a sh:JSConstraint ;
+		sh:message "Values are literals with German language tag." ;
+		sh:jsLibrary [ sh:jsLibraryURL "file://test/resources/js/germanLabel.js" ] ;
+		sh:jsFunctionName "validateGermanLabel" ;
+	] .
+'''
+
+extras.dev_mode = True
+
+
+def test_js_context_pool_reuse():
+    from pyshacl.extras.js.context import SHACLJSContextPool
+
+    g = Graph()
+    pool = SHACLJSContextPool()
+    libraries = ("file://test/resources/js/germanLabel.js",)
+    ctx = pool.acquire(g, None, libraries)
+    assert "validateGermanLabel" in ctx.fns
+    ctx.run_js_function("validateGermanLabel", [EX.a])
+    pool.release(ctx, g, None, libraries)
+    # The argument of the last call is no longer bound
+    assert ctx.context.eval_js("typeof fn_arg_1") == "undefined"
+    assert pool.acquire(g, None, libraries) is ctx
+    assert pool.acquire(g, None, libraries) is not ctx
+    assert pool.stats() == {'created': 2, 'reused': 1}
+
+
+def test_js_constraint_with_pooled_contexts():
+    s1 = Graph().parse(data=shapes_graph, format="turtle")
+    g1 = Graph()
+    for i in range(20):
+        country = EX["country{}".format(i)]
+        g1.add((country, EX.germanLabel, Literal("Land", lang="de" if i % 4 else "en")))
+        g1.add((country, RDF.type, EX.Country))
+    conforms, result_graph, result_text, subgraph = validate(g1, shacl_graph=s1, advanced=True, js=True)
+    assert not conforms
+    assert "Results (5)" in result_text
+
+
+if __name__ == "__main__":
+    test_js_context_pool_reuse()
+    test_js_constraint_with_pooled_contexts()